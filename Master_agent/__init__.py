@@ -5,4 +5,10 @@ This package orchestrates the testcase generation process using various sub-agen
 """
 
 # Import agent after initialization is complete
-from . import agent  
\ No newline at end of file
+from . import agent
+
+# Create the configured Gemini clients up front (MODEL_CLIENT_WARMUP) instead of on the first request
+from .common.model_clients import warm_up_model_clients
+
+warm_up_model_clients()
+ 
\ No newline at end of file
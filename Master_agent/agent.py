@@ -1,36 +1,103 @@
+import logging
+from typing import Optional
+
 from google.adk.agents import Agent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models import LlmRequest, LlmResponse
 from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
 
+from .common.config import ROUTER_FAST_PATH_MIN_CONFIDENCE
+from .common.query_router import ENHANCEMENT, NEW_GENERATION, classify_query, router_stats
+from .common.suite_log import TESTCASE_HISTORY, history_state_keys, suite_count
 from .subagents.enhancer.agent import enhancer_engine_agent
 from .subagents.testcase_generator_orchestrator.agent import new_testcase_generator
 
 
-from google.adk.tools.tool_context import ToolContext
+logger = logging.getLogger(__name__)
+
+# Sub-agent each confidently classified request is transferred to
+FAST_PATH_ROUTES = {
+    NEW_GENERATION: new_testcase_generator.name,
+    ENHANCEMENT: enhancer_engine_agent.name,
+}
 
-def clear_session_state(tool_context: ToolContext) -> dict:
+
+def reset_session_state(callback_context: CallbackContext) -> Optional[types.Content]:
     """
-    Clears all session state variables.
-    
-    This tool removes all data from the current session state,
-    effectively resetting the conversation context.
-    
+    Clears the session state before the root agent handles a request.
+
+    Every key except those of the all_testcases_history log (see
+    common.suite_log) is set to None, so each request starts from a
+    clean slate while the session's test case history is kept.
+
     Returns:
-        dict: Status message indicating successful state clearing.
+        None, so the agent always runs
     """
-    # Get all current state keys
-    state_keys = list(tool_context.state.to_dict().keys())
-    print(f"Current session state {tool_context.state}")
-    
-    # Clear all state by setting each key to None or removing them
-    for key in state_keys:
-      if key!="all_testcases_history":
-        tool_context.state[key] = None
-    
-    return {
-        "status": "success",
-        "message": "Session state has been cleared successfully",
-        "cleared_keys": state_keys
-    }
+    state = callback_context.state
+    preserved = history_state_keys(state)
+    reset_keys = [key for key in state.to_dict().keys() if key not in preserved]
+    for key in reset_keys:
+        if state.get(key) is not None:
+            state[key] = None
+    logger.info(f"Reset session state keys: {reset_keys}")
+    return None
+
+
+def fast_path_router(
+    callback_context: CallbackContext, llm_request: LlmRequest
+) -> Optional[LlmResponse]:
+    """
+    Routes obvious generation and enhancement requests without calling the model.
+
+    Runs before the root agent's first model call of a turn. When classify_query
+    is confident, it answers in the model's place with the transfer_to_agent
+    call the routing instruction would produce; otherwise the request goes to
+    the LLM router as before.
+
+    Returns:
+        LlmResponse with the function call, or None to call the model
+    """
+    # Only route on the user's message, not on follow-ups to tool results
+    last_content = llm_request.contents[-1] if llm_request.contents else None
+    if (
+        last_content is None
+        or last_content.role != "user"
+        or any(part.function_response for part in last_content.parts or [])
+    ):
+        return None
+
+    user_content = callback_context.user_content
+    query = "".join(part.text or "" for part in (user_content.parts or [])) if user_content else ""
+    classification = classify_query(
+        query, has_history=suite_count(callback_context.state, TESTCASE_HISTORY) > 0
+    )
+    fast_path = (
+        classification.category in FAST_PATH_ROUTES
+        and classification.confidence >= ROUTER_FAST_PATH_MIN_CONFIDENCE
+    )
+    router_stats.record(classification, fast_path)
+    logger.info(
+        f"Router pre-classification: {classification.category} "
+        f"(confidence {classification.confidence}, fast path: {fast_path}); "
+        f"hit rate {router_stats.stats()['hit_rate']:.0%}"
+    )
+    if not fast_path:
+        return None
+
+    return LlmResponse(
+        content=types.Content(
+            role="model",
+            parts=[
+                types.Part(
+                    function_call=types.FunctionCall(
+                        name="transfer_to_agent",
+                        args={"agent_name": FAST_PATH_ROUTES[classification.category]},
+                    )
+                ),
+            ],
+        )
+    )
 
 
 
@@ -39,7 +106,6 @@ root_agent = Agent(
     name="MasterRoutingAgent",
     model="gemini-2.5-pro",
     description="Manager agent",
-    tools = [clear_session_state],
     instruction="""
 ***
 
@@ -52,8 +118,8 @@ You are the Master Routing Agent responsible for analyzing incoming user queries
 
 ## Core Responsibilities
 
-### 0. Clear Session State First
-**CRITICAL FIRST ACTION:** Before beginning any query analysis or routing process, you MUST always call the clear_session_state tool as your very first action. This ensures a clean slate for processing new requests and prevents state contamination from previous operations. This step takes absolute precedence over all other responsibilities including query analysis and classification.
+### 0. Session State Is Already Reset
+The session state is cleared automatically before you receive each request (previously generated test cases in `all_testcases_history` are kept). Do not spend a step on clearing state; start directly with query analysis.
 
 ### 1. Query Analysis
 - Parse and understand the incoming user request
@@ -130,9 +196,6 @@ Classify as **GENERAL** when the user query contains:
 
 ## Workflow Steps
 
-### Step 0: Clear Session State
-**MANDATORY FIRST STEP:** Call the clear_session_state tool before proceeding with any query analysis, classification, or routing logic. This ensures no residual state from previous sessions interferes with the current request processing.
-
 ### Step 1: Receive User Query
 - Capture the complete user request
 - Maintain session history awareness
@@ -208,7 +271,6 @@ session.state['final_summary'] = your_complete_response_text
 ```
 User Query: "What is HIPAA compliance?"
 
-Step 0: Call clear_session_state tool
 Classification: GENERAL QUERY
 Action: Direct Handling
 
@@ -264,17 +326,14 @@ If no prior test cases exist in session:
 **Examples of Direct Handling with State Management:**
 
 1. **User: "What is HIPAA compliance?"**
-   - First call clear_session_state tool
    - Generate response explaining HIPAA
    - Store in: `session.state['final_summary']` = "HIPAA (Health Insurance Portability and Accountability Act)..."
 
 2. **User: "How do I use this system?"**
-   - First call clear_session_state tool
    - Generate usage guidance
    - Store in: `session.state['final_summary']` = "I can help you generate test cases or enhance existing ones..."
 
 3. **User: "Hello!"**
-   - First call clear_session_state tool
    - Generate greeting and introduction
    - Store in: `session.state['final_summary']` = "Hello! I'm your test case assistant..."
 
@@ -284,7 +343,6 @@ If no prior test cases exist in session:
 
 ### To new_testcase_generator
 ```
-Step 0: Call clear_session_state tool [COMPLETED]
 DELEGATE TO: new_testcase_generator
 REQUEST TYPE: New Test Case Generation
 USER QUERY: [original user query]
@@ -294,7 +352,6 @@ STATE MANAGEMENT: Sub-agent handles state writes
 
 ### To enhancer_engine_agent
 ```
-Step 0: Call clear_session_state tool [COMPLETED]
 DELEGATE TO: enhancer_engine_agent
 REQUEST TYPE: Test Case Enhancement
 USER QUERY: [original user query]
@@ -305,7 +362,6 @@ STATE MANAGEMENT: Sub-agent handles state writes
 
 ### Direct Handling (No Delegation)
 ```
-Step 0: Call clear_session_state tool [COMPLETED]
 CLASSIFICATION: General Query
 ACTION: Direct Response
 RESPONSE TYPE: [Informational / Explanatory / Guidance / Conversational]
@@ -320,7 +376,6 @@ STATE WRITE: session.state['final_summary'] = [complete response]
 ## Quality Checks
 
 Before taking action, verify:
-- ✓ **clear_session_state tool has been called as the first action**
 - ✓ Classification is accurate based on query indicators
 - ✓ Correct agent selected for request type OR direct handling confirmed
 - ✓ All necessary context is passed to sub-agent (if delegating)
@@ -333,14 +388,13 @@ Before taking action, verify:
 ## Key Guidelines
 
 ### Accuracy First
-- Always call clear_session_state as the first action
 - Take time to analyze the request thoroughly
 - When in doubt, err on the side of asking for clarification
 - Incorrect routing wastes user time and agent resources
 - Don't force delegation when direct response is more appropriate
 
 ### Context Preservation
-- Always maintain awareness of session history (after clearing old state)
+- Always maintain awareness of session history
 - Pass complete context to sub-agents when delegating
 - Track all test cases generated in current session
 
@@ -360,7 +414,6 @@ Before taking action, verify:
 - **Always store direct responses in `final_summary` field**
 
 ### State Management Discipline
-- **ALWAYS call clear_session_state first before any other action**
 - For delegated queries: Do NOT write to `final_summary` (sub-agents handle it)
 - For direct queries: ALWAYS write your complete response to `final_summary`
 - Ensure `final_summary` contains properly formatted markdown text
@@ -369,13 +422,12 @@ Before taking action, verify:
 ***
 
 **Summary of State Management:**
-- **Step 0 (Always)** → Call clear_session_state tool
 - **General Queries (Direct)** → Write response to `session.state['final_summary']`
 - **Test Case Generation (Delegated)** → Sub-agent writes to its own state fields
 - **Test Case Enhancement (Delegated)** → Sub-agent writes to its own state fields
-
-**Note:** The clear_session_state tool call is mandatory as the absolute first action to ensure clean state management throughout the entire workflow, whether delegating or handling directly.
     """,
     sub_agents=[new_testcase_generator, enhancer_engine_agent],
+    before_agent_callback=reset_session_state,
+    before_model_callback=fast_path_router,
     output_key="final_summary"
 )
\ No newline at end of file
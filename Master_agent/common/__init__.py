@@ -0,0 +1,6 @@
+"""
+Shared helpers for the Master agent
+
+This package holds the caches and utilities that are shared by the
+testcase generation and enhancer sub-agents.
+"""
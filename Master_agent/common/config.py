@@ -0,0 +1,78 @@
+"""
+Configuration settings shared across the Master agent's sub-agents.
+
+Values can be overridden through environment variables (or the .env file).
+"""
+
+import os
+
+from dotenv import load_dotenv
+
+# Load environment variables (this is redundant if __init__.py is imported first,
+# but included for safety when importing config directly)
+load_dotenv()
+
+# Corpus resource-name resolver settings
+CORPUS_CACHE_TTL_SECONDS = float(os.environ.get("CORPUS_CACHE_TTL_SECONDS", "300"))
+
+# Retrieval result cache settings
+RETRIEVAL_CACHE_MAX_ENTRIES = int(os.environ.get("RETRIEVAL_CACHE_MAX_ENTRIES", "256"))
+RETRIEVAL_CACHE_TTL_SECONDS = float(os.environ.get("RETRIEVAL_CACHE_TTL_SECONDS", "600"))
+
+# Retrieved text referenced from feature_context / prefetched_context; session state only keeps references
+FEATURE_CONTEXT_STORE_MAX_ENTRIES = int(os.environ.get("FEATURE_CONTEXT_STORE_MAX_ENTRIES", "1024"))
+FEATURE_CONTEXT_STORE_TTL_SECONDS = float(os.environ.get("FEATURE_CONTEXT_STORE_TTL_SECONDS", "3600"))
+
+# Blocking Vertex AI calls run on a bounded thread pool when awaited from the event loop
+BLOCKING_CALL_MAX_WORKERS = int(os.environ.get("BLOCKING_CALL_MAX_WORKERS", "8"))
+RAG_QUERY_TIMEOUT_SECONDS = float(os.environ.get("RAG_QUERY_TIMEOUT_SECONDS", "30"))
+
+# Number of feature retrievals the context prefetcher runs at the same time
+PREFETCH_MAX_CONCURRENCY = int(os.environ.get("PREFETCH_MAX_CONCURRENCY", "4"))
+# Number of features from the cursor on whose context is kept prefetched
+PREFETCH_WINDOW = int(os.environ.get("PREFETCH_WINDOW", "3"))
+
+# How TestcaseGenerationPipeline processes features: "serial" (the feature queue
+# manager runs them one after another) or "parallel" (one isolated pipeline run per feature)
+FEATURE_GENERATION_MODE = os.environ.get("FEATURE_GENERATION_MODE", "serial").lower()
+FEATURE_GENERATION_MAX_CONCURRENCY = int(os.environ.get("FEATURE_GENERATION_MAX_CONCURRENCY", "3"))
+
+# Features are processed in pages of FEATURE_PAGE_SIZE, with progress logged after each page (each
+# set is written as soon as its feature completes); at most FEATURE_GENERATION_MAX_FEATURES per
+# request (0: no limit), the rest are reported
+FEATURE_PAGE_SIZE = int(os.environ.get("FEATURE_PAGE_SIZE", "5"))
+FEATURE_GENERATION_MAX_FEATURES = int(os.environ.get("FEATURE_GENERATION_MAX_FEATURES", "0"))
+
+# Timeout for the processors' direct Gemini calls (parsing fallback and summaries)
+LLM_CALL_TIMEOUT_SECONDS = float(os.environ.get("LLM_CALL_TIMEOUT_SECONDS", "60"))
+
+# Comma-separated Gemini model names whose clients are created at startup (empty: created lazily)
+MODEL_CLIENT_WARMUP = [
+    name.strip() for name in os.environ.get("MODEL_CLIENT_WARMUP", "").split(",") if name.strip()
+]
+
+# Minimum classify_query confidence for the root agent to route without calling the LLM router
+ROUTER_FAST_PATH_MIN_CONFIDENCE = float(os.environ.get("ROUTER_FAST_PATH_MIN_CONFIDENCE", "0.75"))
+
+# Refinement loop budget: one refine pass per REFINEMENT_SEVERITY_PER_ITERATION of weighted
+# review findings, between 1 and REFINEMENT_MAX_ITERATIONS passes
+REFINEMENT_MAX_ITERATIONS = int(os.environ.get("REFINEMENT_MAX_ITERATIONS", "3"))
+REFINEMENT_SEVERITY_PER_ITERATION = float(os.environ.get("REFINEMENT_SEVERITY_PER_ITERATION", "4"))
+
+# SQLite file holding generated test suites, so session state only keeps references to them.
+# Opt-in: set an absolute path (or ":memory:"); empty keeps the records in session state
+SUITE_STORE_PATH = os.environ.get("SUITE_STORE_PATH", "")
+
+# How the enhancer returns its changes: "patch" (an edit list applied to the stored set locally)
+# or "full" (the whole enhanced set)
+ENHANCEMENT_MODE = os.environ.get("ENHANCEMENT_MODE", "patch").lower()
+
+# How the refiner applies review findings: "targeted" (only the flagged test cases and the
+# new-coverage items go to the model, which returns edits merged locally) or "full" (the whole suite
+# is rewritten)
+REFINEMENT_MODE = os.environ.get("REFINEMENT_MODE", "targeted").lower()
+
+# Suites with more than REVIEW_CHUNK_ROWS test cases are reviewed in chunks of that many rows
+# (row-level issues) plus one suite-level pass, at most REVIEW_MAX_CONCURRENCY at a time (0: one review)
+REVIEW_CHUNK_ROWS = int(os.environ.get("REVIEW_CHUNK_ROWS", "20"))
+REVIEW_MAX_CONCURRENCY = int(os.environ.get("REVIEW_MAX_CONCURRENCY", "4"))
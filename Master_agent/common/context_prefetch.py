@@ -0,0 +1,105 @@
+"""
+Requirements and compliance prefetch for queued features.
+
+The context prefetch agent fetches the first PREFETCH_WINDOW features of the
+queue; the feature runners then keep the window filled as the cursor moves,
+so retrieval for the next features overlaps with generation of the current
+one. Results go to the context store and only reference bundles are returned
+(see common.feature_context).
+"""
+
+import asyncio
+import logging
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import PREFETCH_MAX_CONCURRENCY, PREFETCH_WINDOW, RAG_QUERY_TIMEOUT_SECONDS
+from .corpus_resolver import corpus_resolver
+from .executor import run_blocking
+from .feature_context import store_retrieval
+from .retrieval import retrieve_contexts
+
+logger = logging.getLogger(__name__)
+
+# Same retrieval settings as the rag_query tools, so prefetched results share their cache
+DEFAULT_DISTANCE_THRESHOLD = 0.8
+DEFAULT_TOP_K = 5
+
+# The searches the generator and reviewer run for every feature
+PREFETCH_QUERIES = [
+    ("requirements", "Detailed specification for {feature}"),
+    ("compliance", "compliance rules related to {feature}"),
+]
+
+
+def prefetch_window(features: List[str], start: int, prefetched: Iterable[str], end: Optional[int] = None) -> List[str]:
+    """
+    Return the features of the window starting at start that still need a prefetch.
+
+    Args:
+        features: The feature queue
+        start: Index of the first feature of the window
+        prefetched: Features whose context is already prefetched
+        end: Index the window may not reach (default: the end of the queue)
+
+    Returns:
+        Up to PREFETCH_WINDOW features, in queue order
+    """
+    end = len(features) if end is None else min(end, len(features))
+    done = set(prefetched)
+    window = features[start:min(start + max(0, PREFETCH_WINDOW), end)]
+    return list(dict.fromkeys(feature for feature in window if feature not in done))
+
+
+async def prefetch_feature_contexts(features: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the PREFETCH_QUERIES for the given features, at most PREFETCH_MAX_CONCURRENCY at a time.
+
+    Failed searches are left out (the generator's own tool call runs them).
+
+    Returns:
+        feature -> reference bundle {"feature", "retrievals"}
+    """
+    semaphore = asyncio.Semaphore(max(1, PREFETCH_MAX_CONCURRENCY))
+
+    async def fetch(feature: str, corpus: str, query: str) -> Optional[Dict[str, Any]]:
+        async with semaphore:
+            try:
+                resource_name = await run_blocking(
+                    corpus_resolver.resolve, corpus, timeout=RAG_QUERY_TIMEOUT_SECONDS
+                )
+                if resource_name is None:
+                    logger.warning(f"Corpus '{corpus}' not found, skipping prefetch")
+                    return None
+                results = await run_blocking(
+                    retrieve_contexts,
+                    [resource_name],
+                    query,
+                    top_k=DEFAULT_TOP_K,
+                    vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD,
+                    timeout=RAG_QUERY_TIMEOUT_SECONDS,
+                )
+            except Exception as e:
+                # Leave this search to the generator's own tool call
+                logger.warning(f"Prefetch failed for '{feature}' in '{corpus}': {e}")
+                return None
+            return store_retrieval([corpus], query, results)
+
+    jobs = [
+        (feature, fetch(feature, corpus, template.format(feature=feature)))
+        for feature in features
+        for corpus, template in PREFETCH_QUERIES
+    ]
+    retrievals = await asyncio.gather(*[job for _, job in jobs])
+
+    prefetched: Dict[str, Dict[str, Any]] = {
+        feature: {"feature": feature, "retrievals": []} for feature in features
+    }
+    for (feature, _), retrieval in zip(jobs, retrievals):
+        if retrieval is not None:
+            prefetched[feature]["retrievals"].append(retrieval)
+
+    logger.info(
+        f"Prefetched {sum(r is not None for r in retrievals)}/{len(jobs)} "
+        f"retrievals for {len(features)} features."
+    )
+    return prefetched
@@ -0,0 +1,146 @@
+"""
+Process-wide resolver for RAG corpus display names.
+
+Every RAG tool needs to turn a display name such as 'requirements' into a
+full corpus resource name. Listing the corpora is a network round-trip, so the
+listing is cached here for all tool copies (generator, reviewer, enhancer) and
+refreshed at most once per TTL, no matter how many callers ask concurrently.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from vertexai import rag
+
+from .config import CORPUS_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+
+class CorpusResolver:
+    """
+    Thread-safe, TTL-bound cache of the corpora returned by rag.list_corpora().
+
+    Args:
+        ttl_seconds: How long a listing stays valid before it is refreshed.
+        list_corpora_fn: Callable returning the corpora (defaults to rag.list_corpora).
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = CORPUS_CACHE_TTL_SECONDS,
+        list_corpora_fn: Optional[Callable[[], Iterable[Any]]] = None,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self._list_corpora_fn = list_corpora_fn or rag.list_corpora
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._by_display_name: Dict[str, str] = {}
+        self._by_resource_name: Dict[str, Dict[str, str]] = {}
+        self._loaded_at: Optional[float] = None
+        self._generation = 0
+        self.refresh_count = 0
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._loaded_at is not None
+            and time.monotonic() - self._loaded_at < self.ttl_seconds
+        )
+
+    def refresh(self, force: bool = False) -> None:
+        """
+        Reload the corpus listing.
+
+        Concurrent callers are collapsed into a single rag.list_corpora() call:
+        whoever holds the refresh lock does the listing and everyone waiting
+        behind it reuses the result.
+
+        Args:
+            force: Reload even if the cached listing has not expired yet.
+        """
+        seen_generation = self._generation
+        with self._refresh_lock:
+            if force:
+                # Another caller already refreshed while we were waiting
+                if self._generation != seen_generation:
+                    return
+            elif self._is_fresh():
+                return
+
+            corpora = self._list_corpora_fn()
+            by_display_name: Dict[str, str] = {}
+            by_resource_name: Dict[str, Dict[str, str]] = {}
+            for corpus in corpora:
+                info = {
+                    "resource_name": corpus.name,
+                    "display_name": getattr(corpus, "display_name", "") or "",
+                    "update_time": (
+                        str(corpus.update_time) if hasattr(corpus, "update_time") else ""
+                    ),
+                }
+                by_resource_name[corpus.name] = info
+                if info["display_name"]:
+                    by_display_name[info["display_name"]] = corpus.name
+
+            with self._lock:
+                self._by_display_name = by_display_name
+                self._by_resource_name = by_resource_name
+                self._loaded_at = time.monotonic()
+                self._generation += 1
+                self.refresh_count += 1
+            logger.info(f"Corpus resolver refreshed: {len(by_resource_name)} corpora")
+
+    def _ensure_fresh(self) -> None:
+        if not self._is_fresh():
+            self.refresh()
+
+    def invalidate(self) -> None:
+        """Drop the cached listing so the next lookup reloads it."""
+        with self._lock:
+            self._loaded_at = None
+
+    def resolve(self, corpus_name: str) -> Optional[str]:
+        """
+        Resolve a display name (or a known resource name) to a resource name.
+
+        Args:
+            corpus_name: Corpus display name or full resource name
+
+        Returns:
+            The full resource name, or None if no such corpus exists
+        """
+        self._ensure_fresh()
+        with self._lock:
+            if corpus_name in self._by_resource_name:
+                return corpus_name
+            return self._by_display_name.get(corpus_name)
+
+    def exists(self, corpus_name: str) -> bool:
+        """Return True if corpus_name is a known display name or resource name."""
+        return self.resolve(corpus_name) is not None
+
+    def get_corpus(self, corpus_name: str) -> Optional[Dict[str, str]]:
+        """
+        Return the cached listing entry (resource_name, display_name, update_time).
+
+        Args:
+            corpus_name: Corpus display name or full resource name
+        """
+        resource_name = self.resolve(corpus_name)
+        if resource_name is None:
+            return None
+        with self._lock:
+            info = self._by_resource_name.get(resource_name)
+            return dict(info) if info else None
+
+    def corpora(self) -> List[Dict[str, str]]:
+        """Return a snapshot of every cached corpus entry."""
+        self._ensure_fresh()
+        with self._lock:
+            return [dict(info) for info in self._by_resource_name.values()]
+
+
+# Single resolver shared by every RAG tool package in the process
+corpus_resolver = CorpusResolver()
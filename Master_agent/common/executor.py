@@ -0,0 +1,61 @@
+"""
+Bounded thread pool for running blocking Vertex AI calls off the event loop.
+
+ADK runs agents on asyncio; a blocking SDK call made directly from a tool
+stalls every other session served by the same process. Awaiting
+run_blocking() instead parks the call on a shared, size-limited pool.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from .config import BLOCKING_CALL_MAX_WORKERS
+
+_executor: Optional[ThreadPoolExecutor] = None
+_executor_lock = threading.Lock()
+
+
+def get_executor() -> ThreadPoolExecutor:
+    """Return the process-wide pool, creating it on first use."""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(
+                    max_workers=BLOCKING_CALL_MAX_WORKERS,
+                    thread_name_prefix="vertex-blocking",
+                )
+    return _executor
+
+
+async def run_blocking(
+    func: Callable[..., Any],
+    *args: Any,
+    timeout: Optional[float] = None,
+    **kwargs: Any,
+) -> Any:
+    """
+    Run a blocking callable on the shared pool and await its result.
+
+    Args:
+        func: Blocking callable
+        *args: Positional arguments for func
+        timeout: Seconds to wait before raising asyncio.TimeoutError (None waits forever)
+        **kwargs: Keyword arguments for func
+
+    Returns:
+        Whatever func returns
+
+    Note:
+        On timeout the caller stops waiting, but the worker thread finishes
+        the call in the background; the pool size bounds how many such
+        calls can pile up.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.wait_for(loop.run_in_executor(get_executor(), call), timeout)
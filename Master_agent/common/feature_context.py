@@ -0,0 +1,213 @@
+"""
+Per-feature retrieval context shared through session state.
+
+The generator, reviewer and refiner all need the same requirements and
+compliance context for the feature currently being processed. Every retrieval
+made by the RAG tools is recorded in a single bundle under
+state["feature_context"]; later agents read the bundle (it is injected into
+their instructions by feature_context_instruction) and the tools answer
+repeated queries from it.
+
+The bundle only holds references, {"corpora", "query", "results_count"} per
+retrieval; the result text lives in the process-wide context_store, keyed by
+the same corpora and query. A reference whose results have been evicted (or
+were stored by another process) counts as not retrieved: the tools search
+again and the instructions leave it out.
+"""
+
+import json
+import threading
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.utils.instructions_utils import inject_session_state
+
+from .config import FEATURE_CONTEXT_STORE_MAX_ENTRIES, FEATURE_CONTEXT_STORE_TTL_SECONDS
+from .retrieval_cache import RetrievalCache, make_cache_key, normalize_query
+
+FEATURE_CONTEXT_KEY = "feature_context"
+PREFETCHED_CONTEXT_KEY = "prefetched_context"
+
+# The analyst's validated feature list, the index of the feature being
+# processed, and that feature's description (for instruction templates)
+FEATURES_KEY = "features_to_process"
+FEATURE_CURSOR_KEY = "feature_cursor"
+CURRENT_FEATURE_KEY = "current_feature"
+
+# Template placeholder that feature_context_instruction fills with the retrieved text
+FEATURE_CONTEXT_PLACEHOLDER = "{feature_context?}"
+
+# Result text of the retrievals referenced from feature_context / prefetched_context
+context_store = RetrievalCache(
+    max_entries=FEATURE_CONTEXT_STORE_MAX_ENTRIES,
+    ttl_seconds=FEATURE_CONTEXT_STORE_TTL_SECONDS,
+)
+
+# Batched queries record concurrently
+_record_lock = threading.Lock()
+
+
+def feature_queue(state: Any) -> List[str]:
+    """
+    Return the validated feature list written by the requirements analyst.
+
+    Args:
+        state: Session state
+
+    Returns:
+        All features of the run, including those already processed
+    """
+    return list(state.get(FEATURES_KEY) or [])
+
+
+def current_feature(state: Any) -> str:
+    """
+    Return the feature currently being processed (features_to_process[feature_cursor]).
+
+    Args:
+        state: Session state
+
+    Returns:
+        The feature description, or an empty string if the queue is exhausted
+    """
+    features = feature_queue(state)
+    cursor = state.get(FEATURE_CURSOR_KEY) or 0
+    return features[cursor] if 0 <= cursor < len(features) else ""
+
+
+def _retrieval_key(corpora: List[str], query: str) -> List[Any]:
+    return [sorted(corpora), normalize_query(query)]
+
+
+def _store_key(corpora: List[str], query: str):
+    return make_cache_key(query, corpora, 0, 0.0)
+
+
+def store_retrieval(corpora: List[str], query: str, results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Put a retrieval's results in the context store.
+
+    Args:
+        corpora: Corpus display names that were queried
+        query: Query text
+        results: Retrieval results as returned by rag_query
+
+    Returns:
+        The reference to record in a bundle: corpora, query and results_count
+    """
+    context_store.put(_store_key(corpora, query), results)
+    return {"corpora": sorted(corpora), "query": query, "results_count": len(results)}
+
+
+def retrieval_results(retrieval: Dict[str, Any]) -> Optional[List[Dict[str, Any]]]:
+    """Return the stored results of a bundle reference, or None if they are gone."""
+    return context_store.get(_store_key(retrieval["corpora"], retrieval["query"]))
+
+
+def get_feature_context(state: Any, feature: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Return the context bundle for the given (default: current) feature.
+
+    A bundle recorded for a different feature is ignored; in that case the
+    bundle prefetched for this feature (if any) is used instead.
+    """
+    feature = current_feature(state) if feature is None else feature
+    bundle = state.get(FEATURE_CONTEXT_KEY) or {}
+    if not bundle or bundle.get("feature", "") != feature:
+        prefetched = (state.get(PREFETCHED_CONTEXT_KEY) or {}).get(feature)
+        return prefetched or {"feature": feature, "retrievals": []}
+    return bundle
+
+
+def lookup_feature_context(
+    state: Any,
+    corpora: List[str],
+    query: str,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Return bundled results for an identical (corpora, query) retrieval, if any.
+
+    Args:
+        state: Session state
+        corpora: Corpus display names
+        query: Query text
+
+    Returns:
+        The recorded results, or None if the bundle does not cover the query
+    """
+    key = _retrieval_key(corpora, query)
+    for retrieval in get_feature_context(state).get("retrievals", []):
+        if _retrieval_key(retrieval["corpora"], retrieval["query"]) == key:
+            return retrieval_results(retrieval)
+    return None
+
+
+def record_feature_context(
+    state: Any,
+    corpora: List[str],
+    query: str,
+    results: List[Dict[str, Any]],
+) -> None:
+    """
+    Add a retrieval to the current feature's bundle in session state.
+
+    Args:
+        state: Session state
+        corpora: Corpus display names that were queried
+        query: Query text
+        results: Retrieval results as returned by rag_query
+    """
+    key = _retrieval_key(corpora, query)
+    reference = store_retrieval(corpora, query, results)
+    with _record_lock:
+        bundle = get_feature_context(state)
+        retrievals = [
+            retrieval
+            for retrieval in bundle.get("retrievals", [])
+            if _retrieval_key(retrieval["corpora"], retrieval["query"]) != key
+        ]
+        retrievals.append(reference)
+        state[FEATURE_CONTEXT_KEY] = {"feature": bundle["feature"], "retrievals": retrievals}
+
+
+def render_feature_context(state: Any) -> str:
+    """
+    Render the current feature's retrievals, with their stored results, for an instruction.
+
+    Returns:
+        JSON with the feature and one entry per retrieval whose results are
+        still stored; an empty string if there are none
+    """
+    bundle = get_feature_context(state)
+    retrievals = []
+    for retrieval in bundle.get("retrievals", []):
+        results = retrieval_results(retrieval)
+        if results is not None:
+            retrievals.append({"corpora": retrieval["corpora"], "query": retrieval["query"], "results": results})
+    if not retrievals:
+        return ""
+    return json.dumps({"feature": bundle.get("feature", ""), "retrievals": retrievals}, indent=1)
+
+
+def feature_context_instruction(template: str) -> Callable[[ReadonlyContext], Awaitable[str]]:
+    """
+    Build an instruction provider that fills {feature_context?} from the context store.
+
+    The rest of the template is populated from session state as a plain
+    instruction string would be; the retrieved text is inserted afterwards,
+    so braces in it are never read as state placeholders.
+
+    Args:
+        template: Instruction template using {feature_context?}
+
+    Returns:
+        An InstructionProvider for LlmAgent(instruction=...)
+    """
+    marker = "\x00feature_context\x00"
+    marked = template.replace(FEATURE_CONTEXT_PLACEHOLDER, marker)
+
+    async def provide_instruction(readonly_context: ReadonlyContext) -> str:
+        instruction = await inject_session_state(marked, readonly_context)
+        return instruction.replace(marker, render_feature_context(readonly_context.state))
+
+    return provide_instruction
@@ -0,0 +1,255 @@
+"""
+Deterministic parser for the test case markdown emitted by the generator,
+refiner and enhancer agents.
+
+The expected format is a table
+
+    | Sr.No | Test Description | Expected Result |
+    | :---- | :--------------- | :-------------- |
+    | 1.    | ...              | ...             |
+
+followed by a bullet list under `### Applied Compliance Rules`. The parser
+works line by line, so it can be fed a streamed response chunk by chunk. It
+tolerates escaped pipes (`\\|`), missing trailing pipes and ragged rows, and
+returns None when the input does not validate so callers can fall back to an
+LLM-based parser.
+"""
+
+import re
+from typing import Any, Dict, Iterable, List, Optional
+
+COMPLIANCE_HEADER_PATTERN = re.compile(
+    r"^(?:#{1,6}\s*Applied Compliance Rules\b|(?:\*\*)?Applied Compliance Rules:?(?:\*\*)?:?$)",
+    re.IGNORECASE,
+)
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.*?)\s*#*\s*$")
+SEPARATOR_CELL_PATTERN = re.compile(r"^:?-{1,}:?$")
+ESCAPED_PIPE_SPLIT_PATTERN = re.compile(r"(?<!\\)\|")
+BULLET_PATTERN = re.compile(r"^\s*(?:[-*+]|\d+[.)])\s+(.*)$")
+RULE_ID_PATTERN = re.compile(r"\b[A-Z][A-Z0-9]*(?:[-.][A-Za-z0-9]+)+\b")
+RULE_SEPARATOR_PATTERN = re.compile(r"\s*(?::|\s[-–—]\s|\()\s*")
+
+MAX_TITLE_WORDS = 10
+
+# Header names the three table columns are recognised by
+_SR_NO_HEADERS = ("sr.no", "sr. no", "sr no", "s.no", "no", "#", "testcaseid", "id")
+_DESCRIPTION_HEADERS = ("test description", "description", "test case", "test scenario")
+_EXPECTED_HEADERS = ("expected result", "expected results", "expected", "expected outcome")
+_COMPLIANCE_HEADERS = ("applied compliance", "compliance", "compliance ids", "compliance rules")
+
+
+def split_table_row(line: str) -> List[str]:
+    """
+    Split a markdown table row into stripped cell values.
+
+    Escaped pipes (\\|) stay inside their cell; leading and trailing pipes are optional.
+    """
+    text = line.strip()
+    if "\\|" in text:
+        cells = [cell.replace("\\|", "|").strip() for cell in ESCAPED_PIPE_SPLIT_PATTERN.split(text)]
+    else:
+        cells = [cell.strip() for cell in text.split("|")]
+
+    if text.startswith("|"):
+        cells = cells[1:]
+    if text.endswith("|") and not text.endswith("\\|"):
+        cells = cells[:-1]
+    return cells
+
+
+def is_separator_row(cells: List[str]) -> bool:
+    """Return True for the `| :--- | :--- |` row under a table header."""
+    return bool(cells) and all(SEPARATOR_CELL_PATTERN.match(cell.replace(" ", "")) for cell in cells)
+
+
+def _is_table_line(line: str) -> bool:
+    return "|" in line and line.strip().startswith("|")
+
+
+def _column_index(header: List[str], names: Iterable[str]) -> Optional[int]:
+    normalized = [re.sub(r"[*_`]", "", cell).strip().lower() for cell in header]
+    for name in names:
+        if name in normalized:
+            return normalized.index(name)
+    return None
+
+
+def _clean_inline(text: str) -> str:
+    text = re.sub(r"(\*\*|__|`)", "", text)
+    return text.strip().strip("[]").strip()
+
+
+def extract_rule_id(bullet: str) -> str:
+    """
+    Reduce an `Applied Compliance Rules` bullet to its rule name or ID.
+
+    "HIPAA-164.312: Access control" -> "HIPAA-164.312"
+    "**GDPR Article 32** - Security of processing" -> "GDPR Article 32"
+    "SOC 2" -> "SOC 2"
+    """
+    text = _clean_inline(bullet)
+    parts = RULE_SEPARATOR_PATTERN.split(text, maxsplit=1)
+    if len(parts) == 2 and parts[0] and len(parts[0].split()) <= 6:
+        return parts[0].strip()
+    match = RULE_ID_PATTERN.search(text)
+    if match:
+        return match.group(0)
+    return text
+
+
+def make_title(text: str, max_words: int = MAX_TITLE_WORDS) -> str:
+    """Shorten a feature or heading text to a test case set title."""
+    words = _clean_inline(text).split()
+    return " ".join(words[:max_words]).rstrip(".,;:")
+
+
+class TestcaseMarkdownParser:
+    """
+    Incremental parser for a test case table plus its compliance rule list.
+
+    Usage:
+        parser = TestcaseMarkdownParser()
+        for chunk in stream:
+            parser.feed(chunk)
+        result = parser.close()
+    """
+
+    __test__ = False  # Not a pytest test class despite the name
+
+    def __init__(self):
+        self._buffer = ""
+        self._header: Optional[List[str]] = None
+        self._columns: Dict[str, Optional[int]] = {}
+        self._pending_header: Optional[List[str]] = None
+        self._in_compliance_section = False
+        self._last_heading = ""
+        self.heading = ""
+        self.rows: List[List[str]] = []
+        self.compliance_ids: List[str] = []
+        self.ragged_rows = 0
+
+    def feed(self, chunk: str) -> None:
+        """Consume a chunk of markdown; complete lines are parsed immediately."""
+        self._buffer += chunk
+        *lines, self._buffer = self._buffer.split("\n")
+        for line in lines:
+            self._parse_line(line)
+
+    def close(self) -> Optional[Dict[str, Any]]:
+        """Flush the last line and return the validated result (or None)."""
+        if self._buffer:
+            self._parse_line(self._buffer)
+            self._buffer = ""
+        return self.result()
+
+    def _add_compliance_id(self, rule_id: str) -> None:
+        if rule_id and rule_id not in self.compliance_ids:
+            self.compliance_ids.append(rule_id)
+
+    def _parse_line(self, line: str) -> None:
+        stripped = line.strip()
+
+        if _is_table_line(stripped):
+            cells = split_table_row(stripped)
+            if self._pending_header is not None and is_separator_row(cells):
+                self._start_table(self._pending_header)
+                self._pending_header = None
+            elif self._header is not None:
+                self._add_row(cells)
+            else:
+                self._pending_header = cells
+            return
+
+        # Any non-table line ends the current table
+        self._pending_header = None
+        if self._header is not None and stripped:
+            self._header = None
+
+        if COMPLIANCE_HEADER_PATTERN.match(stripped):
+            self._in_compliance_section = True
+            return
+
+        heading = HEADING_PATTERN.match(stripped)
+        if heading:
+            self._in_compliance_section = False
+            self._last_heading = heading.group(1)
+            return
+
+        if self._in_compliance_section:
+            bullet = BULLET_PATTERN.match(line)
+            if bullet:
+                self._add_compliance_id(extract_rule_id(bullet.group(1)))
+
+    def _start_table(self, header: List[str]) -> None:
+        description = _column_index(header, _DESCRIPTION_HEADERS)
+        expected = _column_index(header, _EXPECTED_HEADERS)
+        if description is None or expected is None:
+            # Not a test case table (e.g. a review table); ignore its rows
+            self._header = None
+            return
+        self._header = header
+        self._columns = {
+            "sr_no": _column_index(header, _SR_NO_HEADERS),
+            "description": description,
+            "expected": expected,
+            "compliance": _column_index(header, _COMPLIANCE_HEADERS),
+        }
+        if not self.heading and self._last_heading:
+            self.heading = self._last_heading
+
+    def _add_row(self, cells: List[str]) -> None:
+        if is_separator_row(cells) or not any(cells):
+            return
+        width = len(self._header or [])
+        if len(cells) != width:
+            self.ragged_rows += 1
+            if len(cells) > width and self._columns["expected"] == width - 1:
+                # An unescaped pipe inside the last column: glue the overflow back on
+                cells = cells[: width - 1] + [" | ".join(cells[width - 1:])]
+            else:
+                cells = (cells + [""] * width)[:max(width, len(cells))]
+
+        def cell(column: str) -> str:
+            index = self._columns.get(column)
+            return cells[index].strip() if index is not None and index < len(cells) else ""
+
+        sr_no = cell("sr_no") or f"{len(self.rows) + 1}."
+        self.rows.append([sr_no, cell("description"), cell("expected")])
+
+        compliance = cell("compliance")
+        if compliance and compliance.upper() not in ("N/A", "NONE", "-"):
+            for rule in re.split(r"[,;]", compliance):
+                self._add_compliance_id(extract_rule_id(rule))
+
+    def result(self) -> Optional[Dict[str, Any]]:
+        """
+        Return {"testcases", "compliance_ids", "heading"} if the parse validates.
+
+        Validation requires at least one row, and every row must have a
+        non-empty description and expected result.
+        """
+        if not self.rows:
+            return None
+        if any(not row[1] or not row[2] for row in self.rows):
+            return None
+        return {
+            "testcases": [list(row) for row in self.rows],
+            "compliance_ids": list(self.compliance_ids),
+            "heading": self.heading,
+        }
+
+
+def parse_testcase_markdown(text: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a complete test case markdown document.
+
+    Args:
+        text: Markdown with a test case table and optional compliance section
+
+    Returns:
+        {"testcases": [[Sr.No, Description, Expected], ...], "compliance_ids": [...],
+        "heading": str} or None if the input does not validate
+    """
+    parser = TestcaseMarkdownParser()
+    parser.feed(text)
+    return parser.close()
@@ -0,0 +1,87 @@
+"""
+Shared registry of Vertex AI GenerativeModel clients.
+
+The processor agents call Gemini directly for parsing fallbacks and summaries.
+Instead of constructing a new GenerativeModel on every call, they get one from
+this registry, keyed by model name and generation config, so each distinct
+client is built once per process and reused across calls and sessions.
+"""
+
+import json
+import logging
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from vertexai.generative_models import GenerativeModel
+
+from .config import MODEL_CLIENT_WARMUP
+
+logger = logging.getLogger(__name__)
+
+_clients: Dict[Tuple[str, str], GenerativeModel] = {}
+_lock = threading.Lock()
+_constructions = 0
+
+
+def _registry_key(model_name: str, generation_config: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    return model_name, json.dumps(generation_config or {}, sort_keys=True, default=str)
+
+
+def get_model(
+    model_name: str,
+    generation_config: Optional[Dict[str, Any]] = None,
+) -> GenerativeModel:
+    """
+    Return the shared client for a model name and generation config, creating it on first use.
+
+    Args:
+        model_name: Model identifier (e.g. gemini-2.0-flash)
+        generation_config: Optional generation config dict passed to GenerativeModel
+
+    Returns:
+        GenerativeModel: The cached client
+    """
+    global _constructions
+    key = _registry_key(model_name, generation_config)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            if generation_config:
+                client = GenerativeModel(model_name, generation_config=generation_config)
+            else:
+                client = GenerativeModel(model_name)
+            _clients[key] = client
+            _constructions += 1
+            logger.info(f"Created GenerativeModel client for {model_name}")
+    return client
+
+
+def warm_up_model_clients(model_names: Optional[List[str]] = None) -> None:
+    """
+    Create clients ahead of the first request.
+
+    Args:
+        model_names: Models to warm up (default: MODEL_CLIENT_WARMUP from config)
+    """
+    for model_name in MODEL_CLIENT_WARMUP if model_names is None else model_names:
+        try:
+            get_model(model_name)
+        except Exception as e:
+            logger.warning(f"Failed to warm up model client {model_name}: {e}")
+
+
+def model_client_stats() -> Dict[str, int]:
+    """Return the number of cached clients and of clients constructed so far."""
+    return {"clients": len(_clients), "constructions": _constructions}
+
+
+def clear_model_clients() -> None:
+    """Drop all cached clients (e.g. after re-initializing Vertex AI)."""
+    global _constructions
+    with _lock:
+        _clients.clear()
+        _constructions = 0
@@ -0,0 +1,163 @@
+"""
+Deterministic pre-classifier for the Master Routing Agent.
+
+Most requests are obviously either new test case generation ("generate test
+cases for ...") or an enhancement of earlier test cases ("update test case
+5 ..."). classify_query scores a query against the indicator lists from the
+routing instruction; when the score is high enough the root agent transfers
+straight to the sub-agent and the LLM router is only used for the rest.
+"""
+
+import re
+import threading
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+NEW_GENERATION = "new_generation"
+ENHANCEMENT = "enhancement"
+UNCLASSIFIED = "unclassified"
+
+# "generate test cases for...", "create test cases for...", "I need test cases for..."
+GENERATION_PATTERNS = [
+    re.compile(r"\b(generate|create|write|produce|provide|draft|design)\b.{0,60}?\btest[\s-]?cases?\b"),
+    re.compile(r"\bi (need|want|would like)\b.{0,20}?\btest[\s-]?cases?\b"),
+    re.compile(r"\btest[\s-]?cases?\s+(for|covering|on)\b"),
+]
+
+# "test case 3", "the earlier test cases", "previous test cases", "existing test cases"
+REFERENCE_PATTERNS = [
+    re.compile(r"\btest[\s-]?cases?\s*(#|no\.?|number)?\s*\d+"),
+    re.compile(r"\b(earlier|previous|previously|existing|above|last|prior)\b"),
+    re.compile(r"\b(those|these|the same)\s+test[\s-]?cases?\b"),
+    re.compile(r"\btest[\s-]?cases?\s+(you|we)\s+(generated|created|wrote)\b"),
+]
+
+# "update", "enhance", "refine", "add to", "modify", "improve", "add more scenarios to..."
+ENHANCEMENT_PATTERNS = [
+    re.compile(r"\b(update|enhance|refine|modify|improve|extend|revise|rework|incorporate)\b"),
+    re.compile(r"\badd\b.{0,60}?\b(to|into|in)\b"),
+    re.compile(r"\badd (more|edge|negative|boundary|compliance|extra|additional)\b"),
+]
+
+TEST_CASE_PATTERN = re.compile(r"\btest[\s-]?cases?\b")
+
+# Questions and explanations go to the LLM, which answers them directly
+QUESTION_PATTERN = re.compile(
+    r"^(what|how|why|who|when|where|which|can you|could you tell|explain|tell me|is|are|do|does|hello|hi|hey)\b"
+)
+# ...except polite requests such as "Can you create test cases for ...?"
+POLITE_REQUEST_PATTERN = re.compile(
+    r"^(can|could|would|will) you (please )?(generate|create|write|provide|draft|design|update|enhance|refine|modify|improve|add)\b"
+)
+
+# Signal weights; a category's confidence is the sum of its matched signals
+GENERATION_WEIGHT = 0.6
+REFERENCE_WEIGHT = 0.5
+ENHANCEMENT_VERB_WEIGHT = 0.4
+TEST_CASE_MENTION_WEIGHT = {NEW_GENERATION: 0.2, ENHANCEMENT: 0.1}
+QUESTION_PENALTY = 0.3
+NO_HISTORY_PENALTY = 0.3
+
+
+@dataclass
+class QueryClassification:
+    """Result of classify_query."""
+
+    category: str
+    confidence: float
+    signals: List[str] = field(default_factory=list)
+
+
+def classify_query(query: str, has_history: bool = True) -> QueryClassification:
+    """
+    Classify a user query as new generation or enhancement, with a confidence score.
+
+    Args:
+        query: The user's request
+        has_history: Whether test cases were generated earlier in the session;
+            without them an enhancement request cannot be served directly
+
+    Returns:
+        QueryClassification: The best category (UNCLASSIFIED if no signal
+        matched), its confidence in [0, 1] and the signals that matched
+    """
+    text = " ".join(query.lower().split())
+    signals: List[str] = []
+
+    generation = any(pattern.search(text) for pattern in GENERATION_PATTERNS)
+    reference = any(pattern.search(text) for pattern in REFERENCE_PATTERNS)
+    enhancement_verb = any(pattern.search(text) for pattern in ENHANCEMENT_PATTERNS)
+    mentions_test_cases = bool(TEST_CASE_PATTERN.search(text))
+    question = bool(QUESTION_PATTERN.search(text)) or text.endswith("?")
+    question = question and not POLITE_REQUEST_PATTERN.search(text)
+
+    scores = {NEW_GENERATION: 0.0, ENHANCEMENT: 0.0}
+    if generation:
+        scores[NEW_GENERATION] += GENERATION_WEIGHT
+        signals.append("generation_phrase")
+    if reference:
+        scores[ENHANCEMENT] += REFERENCE_WEIGHT
+        signals.append("reference_to_previous")
+    if enhancement_verb:
+        scores[ENHANCEMENT] += ENHANCEMENT_VERB_WEIGHT
+        signals.append("enhancement_verb")
+    if mentions_test_cases:
+        for category, weight in TEST_CASE_MENTION_WEIGHT.items():
+            if scores[category]:
+                scores[category] += weight
+        signals.append("test_case_mention")
+
+    category = max(scores, key=scores.get)
+    if not scores[category]:
+        return QueryClassification(UNCLASSIFIED, 0.0, signals)
+
+    # Hybrid requests lose confidence by the strength of the competing category
+    other = ENHANCEMENT if category == NEW_GENERATION else NEW_GENERATION
+    confidence = scores[category] - scores[other]
+    if question:
+        confidence -= QUESTION_PENALTY
+        signals.append("question")
+    if category == ENHANCEMENT and not has_history:
+        confidence -= NO_HISTORY_PENALTY
+        signals.append("no_history")
+
+    return QueryClassification(category, round(max(0.0, min(1.0, confidence)), 2), signals)
+
+
+class RouterStats:
+    """Thread-safe counters for fast-path routing decisions."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def record(self, classification: QueryClassification, fast_path: bool) -> None:
+        """Count one routing decision."""
+        key = f"fast_path_{classification.category}" if fast_path else "llm_fallback"
+        with self._lock:
+            self._counts["total"] = self._counts.get("total", 0) + 1
+            self._counts[key] = self._counts.get(key, 0) + 1
+
+    def reset(self) -> None:
+        """Reset all counters."""
+        with self._lock:
+            self._counts.clear()
+
+    def stats(self) -> Dict[str, Optional[float]]:
+        """Return the counters plus the fast-path hit rate."""
+        with self._lock:
+            counts = dict(self._counts)
+        total = counts.get("total", 0)
+        fast_path = sum(value for key, value in counts.items() if key.startswith("fast_path_"))
+        return {
+            "total": total,
+            "fast_path": fast_path,
+            "fast_path_new_generation": counts.get(f"fast_path_{NEW_GENERATION}", 0),
+            "fast_path_enhancement": counts.get(f"fast_path_{ENHANCEMENT}", 0),
+            "llm_fallback": counts.get("llm_fallback", 0),
+            "hit_rate": fast_path / total if total else None,
+        }
+
+
+# Counters for the root agent's router
+router_stats = RouterStats()
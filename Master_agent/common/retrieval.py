@@ -0,0 +1,92 @@
+"""
+Shared retrieval helper behind every copy of the rag_query tool.
+
+Keeping the Vertex AI call in one place lets the generator, reviewer and
+enhancer tools share a single result cache.
+"""
+
+import logging
+from typing import Any, Dict, List, Optional
+
+from vertexai import rag
+
+from .corpus_resolver import corpus_resolver
+from .retrieval_cache import RetrievalCache, make_cache_key
+
+logger = logging.getLogger(__name__)
+
+
+def _corpus_update_time(resource_name: str) -> Optional[str]:
+    corpus = corpus_resolver.get_corpus(resource_name)
+    return corpus["update_time"] if corpus else None
+
+
+# Single result cache shared by every RAG tool package in the process
+retrieval_cache = RetrievalCache(corpus_version_fn=_corpus_update_time)
+
+
+def parse_retrieval_response(response: Any) -> List[Dict[str, Any]]:
+    """
+    Convert a rag.retrieval_query response into plain result dicts.
+
+    Args:
+        response: Response returned by rag.retrieval_query
+
+    Returns:
+        list: Dicts with source_uri, source_name, text and score
+    """
+    results: List[Dict[str, Any]] = []
+    # Prefer a robust parse that works if response.contexts is either a list or an object
+    ctxs = getattr(response, "contexts", None)
+    if ctxs:
+        # Try iterable of context objects
+        iterable = getattr(ctxs, "contexts", ctxs)
+        for ctx in iterable:
+            results.append({
+                "source_uri": getattr(ctx, "source_uri", "") or "",
+                "source_name": getattr(ctx, "source_display_name", "") or "",
+                "text": getattr(ctx, "text", "") or "",
+                "score": getattr(ctx, "score", 0.0) or 0.0,
+            })
+    return results
+
+
+def retrieve_contexts(
+    resource_names: List[str],
+    query: str,
+    top_k: int,
+    vector_distance_threshold: float,
+) -> List[Dict[str, Any]]:
+    """
+    Run a single retrieval across the given corpora, serving it from cache when possible.
+
+    Args:
+        resource_names: Full resource names of the corpora to query
+        query: Query text
+        top_k: Number of contexts to retrieve
+        vector_distance_threshold: Maximum vector distance of returned contexts
+
+    Returns:
+        list: Result dicts as produced by parse_retrieval_response
+    """
+    key = make_cache_key(query, resource_names, top_k, vector_distance_threshold)
+    cached = retrieval_cache.get(key)
+    if cached is not None:
+        logger.info(f"Retrieval cache hit for corpora {list(key[1])}")
+        return cached
+
+    rag_retrieval_config = rag.RagRetrievalConfig(
+        top_k=top_k,
+        filter=rag.Filter(vector_distance_threshold=vector_distance_threshold),
+    )
+
+    # Single retrieval across multiple corpora
+    response = rag.retrieval_query(
+        rag_resources=[rag.RagResource(rag_corpus=rn) for rn in resource_names],
+        text=query,
+        rag_retrieval_config=rag_retrieval_config,
+    )
+
+    results = parse_retrieval_response(response)
+    retrieval_cache.put(key, results)
+    return results
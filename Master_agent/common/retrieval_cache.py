@@ -0,0 +1,173 @@
+"""
+LRU + TTL cache for RAG retrieval results.
+
+The generator, reviewer and refiner tend to issue the same retrieval (same
+corpora, same query) several times within a pipeline run and across sessions.
+Results are cached per (normalized query, sorted corpus resource names, top_k,
+vector_distance_threshold) and dropped when any of the queried corpora reports
+a new update_time.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .config import RETRIEVAL_CACHE_MAX_ENTRIES, RETRIEVAL_CACHE_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+CacheKey = Tuple[str, Tuple[str, ...], int, float]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace and case so trivially different queries share an entry."""
+    return " ".join(query.split()).casefold()
+
+
+def make_cache_key(
+    query: str,
+    resource_names: Iterable[str],
+    top_k: int,
+    vector_distance_threshold: float,
+) -> CacheKey:
+    """
+    Build the cache key for a retrieval.
+
+    Args:
+        query: Query text
+        resource_names: Full resource names of the queried corpora
+        top_k: Number of contexts requested
+        vector_distance_threshold: Retrieval distance filter
+
+    Returns:
+        Hashable cache key
+    """
+    return (
+        normalize_query(query),
+        tuple(sorted(set(resource_names))),
+        int(top_k),
+        float(vector_distance_threshold),
+    )
+
+
+class RetrievalCache:
+    """
+    Thread-safe LRU cache with per-entry TTL and corpus-version invalidation.
+
+    Args:
+        max_entries: Maximum number of cached retrievals; the least recently
+            used entry is evicted beyond this.
+        ttl_seconds: Maximum age of a cached retrieval.
+        corpus_version_fn: Callable mapping a corpus resource name to its
+            current update_time (or None if unknown). Entries whose stored
+            versions no longer match are discarded on lookup.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = RETRIEVAL_CACHE_MAX_ENTRIES,
+        ttl_seconds: float = RETRIEVAL_CACHE_TTL_SECONDS,
+        corpus_version_fn: Optional[Callable[[str], Optional[str]]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._corpus_version_fn = corpus_version_fn
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[CacheKey, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _corpus_versions(self, resource_names: Iterable[str]) -> Dict[str, Optional[str]]:
+        if self._corpus_version_fn is None:
+            return {}
+        versions: Dict[str, Optional[str]] = {}
+        for resource_name in resource_names:
+            try:
+                versions[resource_name] = self._corpus_version_fn(resource_name)
+            except Exception as e:
+                logger.warning(f"Could not read update_time for corpus {resource_name}: {e}")
+                versions[resource_name] = None
+        return versions
+
+    def get(self, key: CacheKey) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return the cached results for key, or None on a miss.
+
+        Expired entries and entries whose corpora changed since they were
+        stored count as misses and are removed.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+        if entry is None:
+            with self._lock:
+                self.misses += 1
+            return None
+
+        expired = time.monotonic() - entry["stored_at"] >= self.ttl_seconds
+        stale = not expired and self._corpus_versions(key[1]) != entry["versions"]
+
+        with self._lock:
+            if expired or stale:
+                if self._entries.get(key) is entry:
+                    del self._entries[key]
+                if stale:
+                    self.invalidations += 1
+                self.misses += 1
+                return None
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+            return [dict(result) for result in entry["results"]]
+
+    def put(self, key: CacheKey, results: List[Dict[str, Any]]) -> None:
+        """Store the results for key, evicting the least recently used entries."""
+        if self.max_entries <= 0:
+            return
+        entry = {
+            "results": [dict(result) for result in results],
+            "versions": self._corpus_versions(key[1]),
+            "stored_at": time.monotonic(),
+        }
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_corpus(self, resource_name: str) -> int:
+        """
+        Drop every cached retrieval that touched the given corpus.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            keys = [key for key in self._entries if resource_name in key[1]]
+            for key in keys:
+                del self._entries[key]
+            self.invalidations += len(keys)
+        return len(keys)
+
+    def clear(self) -> None:
+        """Drop every cached retrieval."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return size and hit/miss counters."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "hit_rate": (self.hits / lookups) if lookups else 0.0,
+            }
@@ -0,0 +1,306 @@
+"""
+Deterministic parser for the reviewer's `testcase_reviews` table.
+
+    | TestCaseID | IssueCategory | Comment | Recommendation |
+    | :--- | :--- | :--- | :--- |
+    | N/A | Approval | Test case suite meets all requirements ... | No further refinement needed. |
+
+The refinement loop uses it to decide, without a model call, whether the
+refiner has anything to do, and the chunked reviewer uses it to merge the
+tables of its partial reviews into one.
+"""
+
+import math
+import re
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .config import REFINEMENT_MAX_ITERATIONS, REFINEMENT_SEVERITY_PER_ITERATION
+from .markdown_tables import is_separator_row, split_table_row
+
+APPROVAL = "Approval"
+GENERATION_FAILURE = "Generation Failure"
+# Reported by the local linter (common.testcase_linter): empty fields, Sr.No not 1..n
+SCHEMA_VIOLATION = "Schema Violation"
+
+# Outcomes of review_outcome
+REVIEW_APPROVED = "approved"
+REVIEW_GENERATION_FAILURE = "generation_failure"
+REVIEW_HAS_ISSUES = "issues"
+REVIEW_UNPARSED = "unparsed"
+# Not a review_outcome result: the refinement loop's final_review when its last refine pass was not re-reviewed
+REVIEW_UNREVIEWED = "unreviewed"
+
+# How much one finding of each IssueCategory adds to the refinement budget
+ISSUE_SEVERITY_WEIGHTS = {
+    "Compliance Gap": 2.0,
+    "Incorrectness": 1.5,
+    "Coverage Gap": 1.0,
+    "Incompleteness": 1.0,
+    "Lack of Clarity": 0.5,
+    "Redundancy": 0.5,
+    SCHEMA_VIOLATION: 0.5,
+}
+DEFAULT_SEVERITY_WEIGHT = 1.0
+
+# Canonical spelling of the categories the reviewer instruction defines
+KNOWN_CATEGORIES = {
+    category.lower(): category
+    for category in [APPROVAL, GENERATION_FAILURE, *ISSUE_SEVERITY_WEIGHTS]
+}
+
+# TestCaseID cells list IDs separated by commas, semicolons, "&" or "and"
+TESTCASE_ID_SEPARATOR_PATTERN = re.compile(r"\s*(?:[,;&]|\band\b)\s*", re.IGNORECASE)
+# One ID or range: "3", "3.", "#3", "TC-3", "test case 3", "2-4", "TC-2 to TC-4"
+TESTCASE_ID_PATTERN = re.compile(
+    r"(?:(?:test\s*case|tc)\s*[-#]?\s*|#)?(\d+)\.?"
+    r"(?:\s*(?:-|–|to)\s*(?:(?:test\s*case|tc)\s*[-#]?\s*|#)?(\d+)\.?)?",
+    re.IGNORECASE,
+)
+
+REVIEW_COLUMNS = {
+    "testcaseid": "testcase_id",
+    "issuecategory": "issue_category",
+    "comment": "comment",
+    "recommendation": "recommendation",
+}
+
+
+def _normalize_header(cell: str) -> str:
+    return re.sub(r"[\s*_`]", "", cell).lower()
+
+
+def normalize_category(category: str) -> str:
+    """Normalize an IssueCategory value ("**coverage  gap**" -> "Coverage Gap")."""
+    text = " ".join(re.sub(r"[*_`]", "", category).split())
+    return KNOWN_CATEGORIES.get(text.lower(), text)
+
+
+def parse_review_table(text: str) -> Optional[List[Dict[str, str]]]:
+    """
+    Parse the first review table in text.
+
+    Args:
+        text: The reviewer's output (testcase_reviews)
+
+    Returns:
+        One dict per row with testcase_id, issue_category, comment and
+        recommendation, or None if no review table was found
+    """
+    rows: Optional[List[Dict[str, str]]] = None
+    columns: Dict[str, int] = {}
+    pending_header: Optional[List[str]] = None
+
+    for line in (text or "").splitlines():
+        stripped = line.strip()
+        if not stripped.startswith("|"):
+            if rows is not None:
+                break
+            pending_header = None
+            continue
+
+        cells = split_table_row(stripped)
+        if rows is None:
+            if pending_header is not None and is_separator_row(cells):
+                headers = [_normalize_header(cell) for cell in pending_header]
+                if "issuecategory" in headers:
+                    columns = {
+                        key: headers.index(header)
+                        for header, key in REVIEW_COLUMNS.items()
+                        if header in headers
+                    }
+                    rows = []
+                pending_header = None
+            else:
+                pending_header = cells
+            continue
+
+        if is_separator_row(cells) or not any(cells):
+            continue
+        row = {
+            key: cells[index] if index < len(cells) else ""
+            for key, index in columns.items()
+        }
+        row["issue_category"] = normalize_category(row.get("issue_category", ""))
+        rows.append(row)
+
+    return rows
+
+
+def parse_testcase_ids(value: str) -> List[int]:
+    """
+    Read the test case numbers of a TestCaseID cell.
+
+    Returns:
+        The numbers ("3", "TC-3", "3, 7", "2-4" -> [3], [3], [3, 7], [2, 3, 4]);
+        empty for "N/A" and other cells without a number. Tokens that are not
+        a whole ID or range ("1.2", "v2") are skipped rather than split.
+    """
+    numbers: List[int] = []
+    for token in TESTCASE_ID_SEPARATOR_PATTERN.split((value or "").strip()):
+        match = TESTCASE_ID_PATTERN.fullmatch(token)
+        if not match:
+            continue
+        start, end = match.groups()
+        low, high = sorted((int(start), int(end or start)))
+        numbers += [number for number in range(low, high + 1) if number not in numbers]
+    return numbers
+
+
+def split_review_items(
+    reviews: Optional[List[Dict[str, str]]],
+    testcase_ids: Iterable[int],
+) -> Tuple[Dict[int, List[Dict[str, str]]], List[Dict[str, str]]]:
+    """
+    Split review rows into targeted edits and new-coverage items.
+
+    Args:
+        reviews: Parsed review table
+        testcase_ids: The sr_no values of the reviewed suite's test cases
+
+    Returns:
+        Tuple of (targeted, coverage): targeted maps each flagged sr_no to
+        its review rows; coverage holds the rows that name no existing test
+        case ("N/A" or an unknown sr_no). Approvals are left out.
+    """
+    existing = set(testcase_ids)
+    targeted: Dict[int, List[Dict[str, str]]] = {}
+    coverage: List[Dict[str, str]] = []
+    for row in reviews or []:
+        if row["issue_category"] == APPROVAL:
+            continue
+        numbers = [
+            number for number in parse_testcase_ids(row.get("testcase_id", ""))
+            if number in existing
+        ]
+        if not numbers:
+            coverage.append(row)
+        for number in numbers:
+            targeted.setdefault(number, []).append(row)
+    return dict(sorted(targeted.items())), coverage
+
+
+def _table_cell(text: str) -> str:
+    return " ".join((text or "").split()).replace("|", "\\|")
+
+
+def render_review_table(reviews: List[Dict[str, str]]) -> str:
+    """Render parsed review rows back into the reviewer's markdown table."""
+    lines = [
+        "| TestCaseID | IssueCategory | Comment | Recommendation |",
+        "| :--- | :--- | :--- | :--- |",
+    ]
+    for row in reviews:
+        cells = [row.get(key, "") for key in REVIEW_COLUMNS.values()]
+        lines.append("| " + " | ".join(_table_cell(cell) for cell in cells) + " |")
+    return "\n".join(lines)
+
+
+def merge_reviews(partial_reviews: List[List[Dict[str, str]]]) -> List[Dict[str, str]]:
+    """
+    Merge the parsed tables of several partial reviews of one suite.
+
+    Issues are kept in the order of the partial reviews; approvals are
+    dropped unless every partial review approved, in which case a single
+    approval row is returned. A generation failure is returned on its own.
+    """
+    rows = [row for reviews in partial_reviews for row in reviews]
+    failures = [row for row in rows if row["issue_category"] == GENERATION_FAILURE]
+    if failures:
+        return failures[:1]
+    issues = [row for row in rows if row["issue_category"] != APPROVAL]
+    if issues:
+        return issues
+    return [{
+        "testcase_id": "N/A",
+        "issue_category": APPROVAL,
+        "comment": "Test case suite meets all requirements and compliance standards.",
+        "recommendation": "No further refinement needed.",
+    }]
+
+
+def merge_review_outputs(
+    outputs: List[str],
+    local_reviews: Optional[List[Dict[str, str]]] = None,
+    advisory_reviews: Optional[List[Dict[str, str]]] = None,
+) -> str:
+    """
+    Merge reviewer outputs and local linter rows into one testcase_reviews table.
+
+    Args:
+        outputs: The reviewers' texts, in the order their findings should appear
+        local_reviews: Rows found without a model call, listed first
+        advisory_reviews: Rows found without a model call that must not block an
+            approval; listed last, and only if the merged review has other issues
+
+    Returns:
+        The merged table (see merge_reviews). Outputs without a review table
+        are dropped if another output has one; if none has, their text is kept
+        (after the linter's table, if any) so the review still reaches the refiner.
+    """
+    partial_reviews = [reviews for reviews in map(parse_review_table, outputs) if reviews is not None]
+    unparsed = "\n\n".join(
+        output for output in outputs if output and parse_review_table(output) is None
+    )
+    if local_reviews:
+        partial_reviews.insert(0, local_reviews)
+    if not partial_reviews:
+        return unparsed
+    reviews = merge_reviews(partial_reviews)
+    if advisory_reviews and review_outcome(reviews) == REVIEW_HAS_ISSUES:
+        reviews += advisory_reviews
+    table = render_review_table(reviews)
+    if unparsed and len(partial_reviews) == 1 and local_reviews:
+        table += "\n\n" + unparsed
+    return table
+
+
+def review_outcome(reviews: Optional[List[Dict[str, str]]]) -> str:
+    """
+    Classify a parsed review table.
+
+    Returns:
+        REVIEW_GENERATION_FAILURE if any row reports a generation failure,
+        REVIEW_APPROVED if every row is an approval, REVIEW_HAS_ISSUES if there
+        is anything to refine and REVIEW_UNPARSED if no table could be read
+    """
+    if not reviews:
+        return REVIEW_UNPARSED
+    categories = {row["issue_category"] for row in reviews}
+    if GENERATION_FAILURE in categories:
+        return REVIEW_GENERATION_FAILURE
+    if categories == {APPROVAL}:
+        return REVIEW_APPROVED
+    return REVIEW_HAS_ISSUES
+
+
+def count_issue_categories(reviews: Optional[List[Dict[str, str]]]) -> Dict[str, int]:
+    """Count review rows per IssueCategory, excluding approvals."""
+    counts: Dict[str, int] = {}
+    for row in reviews or []:
+        category = row["issue_category"]
+        if category and category != APPROVAL:
+            counts[category] = counts.get(category, 0) + 1
+    return counts
+
+
+def refinement_budget(reviews: Optional[List[Dict[str, str]]]) -> int:
+    """
+    Compute how many refine passes a review warrants.
+
+    Each finding adds its ISSUE_SEVERITY_WEIGHTS weight (compliance gaps
+    count double); every REFINEMENT_SEVERITY_PER_ITERATION of severity buys
+    one pass, capped at REFINEMENT_MAX_ITERATIONS.
+
+    Returns:
+        0 for approvals and generation failures, otherwise 1..REFINEMENT_MAX_ITERATIONS
+        (1 if the review could not be parsed)
+    """
+    outcome = review_outcome(reviews)
+    if outcome in (REVIEW_APPROVED, REVIEW_GENERATION_FAILURE):
+        return 0
+    severity = sum(
+        ISSUE_SEVERITY_WEIGHTS.get(category, DEFAULT_SEVERITY_WEIGHT) * count
+        for category, count in count_issue_categories(reviews).items()
+    )
+    passes = math.ceil(severity / REFINEMENT_SEVERITY_PER_ITERATION) if severity else 1
+    return max(1, min(REFINEMENT_MAX_ITERATIONS, passes))
@@ -0,0 +1,166 @@
+"""
+Append-only test suite lists in session state.
+
+aggregated_testcases (the sets produced by the current request) and
+all_testcases_history (every set of the session) used to be stored as whole
+lists, so every event that added a set re-sent all earlier ones. They are now
+logs of compact references, and each record is stored once under its own key:
+
+    suite:<testcase_id>                 the aggregated_testcases record
+    all_testcases_history:count         number of entries
+    all_testcases_history:000003        {"testcase_id", "title", "testcases"} reference
+
+An event that adds a set carries only that record, its reference and the new
+count. read_suites returns the full logical list.
+
+When the SQLite suite store is enabled (common.suite_store, opt-in through
+SUITE_STORE_PATH) the records are written there instead of to
+suite:<testcase_id>, so state and events only carry the references and
+counts; read_suites fetches the records from the store.
+
+History rule: all_testcases_history only holds sets that have test cases.
+Placeholders for features that produced none (not_generated suites, parse
+errors, failed enhancement patches) are reported in aggregated_testcases for
+the current request but never enter the history, so the enhancer can neither
+list nor resolve them. append_suites enforces this for TESTCASE_HISTORY, and
+readers of older sessions filter with is_history_record.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .executor import run_blocking
+from .suite_store import suite_store
+
+AGGREGATED_TESTCASES = "aggregated_testcases"
+TESTCASE_HISTORY = "all_testcases_history"
+
+SUITE_KEY_PREFIX = "suite:"
+
+
+def suite_key(testcase_id: str) -> str:
+    """State key holding the record with the given testcase_id."""
+    return f"{SUITE_KEY_PREFIX}{testcase_id}"
+
+
+def _count_key(name: str) -> str:
+    return f"{name}:count"
+
+
+def _entry_key(name: str, index: int) -> str:
+    return f"{name}:{index:06d}"
+
+
+def suite_reference(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Compact reference to a record, as stored in the list entries."""
+    return {
+        "testcase_id": record["testcase_id"],
+        "title": record.get("Testcase Title", ""),
+        "testcases": len(record.get("testcases") or []),
+    }
+
+
+def is_history_record(record: Dict[str, Any]) -> bool:
+    """Tell whether a record (or its reference) belongs in all_testcases_history."""
+    return bool(record.get("testcases"))
+
+
+def suite_count(state: Any, name: str) -> int:
+    """Number of records in the list `name`."""
+    return state.get(_count_key(name)) or 0
+
+
+def suite_references(state: Any, name: str) -> List[Dict[str, Any]]:
+    """References of the list `name`, in order."""
+    references = (state.get(_entry_key(name, index)) for index in range(suite_count(state, name)))
+    return [reference for reference in references if reference]
+
+
+def read_suites(state: Any, name: str) -> List[Dict[str, Any]]:
+    """
+    Return the full logical list `name`.
+
+    Args:
+        state: Session state
+        name: AGGREGATED_TESTCASES or TESTCASE_HISTORY
+
+    Returns:
+        The records in the order they were appended
+    """
+    testcase_ids = [reference["testcase_id"] for reference in suite_references(state, name)]
+    records = {testcase_id: state.get(suite_key(testcase_id)) for testcase_id in testcase_ids}
+    missing = [testcase_id for testcase_id, record in records.items() if not record]
+    if missing and suite_store is not None:
+        records.update(suite_store.get_suites(missing))
+    return [records[testcase_id] for testcase_id in testcase_ids if records.get(testcase_id)]
+
+
+def read_suite(state: Any, testcase_id: str) -> Optional[Dict[str, Any]]:
+    """Return one record by testcase_id, from state or the suite store."""
+    record = state.get(suite_key(testcase_id))
+    if not record and suite_store is not None:
+        record = suite_store.get_suite(testcase_id)
+    return record or None
+
+
+async def append_suites(
+    state: Any,
+    name: str,
+    records: Iterable[Dict[str, Any]],
+    state_delta: Optional[Dict[str, Any]] = None,
+    session_id: str = "",
+) -> Dict[str, Any]:
+    """
+    Add the state_delta entries that append records to the list `name`.
+
+    Records already stored (for example when a set goes into both
+    aggregated_testcases and all_testcases_history) are not written again.
+    Records without test cases are left out of TESTCASE_HISTORY (see the
+    history rule above).
+    With the suite store enabled the records are written to it (on the
+    blocking-call pool) before this returns, and the delta only gets the
+    references.
+
+    Args:
+        state: Session state the delta will be applied to
+        name: AGGREGATED_TESTCASES or TESTCASE_HISTORY
+        records: Records to append
+        state_delta: Delta to extend; a new one is created if not given
+        session_id: Session the records belong to, recorded in the suite store
+
+    Returns:
+        The state_delta
+    """
+    delta = {} if state_delta is None else state_delta
+    count = delta.get(_count_key(name), suite_count(state, name))
+    # Sets referenced earlier in this delta were stored by that call
+    referenced = {
+        value["testcase_id"]
+        for key, value in delta.items()
+        if key.split(":")[0] in (AGGREGATED_TESTCASES, TESTCASE_HISTORY) and isinstance(value, dict)
+    }
+    unstored: List[Dict[str, Any]] = []
+    for record in records:
+        if name == TESTCASE_HISTORY and not is_history_record(record):
+            continue
+        key = suite_key(record["testcase_id"])
+        if suite_store is not None:
+            if record["testcase_id"] not in referenced:
+                unstored.append(record)
+                referenced.add(record["testcase_id"])
+        elif key not in delta and state.get(key) is None:
+            delta[key] = record
+        delta[_entry_key(name, count)] = suite_reference(record)
+        count += 1
+    if unstored:
+        await run_blocking(suite_store.put_suites, unstored, session_id=session_id)
+    delta[_count_key(name)] = count
+    return delta
+
+
+def history_state_keys(state: Any) -> Set[str]:
+    """State keys holding all_testcases_history: its count, entries and records."""
+    references = suite_references(state, TESTCASE_HISTORY)
+    keys = {_count_key(TESTCASE_HISTORY)}
+    keys.update(_entry_key(TESTCASE_HISTORY, index) for index in range(len(references)))
+    keys.update(suite_key(reference["testcase_id"]) for reference in references)
+    return keys
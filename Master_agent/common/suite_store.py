@@ -0,0 +1,233 @@
+"""
+SQLite store for generated test suites.
+
+Session state only keeps references to the suites (see common.suite_log);
+the records themselves are written here, so they survive a process restart
+and several worker processes can share one history through the same file.
+
+    suites             one row per record (testcase_id, session, feature, JSON record)
+    suite_rows         one row per test case, for row-level lookups
+    suite_compliance   compliance ID -> testcase_id
+
+Suites are indexed by testcase_id, session, feature and compliance ID.
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .config import SUITE_STORE_PATH
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS suites (
+    testcase_id TEXT PRIMARY KEY,
+    session_id TEXT NOT NULL DEFAULT '',
+    feature TEXT NOT NULL DEFAULT '',
+    title TEXT NOT NULL DEFAULT '',
+    record TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS suites_session ON suites (session_id, created_at);
+CREATE INDEX IF NOT EXISTS suites_feature ON suites (feature);
+
+CREATE TABLE IF NOT EXISTS suite_rows (
+    testcase_id TEXT NOT NULL,
+    row_no INTEGER NOT NULL,
+    sr_no TEXT NOT NULL,
+    description TEXT NOT NULL,
+    expected_result TEXT NOT NULL,
+    traceability_tags TEXT NOT NULL DEFAULT '[]',
+    PRIMARY KEY (testcase_id, row_no)
+);
+
+CREATE TABLE IF NOT EXISTS suite_compliance (
+    testcase_id TEXT NOT NULL,
+    compliance_id TEXT NOT NULL,
+    PRIMARY KEY (testcase_id, compliance_id)
+);
+CREATE INDEX IF NOT EXISTS suite_compliance_id ON suite_compliance (compliance_id);
+"""
+
+
+class SuiteStore:
+    """
+    Thread-safe SQLite store of aggregated_testcases records.
+
+    Args:
+        path: Database file (":memory:" for a private in-memory store). The
+            connection is opened on first use, in WAL mode so several
+            processes can read while one writes.
+    """
+
+    def __init__(self, path: str = SUITE_STORE_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+            if self.path != ":memory:":
+                connection.execute("PRAGMA journal_mode=WAL")
+            connection.executescript(SCHEMA)
+            self._connection = connection
+            logger.info(f"Opened test suite store at {self.path}")
+        return self._connection
+
+    def put_suite(self, record: Dict[str, Any], session_id: str = "", feature: str = "") -> None:
+        """
+        Insert or replace a record with its rows and compliance IDs.
+
+        Args:
+            record: An aggregated_testcases record (see common.testcase_suite.suite_to_record)
+            session_id: ADK session the record was produced in
+            feature: Feature the record was generated for; defaults to record["feature"]
+        """
+        testcase_id = record["testcase_id"]
+        tags = record.get("traceability_tags") or []
+        rows = [
+            (
+                testcase_id,
+                index,
+                str(row[0]) if len(row) > 0 else "",
+                str(row[1]) if len(row) > 1 else "",
+                str(row[2]) if len(row) > 2 else "",
+                json.dumps(tags[index] if index < len(tags) else []),
+            )
+            for index, row in enumerate(record.get("testcases") or [])
+        ]
+        with self._lock:
+            connection = self._connect()
+            with connection:
+                connection.execute(
+                    "INSERT OR REPLACE INTO suites VALUES (?, ?, ?, ?, ?, ?)",
+                    (
+                        testcase_id,
+                        session_id or "",
+                        feature or record.get("feature") or "",
+                        record.get("Testcase Title", ""),
+                        json.dumps(record),
+                        time.time(),
+                    ),
+                )
+                connection.execute("DELETE FROM suite_rows WHERE testcase_id = ?", (testcase_id,))
+                connection.execute("DELETE FROM suite_compliance WHERE testcase_id = ?", (testcase_id,))
+                connection.executemany("INSERT INTO suite_rows VALUES (?, ?, ?, ?, ?, ?)", rows)
+                connection.executemany(
+                    "INSERT OR IGNORE INTO suite_compliance VALUES (?, ?)",
+                    [(testcase_id, rule) for rule in record.get("compliance_ids") or []],
+                )
+
+    def put_suites(self, records: Iterable[Dict[str, Any]], session_id: str = "") -> None:
+        """Insert or replace several records (see put_suite)."""
+        for record in records:
+            self.put_suite(record, session_id=session_id)
+
+    def get_suites(self, testcase_ids: Iterable[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Fetch records by testcase_id.
+
+        Returns:
+            testcase_id -> record, for the IDs that are stored
+        """
+        testcase_ids = list(dict.fromkeys(testcase_ids))
+        if not testcase_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in testcase_ids)
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT testcase_id, record FROM suites WHERE testcase_id IN ({placeholders})",
+                testcase_ids,
+            )
+            return {testcase_id: json.loads(record) for testcase_id, record in cursor.fetchall()}
+
+    def get_suite(self, testcase_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch one record by testcase_id, or None if it is not stored."""
+        return self.get_suites([testcase_id]).get(testcase_id)
+
+    def find_suites(
+        self,
+        session_id: Optional[str] = None,
+        feature: Optional[str] = None,
+        compliance_id: Optional[str] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Fetch the records matching every given filter, oldest first.
+
+        Args:
+            session_id: Only records produced in this session
+            feature: Only records generated for this feature
+            compliance_id: Only records verifying this compliance rule
+
+        Returns:
+            The matching records
+        """
+        clauses: List[str] = []
+        params: List[str] = []
+        if session_id is not None:
+            clauses.append("session_id = ?")
+            params.append(session_id)
+        if feature is not None:
+            clauses.append("feature = ?")
+            params.append(feature)
+        if compliance_id is not None:
+            clauses.append("testcase_id IN (SELECT testcase_id FROM suite_compliance WHERE compliance_id = ?)")
+            params.append(compliance_id)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        with self._lock:
+            cursor = self._connect().execute(
+                f"SELECT record FROM suites {where} ORDER BY created_at, rowid", params
+            )
+            return [json.loads(record) for (record,) in cursor.fetchall()]
+
+    def get_rows(self, testcase_id: str, row_numbers: Optional[Iterable[int]] = None) -> List[Dict[str, Any]]:
+        """
+        Fetch test case rows of a record.
+
+        Args:
+            testcase_id: The record
+            row_numbers: 1-based positions to fetch; all rows if not given
+
+        Returns:
+            One dict per row with row_no (1-based), sr_no, description,
+            expected_result and traceability_tags, in row order
+        """
+        query = (
+            "SELECT row_no, sr_no, description, expected_result, traceability_tags "
+            "FROM suite_rows WHERE testcase_id = ?"
+        )
+        params: List[Any] = [testcase_id]
+        if row_numbers is not None:
+            positions = [number - 1 for number in row_numbers]
+            if not positions:
+                return []
+            query += f" AND row_no IN ({', '.join('?' for _ in positions)})"
+            params.extend(positions)
+        with self._lock:
+            cursor = self._connect().execute(query + " ORDER BY row_no", params)
+            return [
+                {
+                    "row_no": row_no + 1,
+                    "sr_no": sr_no,
+                    "description": description,
+                    "expected_result": expected_result,
+                    "traceability_tags": json.loads(tags),
+                }
+                for row_no, sr_no, description, expected_result, tags in cursor.fetchall()
+            ]
+
+    def close(self) -> None:
+        """Close the connection; it is reopened on the next call."""
+        with self._lock:
+            if self._connection is not None:
+                self._connection.close()
+                self._connection = None
+
+
+# Shared store; None when SUITE_STORE_PATH is empty and records stay in session state
+suite_store: Optional[SuiteStore] = SuiteStore(SUITE_STORE_PATH) if SUITE_STORE_PATH else None
@@ -0,0 +1,174 @@
+"""
+Local pre-review linter for structured test suites.
+
+Runs before the reviewer's model call and reports the mechanical issues of
+current_testcases as rows of the reviewer's table (see common.review_table):
+
+- Generation Failure: the suite is not_generated or has no test cases
+- Schema Violation: empty descriptions or expected results, Sr.No values
+  that are not 1..n
+- Redundancy: test cases with the same description
+- Lack of Clarity: vague expected results ("works correctly", "is logged in")
+
+The reviewer is then only asked for what needs judgement, and its
+findings are merged with these rows.
+
+lint_coverage adds advisory Incompleteness rows for a suite without any
+negative or boundary test case. Keyword matching cannot tell whether a
+feature needs such tests, so these rows never block an approval: they are
+only merged when the review reports other issues (see
+common.review_table.merge_review_outputs).
+"""
+
+import re
+from typing import Dict, List, Optional
+
+from .review_table import GENERATION_FAILURE, SCHEMA_VIOLATION
+from .testcase_suite import SUITE_NOT_GENERATED, StructuredSuite
+
+# Expected results that say nothing verifiable unless they go on to name a concrete outcome
+VAGUE_RESULT_PATTERN = re.compile(
+    r"\b(?:works?|functions?|behaves?|performs?)\s+(?:correctly|properly|fine|as expected|as intended|well)\b"
+    r"|\bas expected\b"
+    r"|\b(?:is|are|gets?)\s+logged\s+in\b"
+    r"|\b(?:is|was)\s+successful\b"
+    r"|\bno (?:errors?|issues?|problems?)\b"
+    r"|\bhandled?\s+(?:correctly|properly|appropriately|gracefully)\b"
+    r"|\b(?:an?\s+)?appropriate\s+(?:error\s+)?message\b",
+    re.IGNORECASE,
+)
+# Vague phrases are only flagged in results of at most this many words
+VAGUE_RESULT_MAX_WORDS = 10
+# Results shorter than this are flagged regardless of their wording
+MIN_RESULT_WORDS = 3
+
+NEGATIVE_CASE_PATTERN = re.compile(
+    r"\b(?:invalid|incorrect|wrong|error|errors|fail|fails|failed|failure|reject(?:s|ed)?|den(?:y|ies|ied)"
+    r"|unauthori[sz]ed|forbidden|expired|locked|missing|malformed|not allowed|blocked|negative)\b",
+    re.IGNORECASE,
+)
+BOUNDARY_CASE_PATTERN = re.compile(
+    r"\b(?:boundary|boundaries|limit|limits|minimum|maximum|min|max|exceed(?:s|ed|ing)?|threshold"
+    r"|at (?:least|most)|(?:more|less|fewer|greater) than|up to|too (?:long|short|many|large|small)"
+    r"|length|empty|zero|range|edge case|lower bound|upper bound)\b",
+    re.IGNORECASE,
+)
+
+
+def _review_row(testcase_id: str, category: str, comment: str, recommendation: str) -> Dict[str, str]:
+    return {
+        "testcase_id": testcase_id,
+        "issue_category": category,
+        "comment": comment,
+        "recommendation": recommendation,
+    }
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(re.findall(r"[a-z0-9]+", text.lower()))
+
+
+def is_vague_result(expected_result: str) -> bool:
+    """Tell whether an expected result is too vague to be verified."""
+    words = expected_result.split()
+    if len(words) < MIN_RESULT_WORDS:
+        return True
+    return len(words) <= VAGUE_RESULT_MAX_WORDS and bool(VAGUE_RESULT_PATTERN.search(expected_result))
+
+
+def lint_suite(suite: Optional[StructuredSuite]) -> List[Dict[str, str]]:
+    """
+    Run the mechanical review checks over a suite.
+
+    Args:
+        suite: The parsed current_testcases; None when nothing was generated
+
+    Returns:
+        Review rows (testcase_id, issue_category, comment, recommendation) as
+        parse_review_table returns them; a single Generation Failure row if
+        the suite has no test cases, an empty list if nothing was found.
+        Missing negative or boundary tests are reported by lint_coverage.
+    """
+    if suite is None or suite.status == SUITE_NOT_GENERATED or not suite.testcases:
+        reason = (suite.message if suite else "") or "Initial test case generation did not produce a valid test plan."
+        return [_review_row("N/A", GENERATION_FAILURE, reason, "Regenerate test cases from requirements.")]
+
+    rows: List[Dict[str, str]] = []
+    numbers = [testcase.sr_no for testcase in suite.testcases]
+    if numbers != list(range(1, len(numbers) + 1)):
+        rows.append(_review_row(
+            "N/A",
+            SCHEMA_VIOLATION,
+            f"Sr.No values are not sequential: {', '.join(str(number) for number in numbers)}.",
+            f"Renumber the test cases 1-{len(numbers)} in order.",
+        ))
+
+    seen: Dict[str, int] = {}
+    for testcase in suite.testcases:
+        testcase_id = str(testcase.sr_no)
+        description = testcase.description.strip()
+        expected_result = testcase.expected_result.strip()
+
+        empty = [name for name, value in (("description", description), ("expected result", expected_result)) if not value]
+        if empty:
+            rows.append(_review_row(
+                testcase_id,
+                SCHEMA_VIOLATION,
+                f"The test case has an empty {' and '.join(empty)}.",
+                "Fill in the missing field, or delete the test case if it has no purpose.",
+            ))
+            if not description:
+                continue
+
+        key = _normalize_text(description)
+        if key in seen:
+            rows.append(_review_row(
+                testcase_id,
+                "Redundancy",
+                f"This test case has the same description as test case #{seen[key]}.",
+                f"Merge this test case with test case #{seen[key]} and delete this one.",
+            ))
+        else:
+            seen[key] = testcase.sr_no
+
+        if expected_result and is_vague_result(expected_result):
+            rows.append(_review_row(
+                testcase_id,
+                "Lack of Clarity",
+                f'The expected result "{expected_result}" is too vague to verify.',
+                "State the exact observable outcome: the message, page, value or record the tester checks.",
+            ))
+    return rows
+
+
+def lint_coverage(suite: Optional[StructuredSuite]) -> List[Dict[str, str]]:
+    """
+    Report a suite without any negative or boundary test case.
+
+    Args:
+        suite: The parsed current_testcases
+
+    Returns:
+        Advisory Incompleteness rows; empty if the suite has no test cases
+        (lint_suite reports that) or covers both kinds
+    """
+    if suite is None or suite.status == SUITE_NOT_GENERATED or not suite.testcases:
+        return []
+
+    rows: List[Dict[str, str]] = []
+    text = " ".join(f"{testcase.description} {testcase.expected_result}" for testcase in suite.testcases)
+    if not NEGATIVE_CASE_PATTERN.search(text):
+        rows.append(_review_row(
+            "N/A",
+            "Incompleteness",
+            "The suite has no negative test case (invalid input, errors, rejected or unauthorized actions).",
+            "Add negative test cases for invalid inputs and failure paths.",
+        ))
+    if not BOUNDARY_CASE_PATTERN.search(text):
+        rows.append(_review_row(
+            "N/A",
+            "Incompleteness",
+            "The suite has no boundary test case (minimum, maximum, empty or out-of-range values).",
+            "Add boundary value test cases for the feature's limits.",
+        ))
+    return rows
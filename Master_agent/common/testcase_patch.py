@@ -0,0 +1,305 @@
+"""
+Patch format for enhancements, applied to the stored test suite locally.
+
+In patch mode the enhancer returns only the changes to a set instead of the
+whole enhanced set:
+
+    {"status": "generated", "testcase_id": "<set being enhanced>", "message": "",
+     "edits": [{"op": "update", "row": 2, "expected_result": "..."},
+               {"op": "insert_after", "row": 3, "description": "...", "expected_result": "..."},
+               {"op": "delete", "row": 5},
+               {"op": "add_compliance", "row": 1, "compliance_ids": ["HIPAA 164.312"]}],
+     "applied_compliance_rules": []}
+
+Row numbers always refer to the Sr.No values of the set as it was before the
+patch.
+apply_suite_patch produces the new version of an aggregated_testcases record
+and apply_patch_to_suite the refined StructuredSuite, both with the rows
+renumbered, so output size follows the size of the change.
+"""
+
+import re
+import uuid
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .testcase_suite import SUITE_GENERATED, StructuredSuite, StructuredTestcase
+
+EDIT_UPDATE = "update"
+EDIT_INSERT_AFTER = "insert_after"
+EDIT_DELETE = "delete"
+EDIT_ADD_COMPLIANCE = "add_compliance"
+
+
+class TestcaseEdit(BaseModel):
+    op: Literal["update", "insert_after", "delete", "add_compliance"] = Field(
+        description="update, insert_after, delete or add_compliance")
+    row: int = Field(
+        description="Sr.No of the test case in the set before any edit; for insert_after 0 inserts "
+                    "at the top, for add_compliance 0 applies to the whole set")
+    description: str = Field(
+        default="",
+        description="update: new description (empty keeps the current one); "
+                    "insert_after: the new test case's description")
+    expected_result: str = Field(
+        default="",
+        description="update: new expected result (empty keeps the current one); "
+                    "insert_after: the new test case's expected result")
+    compliance_ids: List[str] = Field(
+        default_factory=list,
+        description="update / insert_after / add_compliance: compliance rules the test case verifies")
+    traceability_tags: List[str] = Field(
+        default_factory=list,
+        description="update / insert_after: requirement and compliance references to add, e.g. REQ-45.2")
+
+
+class SuitePatch(BaseModel):
+    status: Literal["generated", "not_generated"] = Field(
+        description="'generated' if the enhancement could be applied, otherwise 'not_generated'")
+    testcase_id: str = Field(default="", description="Test case set ID of the set being enhanced")
+    title: str = Field(default="", description="New title for the set; empty keeps the current title")
+    message: str = Field(
+        default="",
+        description="Only for 'not_generated': the reason the enhancement cannot be performed")
+    edits: List[TestcaseEdit] = Field(default_factory=list)
+    applied_compliance_rules: List[str] = Field(
+        default_factory=list,
+        description="Compliance rules applied by the edits")
+
+
+class PatchError(ValueError):
+    """Raised when a patch does not fit the set it is applied to."""
+
+
+def load_patch(value: Any) -> Optional[SuitePatch]:
+    """
+    Validate an enhancement_patch value.
+
+    Returns:
+        The patch, or None if the value is empty or not a patch
+    """
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            return SuitePatch.model_validate_json(value)
+        return SuitePatch.model_validate(value)
+    except ValidationError:
+        return None
+
+
+def _merge(items: List[str], extra: List[str]) -> List[str]:
+    merged = list(items)
+    for item in extra:
+        item = item.strip()
+        if item and item not in merged:
+            merged.append(item)
+    return merged
+
+
+def _row_number(sr_no: Any) -> Optional[int]:
+    """Read the number of a Sr.No value (3, "3." -> 3), or None if it has none."""
+    match = re.match(r"\s*#?(\d+)", str(sr_no))
+    return int(match.group(1)) if match else None
+
+
+def _describe_numbers(numbers: List[int]) -> str:
+    if numbers == list(range(1, len(numbers) + 1)):
+        return f"numbered 1-{len(numbers)}"
+    return f"numbered {', '.join(str(number) for number in numbers)}"
+
+
+def apply_edits(rows: List[Dict[str, Any]], edits: List[TestcaseEdit]) -> List[Dict[str, Any]]:
+    """
+    Apply edits to a list of test cases.
+
+    Args:
+        rows: Test cases in order, as dicts with description, expected_result,
+            compliance_ids, traceability_tags and optionally sr_no; edits
+            refer to them by sr_no (rows without one by 1-based position)
+        edits: The edits, applied in order
+
+    Returns:
+        The edited test cases, in their new order (not renumbered)
+
+    Raises:
+        PatchError: if an edit references a row that does not exist, a row is
+            edited after being deleted, or the edits leave no test cases
+    """
+    # One slot per original row, each followed by the rows inserted after it; slot 0 is the top
+    kept: List[Optional[Dict[str, Any]]] = [None] + [
+        {
+            "description": row["description"],
+            "expected_result": row["expected_result"],
+            "compliance_ids": list(row.get("compliance_ids") or []),
+            "traceability_tags": list(row.get("traceability_tags") or []),
+        }
+        for row in rows
+    ]
+    inserted: List[List[Dict[str, Any]]] = [[] for _ in kept]
+    numbers = [_row_number(row.get("sr_no")) or position for position, row in enumerate(rows, 1)]
+    slots: Dict[int, int] = {}
+    for position, number in enumerate(numbers, 1):
+        slots.setdefault(number, position)
+
+    for edit in edits:
+        top = edit.row == 0 and edit.op in (EDIT_INSERT_AFTER, EDIT_ADD_COMPLIANCE)
+        slot = 0 if top else slots.get(edit.row)
+        if slot is None:
+            raise PatchError(
+                f"Test case {edit.row} does not exist. The set contains {len(rows)} test cases "
+                f"({_describe_numbers(numbers)})."
+            )
+        if slot and kept[slot] is None and edit.op != EDIT_INSERT_AFTER:
+            raise PatchError(f"Test case {edit.row} is edited after being deleted.")
+
+        if edit.op == EDIT_UPDATE:
+            row = kept[slot]
+            row["description"] = edit.description or row["description"]
+            row["expected_result"] = edit.expected_result or row["expected_result"]
+            row["compliance_ids"] = _merge(row["compliance_ids"], edit.compliance_ids)
+            row["traceability_tags"] = _merge(row["traceability_tags"], edit.traceability_tags)
+        elif edit.op == EDIT_INSERT_AFTER:
+            if not edit.description or not edit.expected_result:
+                raise PatchError(
+                    f"The test case inserted after {edit.row} needs a description and an expected result."
+                )
+            inserted[slot].append({
+                "description": edit.description,
+                "expected_result": edit.expected_result,
+                "compliance_ids": _merge([], edit.compliance_ids),
+                "traceability_tags": _merge([], edit.traceability_tags),
+            })
+        elif edit.op == EDIT_DELETE:
+            kept[slot] = None
+        elif edit.op == EDIT_ADD_COMPLIANCE and slot:
+            row = kept[slot]
+            row["compliance_ids"] = _merge(row["compliance_ids"], edit.compliance_ids)
+
+    result = []
+    for slot, row in enumerate(kept):
+        if row is not None:
+            result.append(row)
+        result.extend(inserted[slot])
+    if not result:
+        raise PatchError("The edits would delete every test case of the set.")
+    return result
+
+
+def _patch_compliance_ids(patch: SuitePatch) -> List[str]:
+    """Every compliance rule the patch applies, at suite or row level."""
+    return _merge(patch.applied_compliance_rules, [rule for edit in patch.edits for rule in edit.compliance_ids])
+
+
+def apply_suite_patch(record: Dict[str, Any], patch: SuitePatch) -> Dict[str, Any]:
+    """
+    Apply a patch to an aggregated_testcases record.
+
+    Records have no per-row compliance field, so compliance rules the edits
+    attach to a row are added to its traceability_tags.
+
+    Args:
+        record: The set being enhanced
+        patch: The enhancer's edits; rows refer to the numbering of record
+
+    Returns:
+        The new version of the set: a new testcase_id, "based_on" pointing at
+        record's, and the rows renumbered from 1
+
+    Raises:
+        PatchError: see apply_edits
+    """
+    tags = record.get("traceability_tags") or []
+    rows = apply_edits(
+        [
+            {
+                "sr_no": row[0],
+                "description": row[1],
+                "expected_result": row[2],
+                "traceability_tags": tags[index] if index < len(tags) else [],
+            }
+            for index, row in enumerate(record.get("testcases") or [])
+        ],
+        patch.edits,
+    )
+    return {
+        "testcase_id": str(uuid.uuid4()),
+        "Testcase Title": patch.title or record.get("Testcase Title", ""),
+        "testcases": [
+            [f"{number}.", row["description"], row["expected_result"]]
+            for number, row in enumerate(rows, 1)
+        ],
+        "compliance_ids": _merge(record.get("compliance_ids") or [], _patch_compliance_ids(patch)),
+        "traceability_tags": [_merge(row["traceability_tags"], row["compliance_ids"]) for row in rows],
+        "based_on": record["testcase_id"],
+    }
+
+
+def apply_patch_to_suite(suite: StructuredSuite, patch: SuitePatch) -> StructuredSuite:
+    """
+    Apply a patch to a StructuredSuite (the generation pipeline's current_testcases).
+
+    Args:
+        suite: The suite being refined
+        patch: The edits; rows refer to the suite's testcases by sr_no
+
+    Returns:
+        The refined suite, with sr_no renumbered from 1
+
+    Raises:
+        PatchError: see apply_edits
+    """
+    testcases = sorted(suite.testcases, key=lambda testcase: testcase.sr_no)
+    rows = apply_edits([testcase.model_dump() for testcase in testcases], patch.edits)
+    return StructuredSuite(
+        status=SUITE_GENERATED,
+        title=patch.title or suite.title,
+        testcases=[
+            StructuredTestcase(
+                sr_no=number,
+                description=row["description"],
+                expected_result=row["expected_result"],
+                compliance_ids=row["compliance_ids"],
+                traceability_tags=row["traceability_tags"],
+            )
+            for number, row in enumerate(rows, 1)
+        ],
+        applied_compliance_rules=_merge(suite.applied_compliance_rules, _patch_compliance_ids(patch)),
+    )
+
+
+def describe_patch(patch: SuitePatch, record: Dict[str, Any]) -> str:
+    """
+    Summarize an applied patch for the user without a model call.
+
+    Args:
+        patch: The applied patch
+        record: The new version of the set
+
+    Returns:
+        Short markdown summary of the changes
+    """
+    def rows_of(op: str) -> List[str]:
+        return [str(edit.row) for edit in patch.edits if edit.op == op]
+
+    changes = []
+    if rows_of(EDIT_UPDATE):
+        changes.append(f"updated test case(s) {', '.join(rows_of(EDIT_UPDATE))}")
+    if rows_of(EDIT_INSERT_AFTER):
+        changes.append(f"added {len(rows_of(EDIT_INSERT_AFTER))} test case(s)")
+    if rows_of(EDIT_DELETE):
+        changes.append(f"removed test case(s) {', '.join(rows_of(EDIT_DELETE))}")
+    added_rules = sorted(
+        {rule for edit in patch.edits if edit.op == EDIT_ADD_COMPLIANCE for rule in edit.compliance_ids}
+    )
+    if added_rules:
+        changes.append(f"added compliance rule(s) {', '.join(added_rules)}")
+    summary = "; ".join(changes) or "applied no changes"
+
+    return (
+        f"## ✅ Test Cases Enhanced\n\n"
+        f"In **{record.get('Testcase Title', '')}** I {summary}. "
+        f"The set now has **{len(record['testcases'])} test cases** (numbers refer to the previous version)."
+    )
+
@@ -0,0 +1,183 @@
+"""
+Deterministic resolver for test case references in enhancement requests.
+
+"Update test case 5", "add MFA to test cases 2-4 of the login set" or
+"enhance the slot booking test" are resolved against all_testcases_history
+before the enhancer's model call:
+
+- Title references pick the sets whose title (or feature) the request
+  names; without one the most recent set is used.
+- Numbers ("test case 5", "tc 3", "#2", "test cases 2 to 4, 7") are rows
+  of the selected set, numbered from 1.
+
+Only the matching sets and rows are put into the enhancer's prompt, and
+references to sets or rows that do not exist are answered with the
+enhancer's usual error message without calling the model.
+"""
+
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .suite_log import is_history_record
+from .testcase_suite import render_testcases_markdown
+
+ENHANCEMENT_ERROR_PREFIX = "Test case enhancement cannot be generated. Reason: "
+
+NO_TESTCASES_REASON = (
+    "No test cases found in the current session. Please generate test cases first "
+    "by providing your requirements, then request enhancements."
+)
+
+# "test case 5", "test cases #2, 3 and 7", "tc 3", "rows 2 to 4", "sr. no 6"
+NUMBER_REFERENCE_PATTERN = re.compile(
+    r"\b(?:test[\s-]?cases?|tcs?|rows?|sr\.?\s*no\.?)\s*(?:#|no\.?|nos\.?|numbers?)?\s*"
+    r"(#?\d+(?:\s*(?:-|–|to|through|thru|,|and|&|or)\s*#?\d+)*)"
+)
+# "#5" on its own
+HASH_REFERENCE_PATTERN = re.compile(r"(?<![\w#])#(\d+)\b")
+NUMBER_RANGE_PATTERN = re.compile(r"(\d+)\s*(?:-|–|to|through|thru)\s*#?(\d+)|(\d+)")
+
+# Words that say nothing about which set is meant
+TITLE_STOPWORDS = {
+    "a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "by", "from", "into",
+    "test", "tests", "testcase", "testcases", "case", "cases", "set", "suite", "scenario",
+    "scenarios", "add", "update", "enhance", "refine", "modify", "improve", "extend", "include",
+    "please", "more", "new", "existing", "previous", "earlier", "generated", "feature", "features",
+    "validation", "verification",
+}
+# Share of a title's words the request must contain to reference the set
+TITLE_MATCH_MIN_SHARE = 0.6
+
+
+@dataclass
+class TestcaseResolution:
+    """Result of resolve_testcase_references."""
+
+    suites: List[Dict[str, Any]] = field(default_factory=list)
+    # testcase_id -> referenced row numbers (1-based); empty: no specific rows
+    rows: Dict[str, List[int]] = field(default_factory=dict)
+    error: Optional[str] = None
+    signals: List[str] = field(default_factory=list)
+
+
+def _title_words(text: str) -> List[str]:
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return [word for word in words if word not in TITLE_STOPWORDS and not word.isdigit()]
+
+
+def parse_row_references(query: str) -> List[int]:
+    """
+    Extract the test case numbers a request refers to.
+
+    Returns:
+        Sorted, de-duplicated row numbers ("test cases 2 to 4, 7" -> [2, 3, 4, 7])
+    """
+    text = query.lower()
+    numbers = set()
+    groups = [match.group(1) for match in NUMBER_REFERENCE_PATTERN.finditer(text)]
+    groups += [match.group(1) for match in HASH_REFERENCE_PATTERN.finditer(text)]
+    for group in groups:
+        for start, end, single in NUMBER_RANGE_PATTERN.findall(group):
+            if single:
+                numbers.add(int(single))
+            else:
+                low, high = sorted((int(start), int(end)))
+                numbers.update(range(low, high + 1))
+    return sorted(numbers)
+
+
+def match_suite_titles(query: str, suites: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Return the sets whose title or feature the request names.
+
+    A set matches when the request contains at least TITLE_MATCH_MIN_SHARE of
+    the meaningful words of its title; the best-scoring sets are returned.
+    """
+    query_words = set(_title_words(query))
+    if not query_words:
+        return []
+    best_score = 0.0
+    matches: List[Dict[str, Any]] = []
+    for suite in suites:
+        score = 0.0
+        for name in (suite.get("Testcase Title", ""), suite.get("feature", "")):
+            words = set(_title_words(name or ""))
+            if words:
+                score = max(score, len(words & query_words) / len(words))
+        if score < TITLE_MATCH_MIN_SHARE or score < best_score:
+            continue
+        if score > best_score:
+            best_score, matches = score, []
+        matches.append(suite)
+    return matches
+
+
+def resolve_testcase_references(query: str, history: List[Dict[str, Any]]) -> TestcaseResolution:
+    """
+    Resolve the test cases an enhancement request refers to.
+
+    Args:
+        query: The user's enhancement request
+        history: all_testcases_history records, oldest first
+
+    Returns:
+        TestcaseResolution with the matching sets and rows, or with the
+        enhancer's error message when nothing to enhance exists
+    """
+    resolution = TestcaseResolution()
+    suites = [suite for suite in history if is_history_record(suite)]
+    if not suites:
+        resolution.error = ENHANCEMENT_ERROR_PREFIX + NO_TESTCASES_REASON
+        resolution.signals.append("no_history")
+        return resolution
+
+    matches = match_suite_titles(query, suites)
+    if matches:
+        resolution.signals.append("title")
+    else:
+        matches = [suites[-1]]
+        resolution.signals.append("most_recent")
+    resolution.suites = matches
+
+    numbers = parse_row_references(query)
+    if numbers:
+        resolution.signals.append("numbers")
+        # Numbers only apply to one set; with several title matches the latest one
+        target = matches[-1]
+        available = len(target["testcases"])
+        missing = [number for number in numbers if number < 1 or number > available]
+        if missing:
+            label = "Test case" if len(missing) == 1 else "Test cases"
+            verb = "does" if len(missing) == 1 else "do"
+            resolution.error = ENHANCEMENT_ERROR_PREFIX + (
+                f"{label} {', '.join(str(number) for number in missing)} {verb} not exist. "
+                f"The test case set '{target.get('Testcase Title', '')}' contains only {available} "
+                f"test cases (numbered 1-{available}). Please specify a valid test case number "
+                "or describe the test case you want to enhance."
+            )
+            return resolution
+        resolution.suites = [target]
+        resolution.rows[target["testcase_id"]] = numbers
+    return resolution
+
+
+def format_enhancement_context(resolution: TestcaseResolution) -> str:
+    """
+    Render the resolved sets and rows for the enhancer's prompt.
+
+    Each set is shown as its markdown table with its testcase_id; the
+    referenced rows, if any, are repeated below it.
+    """
+    sections = []
+    for suite in resolution.suites:
+        lines = [f"Test case set ID: {suite['testcase_id']}", render_testcases_markdown(suite)]
+        numbers = resolution.rows.get(suite["testcase_id"])
+        if numbers:
+            lines += ["", f"Referenced test cases: {', '.join(str(number) for number in numbers)}"]
+            lines += [
+                f"- Test case {number}: {suite['testcases'][number - 1][1]}"
+                for number in numbers
+            ]
+        sections.append("\n".join(lines))
+    return "\n\n---\n\n".join(sections)
@@ -0,0 +1,158 @@
+"""
+Structured test-suite format written by the generator, refiner and enhancer.
+
+The three agents are bound to StructuredSuite through output_schema, so
+current_testcases holds a validated dict instead of a markdown table:
+
+    {"status": "generated", "title": "...", "message": "",
+     "testcases": [{"sr_no": 1, "description": "...", "expected_result": "...",
+                    "compliance_ids": ["HIPAA 164.312"], "traceability_tags": ["REQ-4.2"]}],
+     "applied_compliance_rules": ["HIPAA 164.312"]}
+
+The processors turn it into an aggregated_testcases record without parsing,
+and markdown is only rendered for the user (render_testcases_markdown).
+"""
+
+import uuid
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .markdown_tables import make_title
+
+SUITE_GENERATED = "generated"
+SUITE_NOT_GENERATED = "not_generated"
+
+NOT_GENERATED_TITLE = "Test Cases Not Generated"
+
+
+class StructuredTestcase(BaseModel):
+    sr_no: int = Field(description="Sequential test case number, starting at 1")
+    description: str = Field(description="Preconditions, action and main input of the test")
+    expected_result: str = Field(description="Specific, verifiable expected outcome")
+    compliance_ids: List[str] = Field(
+        default_factory=list,
+        description="Compliance rules this test case verifies")
+    traceability_tags: List[str] = Field(
+        default_factory=list,
+        description="Requirement and compliance references, e.g. REQ-45.2 or COMP-GDPR-RTBF")
+
+
+class StructuredSuite(BaseModel):
+    status: Literal["generated", "not_generated"] = Field(
+        description="'generated' if test cases were produced, otherwise 'not_generated'")
+    title: str = Field(default="", description="Short title for the test case set (max 10 words)")
+    message: str = Field(
+        default="",
+        description="Only for 'not_generated': the reason no test cases could be produced")
+    testcases: List[StructuredTestcase] = Field(default_factory=list)
+    applied_compliance_rules: List[str] = Field(
+        default_factory=list,
+        description="All compliance rules applied across the suite")
+
+
+def not_generated_suite(message: str) -> Dict[str, Any]:
+    """Return the current_testcases value for a run that produced no test cases."""
+    return StructuredSuite(status=SUITE_NOT_GENERATED, message=message).model_dump()
+
+
+def load_suite(value: Any) -> Optional[StructuredSuite]:
+    """
+    Validate a current_testcases value as a StructuredSuite.
+
+    Args:
+        value: The state value; a dict written through output_schema, or its JSON text
+
+    Returns:
+        The suite, or None if the value is empty or not in the structured format
+        (for example a legacy markdown table)
+    """
+    if not value:
+        return None
+    try:
+        if isinstance(value, str):
+            return StructuredSuite.model_validate_json(value)
+        return StructuredSuite.model_validate(value)
+    except ValidationError:
+        return None
+
+
+def _unique(items: List[str]) -> List[str]:
+    seen: List[str] = []
+    for item in items:
+        item = item.strip()
+        if item and item not in seen:
+            seen.append(item)
+    return seen
+
+
+def suite_to_record(suite: StructuredSuite, title: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Convert a suite into an aggregated_testcases / all_testcases_history record.
+
+    Args:
+        suite: The validated suite
+        title: Title for the set (e.g. the feature); defaults to the suite's own
+
+    Returns:
+        Record with testcase_id, "Testcase Title", testcases ([Sr.No, description,
+        expected] rows, numbered sequentially), compliance_ids and the per-row
+        traceability_tags; an error_message record for not_generated suites
+    """
+    if suite.status == SUITE_NOT_GENERATED or not suite.testcases:
+        return {
+            "testcase_id": str(uuid.uuid4()),
+            "Testcase Title": NOT_GENERATED_TITLE,
+            "testcases": [],
+            "compliance_ids": [],
+            "error_message": suite.message or "No test cases were produced.",
+        }
+
+    testcases = sorted(suite.testcases, key=lambda testcase: testcase.sr_no)
+    compliance_ids = _unique(
+        suite.applied_compliance_rules
+        + [rule for testcase in testcases for rule in testcase.compliance_ids]
+    )
+    return {
+        "testcase_id": str(uuid.uuid4()),
+        "Testcase Title": make_title(title or suite.title or testcases[0].description),
+        "testcases": [
+            [f"{number}.", testcase.description, testcase.expected_result]
+            for number, testcase in enumerate(testcases, 1)
+        ],
+        "compliance_ids": compliance_ids,
+        "traceability_tags": [_unique(testcase.traceability_tags) for testcase in testcases],
+    }
+
+
+def _cell(text: str) -> str:
+    return " ".join(str(text).split()).replace("|", "\\|")
+
+
+def render_testcases_markdown(record: Dict[str, Any]) -> str:
+    """
+    Render an aggregated_testcases record as markdown for the user.
+
+    Traceability tags are shown inline after the description, as the agents
+    used to write them.
+    """
+    if not record.get("testcases"):
+        return record.get("error_message") or f"**{record.get('Testcase Title', NOT_GENERATED_TITLE)}**"
+
+    tags = record.get("traceability_tags") or []
+    lines = [
+        f"### {record.get('Testcase Title', '')}",
+        "",
+        "| Sr.No | Test Description | Expected Result |",
+        "| :---- | :--------------- | :-------------- |",
+    ]
+    for index, (sr_no, description, expected) in enumerate(record["testcases"]):
+        row_tags = tags[index] if index < len(tags) else []
+        if row_tags:
+            description = f"{description} " + " ".join(f"[{tag}]" for tag in row_tags)
+        lines.append(f"| {_cell(sr_no)} | {_cell(description)} | {_cell(expected)} |")
+
+    if record.get("compliance_ids"):
+        lines += ["", "### Applied Compliance Rules"]
+        lines += [f"- {rule}" for rule in record["compliance_ids"]]
+    return "\n".join(lines)
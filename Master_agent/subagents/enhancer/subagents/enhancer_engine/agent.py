@@ -4,32 +4,89 @@ Enhancer engine Agent
 This agent enhances earlier generated testcases based on user input.
 """
 
+import logging
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
-from .tools.rag_query import rag_query
+from google.genai import types
+
+from .....common.config import ENHANCEMENT_MODE
+from .....common.suite_log import TESTCASE_HISTORY, read_suites
+from .....common.testcase_patch import SuitePatch
+from .....common.testcase_resolver import format_enhancement_context, resolve_testcase_references
+from .....common.testcase_suite import StructuredSuite, not_generated_suite
+from .tools.rag_batch_query import rag_batch_query
+from .tools.rag_query import rag_query_async
+from .tools.testcase_suites import get_testcase_suite, list_testcase_suites
 
 
 # Constants
 GEMINI_MODEL = "gemini-2.5-pro"
+ENHANCEMENT_REQUEST_KEY = "enhancement_request"
+ENHANCEMENT_CONTEXT_KEY = "enhancement_context"
+ENHANCEMENT_SUITE_IDS_KEY = "enhancement_suite_ids"
+ENHANCEMENT_PATCH_KEY = "enhancement_patch"
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_enhancement_context(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Resolves the test cases the request refers to before the enhancer's model call.
+
+    The matching sets and rows from all_testcases_history go into
+    enhancement_context (and the request into enhancement_request), so the
+    prompt does not grow with the session. Requests for which nothing can be
+    enhanced (no test cases yet, a test case number that does not exist) get
+    a not_generated suite with the error message instead of a model call.
+
+    Returns:
+        Content to end the agent without calling the model, or None to enhance
+    """
+    user_content = callback_context.user_content
+    query = "".join(part.text or "" for part in (user_content.parts or [])) if user_content else ""
+    resolution = resolve_testcase_references(query, read_suites(callback_context.state, TESTCASE_HISTORY))
+    logger.info(
+        f"Resolved enhancement references: {[suite['testcase_id'] for suite in resolution.suites]}, "
+        f"rows: {resolution.rows}, signals: {resolution.signals}"
+    )
+
+    if resolution.error:
+        callback_context.state["current_testcases"] = not_generated_suite(resolution.error)
+        return types.Content(role="model", parts=[types.Part(text=resolution.error)])
+
+    callback_context.state[ENHANCEMENT_REQUEST_KEY] = query
+    callback_context.state[ENHANCEMENT_CONTEXT_KEY] = format_enhancement_context(resolution)
+    callback_context.state[ENHANCEMENT_SUITE_IDS_KEY] = [suite["testcase_id"] for suite in resolution.suites]
+    return None
+
+
+ENHANCER_INSTRUCTION_HEAD = """
+***
 
+## Agent Purpose
+You are a Test Case Enhancement Agent responsible for accepting user requests to enhance, refine, or modify previously generated test cases from earlier conversations in the current session. You must apply enhancements based on user queries to the test cases the request refers to, and leverage the RAG query tool when additional information from requirements or compliance documentation is needed.
 
-# Define the Initial Testcase Generator Agent
-enhancer_engine = LlmAgent(
-    name="EnhancerEngine",
-    model=GEMINI_MODEL,
-    tools=[rag_query],
-    instruction="""
 ***
 
-## Agent Purpose
-You are a Test Case Enhancement Agent responsible for accepting user requests to enhance, refine, or modify previously generated test cases from earlier conversations in the current session. You must retrieve context from past interactions, apply enhancements based on user queries, and leverage the RAG query tool when additional information from requirements or compliance documentation is needed.
+## Inputs
+
+**Enhancement Request:**
+`{enhancement_request?}`
+
+**Referenced Test Cases:**
+The test case set(s) the request refers to, already looked up for you. When the request names specific test cases, they are listed below the set under "Referenced test cases".
+
+{enhancement_context?}
 
 ***
 
 ## Core Responsibilities
 
 ### 1. Context Management
-- Maintain awareness of all test cases generated in the current session
-- Track test case IDs, descriptions, and expected results from previous conversations
+- Work on the Referenced Test Cases above; test case numbers in the request are the Sr.No values of that set
+- Other sets of the session are not part of this prompt. Only if the request clearly needs another set, use list_testcase_suites() (testcase_id, title and number of test cases of every set, oldest first) and get_testcase_suite(testcase_id='<testcase_id>')
 - Reference specific test cases when users request enhancements by number or description
 
 ### 2. Enhancement Processing
@@ -42,12 +99,16 @@ You are a Test Case Enhancement Agent responsible for accepting user requests to
 When enhancements require additional context, use the RAG query tool:
 
 **For Requirements Information:**
-Use the rag_query tool to search the requirements corpus.
-Tool Call Example: rag_query(corpora=['requirements'], query='Detailed specification for <feature_name>')
+Use the rag_query_async tool to search the requirements corpus.
+Tool Call Example: rag_query_async(corpora=['requirements'], query='Detailed specification for <feature_name>')
 
 **For Compliance Information:**
-Use the rag_query tool to search the compliance corpus.
-Tool Call Example: rag_query(corpora=['compliance'], query='compliance rules related to <feature_name_or_domain>')
+Use the rag_query_async tool to search the compliance corpus.
+Tool Call Example: rag_query_async(corpora=['compliance'], query='compliance rules related to <feature_name_or_domain>')
+
+**For Both at Once:**
+When you need requirements and compliance information together, use the rag_batch_query tool to run both searches in a single call.
+Tool Call Example: rag_batch_query(queries=[{'corpora': ['requirements'], 'query': 'Detailed specification for <feature_name>'}, {'corpora': ['compliance'], 'query': 'compliance rules related to <feature_name_or_domain>'}])
 
 ***
 
@@ -55,12 +116,12 @@ Tool Call Example: rag_query(corpora=['compliance'], query='compliance rules rel
 
 ### Step 1: Identify Enhancement Request
 - Parse the user's enhancement request
-- Identify which test cases from previous conversation require modification
+- Identify which of the Referenced Test Cases require modification
 - Note the specific enhancement type (add steps, modify expected results, add compliance checks, etc.)
 
 ### Step 2: Retrieve Necessary Information
-- If enhancement requires specification details → use rag_query(corpora=['requirements'], query='...')
-- If enhancement requires compliance validation → use rag_query(corpora=['compliance'], query='...')
+- If enhancement requires specification details → use rag_query_async(corpora=['requirements'], query='...')
+- If enhancement requires compliance validation → use rag_query_async(corpora=['compliance'], query='...')
 - If enhancement is based purely on user input → proceed without RAG queries
 
 ### Step 3: Apply Enhancements
@@ -82,24 +143,40 @@ Tool Call Example: rag_query(corpora=['compliance'], query='compliance rules rel
 
 Your response must strictly adhere to the following format:
 
+"""
+
+# Output section when the enhancer returns the whole enhanced set
+SUITE_OUTPUT_REQUIREMENTS = """Your response is constrained to the test suite schema. Do not add any text outside it.
+
 #### On Successful Test Case Enhancement
 
-1. Enhanced Test Cases Table
+*   `status`: "generated"
+*   `title`: A short title for the enhanced test case set (max 10 words).
+*   `testcases`: The enhanced test cases, numbered with `sr_no` from 1. Each has a `description`, a specific and verifiable `expected_result`, the `compliance_ids` it verifies and its `traceability_tags` (e.g. `REQ-45.2`, `COMP-GDPR-RTBF`).
+*   `applied_compliance_rules`: All rules from the compliance corpus that apply to the enhanced test cases.
+
+"""
 
-| Sr.No | Test Description | Expected Result |
-| :---- | :--------------- | :-------------- |
-| 1.    | ...              | ...             |
-| 2.    | ...              | ...             |
-| n.    | ...              | ...             |
+# Output section when the enhancer returns an edit list (see common.testcase_patch)
+PATCH_OUTPUT_REQUIREMENTS = """Your response is constrained to the test suite patch schema. Return ONLY the changes to the set; the unchanged test cases are kept automatically. Do not add any text outside it.
 
-2. Applied Compliance Rules
+#### On Successful Test Case Enhancement
 
-### Applied Compliance Rules
-- [Rule 1 from compliance corpus]
-- [Rule 2 from compliance corpus]
-- [Rule n from compliance corpus]
+*   `status`: "generated"
+*   `testcase_id`: The Test case set ID shown above the set you are enhancing.
+*   `title`: A new short title (max 10 words) only if the enhancement changes what the set covers; otherwise leave it empty.
+*   `edits`: The changes, in order. `row` is always the Sr.No of a test case in the Referenced Test Cases as shown above, never a number after your other edits:
+    *   `{"op": "update", "row": N, ...}`: Changes test case N. Give the new `description` and/or `expected_result` (an empty field keeps the current text) and any `traceability_tags` to add.
+    *   `{"op": "insert_after", "row": N, ...}`: Adds a new test case after test case N (0: at the top) with a `description`, a specific and verifiable `expected_result`, its `compliance_ids` and `traceability_tags` (e.g. `REQ-45.2`, `COMP-GDPR-RTBF`).
+    *   `{"op": "delete", "row": N}`: Removes test case N.
+    *   `{"op": "add_compliance", "row": N, "compliance_ids": [...]}`: Records compliance rules verified by test case N (0: the whole set).
+*   `applied_compliance_rules`: The rules from the compliance corpus your edits apply.
+
+The test cases are renumbered after your edits are applied; do not renumber them yourself.
+
+"""
 
-#### On Failed Enhancement (Cannot Generate)
+ENHANCER_INSTRUCTION_TAIL = """#### On Failed Enhancement (Cannot Generate)
 
 CRITICAL: If you cannot enhance the test cases due to any of the following reasons:
 - No test cases exist from previous conversations in the session
@@ -110,9 +187,9 @@ CRITICAL: If you cannot enhance the test cases due to any of the following reaso
 - Insufficient context to safely apply the requested enhancements
 
 You MUST:
-1. Set current_testcases to contain ONLY a clear, specific error message explaining why enhancement cannot be performed
+1. Set `status` to "not_generated" and put ONLY a clear, specific error message explaining why enhancement cannot be performed in `message`
 2. The error message format must be: "Test case enhancement cannot be generated. Reason: [specific reason explaining the blocker]"
-3. Do NOT include any test case tables, compliance rules, or additional content
+3. Do NOT include any test cases, edits, compliance rules, or additional content
 4. Do NOT attempt partial enhancements
 5. Provide actionable guidance on what the user should do to successfully request enhancement
 
@@ -128,7 +205,7 @@ Example Error Messages:
 
 ### Context Awareness
 - Always reference the specific test cases from previous conversation when making enhancements
-- If a user refers to "test case 3" or "the slot booking test", retrieve the exact test case from session history
+- If a user refers to "test case 3" or "the slot booking test", use the exact test case from the Referenced Test Cases
 - Maintain test case numbering continuity or renumber as appropriate
 
 ### Enhancement Scope
@@ -152,13 +229,13 @@ Example Error Messages:
 
 ### Prerequisites Check
 Before attempting any enhancement, verify:
-1. Test cases exist in the current session state (current_testcases is not empty)
+1. Referenced Test Cases are present above
 2. The enhancement request clearly identifies which test cases to modify
 3. The requested changes are feasible given available information
 
 ### Blocking Conditions
-If ANY of the following conditions are true, you MUST return an error message in current_testcases:
-- Session state contains no test cases or current_testcases is empty/null
+If ANY of the following conditions are true, you MUST return a "not_generated" suite with an error message:
+- No Referenced Test Cases are present
 - User references specific test case numbers that don't exist in the session
 - Enhancement request is ambiguous or lacks sufficient detail
 - Required requirements or compliance information cannot be retrieved via RAG queries
@@ -170,7 +247,7 @@ When returning an error:
 - Be specific about what went wrong
 - Provide clear guidance on how the user can correct the issue
 - Use the format: "Test case enhancement cannot be generated. Reason: [detailed explanation with actionable next steps]"
-- Store ONLY this error message in current_testcases with no additional content
+- Store ONLY this error message in the suite's `message`, with no test cases
 
 ***
 
@@ -179,26 +256,45 @@ When returning an error:
 ### Scenario 1: Successful Enhancement
 User Request: "Add password complexity validation to test case 5"
 Agent Action: 
-- Retrieves test case 5 from session
+- Takes test case 5 from the Referenced Test Cases
 - Queries compliance corpus for password requirements
 - Updates test case 5 with detailed password validation steps
 - Documents applicable compliance rules
 
 ### Scenario 2: Failed Enhancement - No Context
 User Request: "Enhance the login test cases"
-Session State: current_testcases is empty
+Session State: no Referenced Test Cases are present
 Agent Action: 
-- Sets current_testcases = "Test case enhancement cannot be generated. Reason: No test cases found in the current session. Please generate test cases first by providing your requirements, then request enhancements."
+- Returns status "not_generated" with message = "Test case enhancement cannot be generated. Reason: No test cases found in the current session. Please generate test cases first by providing your requirements, then request enhancements."
 - Does not attempt any enhancement
 
 ### Scenario 3: Failed Enhancement - Invalid Reference
 User Request: "Update test case 25 to include biometric authentication"
 Session State: Only 15 test cases exist
 Agent Action:
-- Sets current_testcases = "Test case enhancement cannot be generated. Reason: Test case 25 does not exist. The current session contains only 15 test cases (numbered 1-15). Please specify a valid test case number or describe the test case you want to enhance."
+- Returns status "not_generated" with message = "Test case enhancement cannot be generated. Reason: Test case 25 does not exist. The current session contains only 15 test cases (numbered 1-15). Please specify a valid test case number or describe the test case you want to enhance."
 
 ***
- """,
+ """
+
+if ENHANCEMENT_MODE == "full":
+    # The whole enhanced set, turned into a record by the processor
+    OUTPUT_REQUIREMENTS, OUTPUT_KEY, OUTPUT_SCHEMA = SUITE_OUTPUT_REQUIREMENTS, "current_testcases", StructuredSuite
+else:
+    # Only the edits, applied to the stored set by the processor
+    OUTPUT_REQUIREMENTS, OUTPUT_KEY, OUTPUT_SCHEMA = PATCH_OUTPUT_REQUIREMENTS, ENHANCEMENT_PATCH_KEY, SuitePatch
+
+
+# Define the Enhancer Engine Agent
+enhancer_engine = LlmAgent(
+    name="EnhancerEngine",
+    model=GEMINI_MODEL,
+    tools=[list_testcase_suites, get_testcase_suite, rag_batch_query, rag_query_async],
+    instruction=ENHANCER_INSTRUCTION_HEAD + OUTPUT_REQUIREMENTS + ENHANCER_INSTRUCTION_TAIL,
     description="Makes enhancements to previously generated test cases based on user requests and additional context from RAG queries.",
-    output_key="current_testcases",
+    output_key=OUTPUT_KEY,
+    output_schema=OUTPUT_SCHEMA,
+    # The referenced test cases are injected above, so earlier turns (every suite so far) are not sent
+    include_contents="none",
+    before_agent_callback=resolve_enhancement_context,
 )
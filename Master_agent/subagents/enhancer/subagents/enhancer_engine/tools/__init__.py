@@ -1,21 +1,30 @@
 """
-RAG Tools package for interacting with Vertex AI RAG corpora.
+RAG Tools package for interacting with Vertex AI RAG corpora, and tools for
+fetching the session's previously generated test suites.
 """
 
 from .get_corpus_info import get_corpus_info
 from .list_corpora import list_corpora
-from .rag_query import rag_query
+from .rag_batch_query import rag_batch_query
+from .rag_query import rag_query, rag_query_async
+from .testcase_suites import get_testcase_suite, list_testcase_suites
 from .utils import (
     check_corpus_exists,
     get_corpus_resource_name,
+    invalidate_corpus_cache,
     set_current_corpus,
 )
 
 __all__ = [
     "list_corpora",
     "rag_query",
+    "rag_query_async",
+    "rag_batch_query",
     "get_corpus_info",
+    "list_testcase_suites",
+    "get_testcase_suite",
     "check_corpus_exists",
     "get_corpus_resource_name",
+    "invalidate_corpus_cache",
     "set_current_corpus",
 ]
@@ -0,0 +1,66 @@
+"""
+Tools for fetching previously generated test suites on demand.
+
+The suites are not part of the enhancer's prompt; session state only holds
+references to them (see common.suite_log), and the records are read from
+state or the SQLite suite store when the agent asks for them.
+"""
+
+from google.adk.tools.tool_context import ToolContext
+
+from ......common.suite_log import TESTCASE_HISTORY, is_history_record, read_suite, suite_references
+from ......common.testcase_suite import render_testcases_markdown
+
+
+def list_testcase_suites(tool_context: ToolContext) -> dict:
+    """
+    List the test case sets generated earlier in this session.
+
+    Args:
+        tool_context (ToolContext): The tool context
+
+    Returns:
+        dict: status, message and suites (testcase_id, title and number of
+              test cases of each set, oldest first)
+    """
+    references = [
+        reference for reference in suite_references(tool_context.state, TESTCASE_HISTORY)
+        if is_history_record(reference)
+    ]
+    if not references:
+        return {
+            "status": "error",
+            "message": "No test cases have been generated in this session.",
+            "suites": [],
+        }
+    return {
+        "status": "success",
+        "message": f"Found {len(references)} test case sets.",
+        "suites": references,
+    }
+
+
+def get_testcase_suite(testcase_id: str, tool_context: ToolContext) -> dict:
+    """
+    Fetch one previously generated test case set.
+
+    Args:
+        testcase_id (str): The set's testcase_id, from list_testcase_suites
+        tool_context (ToolContext): The tool context
+
+    Returns:
+        dict: status, message, suite (the stored record) and markdown (the set
+              rendered as a table with Sr.No, Test Description and Expected Result)
+    """
+    record = read_suite(tool_context.state, testcase_id)
+    if record is None:
+        return {
+            "status": "error",
+            "message": f"Test case set '{testcase_id}' does not exist.",
+        }
+    return {
+        "status": "success",
+        "message": f"Found {len(record.get('testcases') or [])} test cases in '{record.get('Testcase Title', '')}'.",
+        "suite": record,
+        "markdown": render_testcases_markdown(record),
+    }
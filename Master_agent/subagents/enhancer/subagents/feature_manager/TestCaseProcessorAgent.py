@@ -1,16 +1,27 @@
-import logging
+import asyncio
 import json
-from typing import AsyncGenerator, Any, Dict
+import logging
+import uuid
+from typing import AsyncGenerator, Any, Dict, List, Optional
 from typing_extensions import override
 
 from google.adk.agents import BaseAgent
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.events import Event, EventActions
-
-import uuid
-import json
-import logging
-from vertexai.generative_models import GenerativeModel
+from google.genai import types
+
+from .....common.config import LLM_CALL_TIMEOUT_SECONDS
+from .....common.markdown_tables import make_title, parse_testcase_markdown
+from .....common.model_clients import get_model
+from .....common.suite_log import AGGREGATED_TESTCASES, TESTCASE_HISTORY, append_suites, read_suite, suite_count
+from .....common.testcase_patch import PatchError, SuitePatch, apply_suite_patch, describe_patch, load_patch
+from .....common.testcase_suite import (
+    SUITE_NOT_GENERATED,
+    StructuredSuite,
+    load_suite,
+    render_testcases_markdown,
+    suite_to_record,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -111,11 +122,14 @@ Return ONLY the formatted summary message, no additional explanations or meta-co
 """
     
     try:
-        # Initialize Vertex AI Generative Model
-        model = GenerativeModel(model_name)
+        # Reuse the shared Vertex AI Generative Model client
+        model = get_model(model_name)
         
-        # Generate content
-        response = model.generate_content(summarization_prompt)
+        # Generate content without blocking the event loop
+        response = await asyncio.wait_for(
+            model.generate_content_async(summarization_prompt),
+            timeout=LLM_CALL_TIMEOUT_SECONDS,
+        )
         summary_message = response.text.strip()
         
         return summary_message
@@ -213,13 +227,21 @@ def generate_fallback_summary_from_markdown(current_testcases: str) -> str:
         
         return "\n".join(summary_lines)
 
-async def parse_testcases_to_json(current_testcases: str, model_name: str = "gemini-2.0-flash") -> dict:
+async def parse_testcases_to_json(
+    current_testcases: str,
+    model_name: str = "gemini-2.0-flash",
+    title: Optional[str] = None,
+) -> dict:
     """
-    Parses markdown table test cases into structured JSON format using Vertex AI.
+    Parses markdown table test cases into structured JSON format.
+
+    The table is parsed locally; Vertex AI is only called when the markdown does
+    not pass the local parser's validation.
     
     Args:
         current_testcases: Markdown table string containing test cases OR error message
-        model_name: Model identifier (default: gemini-2.0-flash)
+        model_name: Model identifier for the LLM fallback (default: gemini-2.0-flash)
+        title: Title for the test case set; derived from the markdown if not given
         
     Returns:
         Dictionary with parsed test cases and compliance information.
@@ -300,11 +322,26 @@ Important:
                 "error_message": current_testcases.strip()
             }
         
-        # Initialize Vertex AI Generative Model
-        model = GenerativeModel(model_name)
+        # Parse locally first; the LLM is only needed when the markdown does not validate
+        local_parse = parse_testcase_markdown(current_testcases)
+        if local_parse is not None:
+            testcases = local_parse["testcases"]
+            return {
+                "testcase_id": str(uuid.uuid4()),
+                "Testcase Title": make_title(title or local_parse["heading"] or testcases[0][1]),
+                "testcases": testcases,
+                "compliance_ids": local_parse["compliance_ids"],
+            }
+        logger.warning("Local test case parsing failed validation, falling back to the LLM parser")
+        
+        # Reuse the shared Vertex AI Generative Model client
+        model = get_model(model_name)
         
-        # Generate content
-        response = model.generate_content(parsing_prompt)
+        # Generate content without blocking the event loop
+        response = await asyncio.wait_for(
+            model.generate_content_async(parsing_prompt),
+            timeout=LLM_CALL_TIMEOUT_SECONDS,
+        )
         response_text = response.text.strip()
         
         # Remove markdown code blocks if present
@@ -338,10 +375,6 @@ Important:
         raise
 
 
-# --- Configure logging to show output in the console ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-
-
 class TestCaseProcessorAgent(BaseAgent):
     """
     An ADK agent that aggregates test cases. And handles logging and event authoring.
@@ -352,6 +385,34 @@ class TestCaseProcessorAgent(BaseAgent):
         super().__init__(name=name, **kwargs)
         # The self.logger attribute is no longer initialized here to prevent the error.
 
+    def _apply_patch(self, state: Any, patch: SuitePatch) -> Dict[str, Any]:
+        """
+        Applies an enhancement patch to the set it names (or the set the
+        resolver selected) and returns the new version, or an error record.
+        """
+        logger = logging.getLogger(self.name)
+        if patch.status == SUITE_NOT_GENERATED:
+            return suite_to_record(StructuredSuite(status=SUITE_NOT_GENERATED, message=patch.message))
+
+        suite_ids = state.get("enhancement_suite_ids") or []
+        base_id = patch.testcase_id if patch.testcase_id in suite_ids or not suite_ids else suite_ids[-1]
+        base = read_suite(state, base_id) if base_id else None
+        try:
+            if base is None:
+                raise PatchError(f"Test case set '{base_id}' does not exist.")
+            record = apply_suite_patch(base, patch)
+        except PatchError as e:
+            logger.error(f"Failed to apply the enhancement patch: {e}")
+            return suite_to_record(StructuredSuite(
+                status=SUITE_NOT_GENERATED,
+                message=f"Test case enhancement cannot be generated. Reason: {e}",
+            ))
+        logger.info(
+            f"Applied {len(patch.edits)} edits to {base_id}: "
+            f"{len(base['testcases'])} -> {len(record['testcases'])} test cases ({record['testcase_id']})"
+        )
+        return record
+
     @override
     async def _run_async_impl(
         self, ctx: InvocationContext
@@ -366,48 +427,81 @@ class TestCaseProcessorAgent(BaseAgent):
         state_delta: Dict[str, Any] = {}
         
         current_testcases = state.get("current_testcases")
-        aggregated_testcases = state.get("aggregated_testcases", [])
-        
-        if aggregated_testcases is None:
-            aggregated_testcases = []
+        new_records: List[Dict[str, Any]] = []
         
-        all_testcases_history = list(state.get("all_testcases_history", []))
-        
-        if current_testcases:
-            # Parse the test cases using Vertex AI before appending
-            try:
-                parsed_json = await parse_testcases_to_json(
-                    current_testcases, 
-                    model_name="gemini-2.0-flash"  # or "gemini-2.5-pro" for better accuracy
+        content = None
+        patch = load_patch(state.get("enhancement_patch"))
+        suite = load_suite(current_testcases)
+        if patch is not None:
+            # Patch mode: apply the edit list to the stored set; no parsing and no summary model call
+            record = self._apply_patch(state, patch)
+            new_records.append(record)
+            if record["testcases"]:
+                state_delta["final_summary"] = describe_patch(patch, record)
+                content = types.Content(
+                    role="model", parts=[types.Part(text=render_testcases_markdown(record))]
                 )
-                logger.info(f"Successfully parsed test cases: {parsed_json['testcase_id']}")
-                
-                aggregated_testcases.append(parsed_json)
-                all_testcases_history.append(parsed_json)
-                
-                summary_response = await summarize_testcases_from_markdown(current_testcases,)
-                state_delta["final_summary"] = summary_response
-                
-            except Exception as e:
-                logger.error(f"Failed to parse test cases: {e}")
+            else:
+                state_delta["final_summary"] = record["error_message"]
+                content = types.Content(role="model", parts=[types.Part(text=record["error_message"])])
+        elif suite is not None and not suite.testcases:
+            # Nothing was enhanced (e.g. a test case that does not exist); report the reason as is
+            record = suite_to_record(suite)
+            new_records.append(record)
+            state_delta["final_summary"] = record["error_message"]
+            content = types.Content(role="model", parts=[types.Part(text=record["error_message"])])
+        elif current_testcases:
+            if suite is not None:
+                # Structured output needs no parsing; only the summary sees rendered markdown
+                parse_result = suite_to_record(suite)
+                summary_response = await summarize_testcases_from_markdown(
+                    render_testcases_markdown(parse_result)
+                )
+            else:
+                # Parse the test cases (Vertex AI only as a fallback) and summarize them concurrently
+                parse_result, summary_response = await asyncio.gather(
+                    parse_testcases_to_json(
+                        current_testcases, 
+                        model_name="gemini-2.0-flash"  # or "gemini-2.5-pro" for better accuracy
+                    ),
+                    summarize_testcases_from_markdown(current_testcases,),
+                    return_exceptions=True,
+                )
+            if isinstance(summary_response, Exception):
+                summary_response = generate_fallback_summary_from_markdown(current_testcases)
+            if isinstance(parse_result, Exception):
+                logger.error(f"Failed to parse test cases: {parse_result}")
                 # Fallback: append error record
-                aggregated_testcases.append({
+                new_records.append({
                     "testcase_id": str(uuid.uuid4()),
                     "Testcase Title": "Parse Error",
                     "testcases": [],
                     "compliance_ids": [],
                     "raw_content": current_testcases,   
-                    "error": str(e)
+                    "error": str(parse_result)
                 })
+            else:
+                parsed_json = parse_result
+                logger.info(f"Successfully parsed test cases: {parsed_json['testcase_id']}")
+                
+                new_records.append(parsed_json)
+                
+                state_delta["final_summary"] = summary_response
+                content = types.Content(
+                    role="model", parts=[types.Part(text=render_testcases_markdown(parsed_json))]
+                )
         
-        state_delta["aggregated_testcases"] = aggregated_testcases
-        output_message = f"Aggregated {len(aggregated_testcases)} test case sets."    
+        # Append-only: the event carries just the new set, not the whole lists
+        await append_suites(state, AGGREGATED_TESTCASES, new_records, state_delta, session_id=ctx.session.id)
+        await append_suites(state, TESTCASE_HISTORY, new_records, state_delta, session_id=ctx.session.id)
+        output_message = f"Aggregated {suite_count(state_delta, AGGREGATED_TESTCASES)} test case sets."    
         
             
 
         # If the loop is not finished, yield an event to update the state
         logger.info(output_message)
         yield Event(
+            content=content,
             actions=EventActions(state_delta=state_delta),
             author=self.name
         )
\ No newline at end of file
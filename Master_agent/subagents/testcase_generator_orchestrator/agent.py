@@ -1,29 +1,43 @@
 
-from google.adk.agents import LoopAgent, SequentialAgent
+from google.adk.agents import SequentialAgent
 
+from ...common.config import (
+    FEATURE_GENERATION_MAX_CONCURRENCY,
+    FEATURE_GENERATION_MAX_FEATURES,
+    FEATURE_GENERATION_MODE,
+    FEATURE_PAGE_SIZE,
+)
 from .subagents.testcase_generator_agent import testcase_generator_agent
 from .subagents.requirement_analyst import testcase_requirements_generator
-from .subagents.generated_testcase_collector import testcase_collector
-from .subagents.feature_manager import feature_manager
-from .subagents.feature_manager.TestCaseProcessorAgent import TestCaseProcessorAgent
+from .subagents.context_prefetcher import context_prefetcher
+from .subagents.feature_manager.FeatureQueueManagerAgent import FeatureQueueManagerAgent
+from .subagents.feature_manager.ParallelFeatureGeneratorAgent import ParallelFeatureGeneratorAgent
 
 
-# Create the Testcase Generator Loop Agent
-testcase_generator_loop = LoopAgent(
-    name="TestcaseGeneratorLoop",
-    max_iterations=10,  
-    sub_agents=[    
-        testcase_generator_agent,
-        TestCaseProcessorAgent(),
-    ],
-    description="Iteratively generates Testcase until all features have been processed",
-)
+if FEATURE_GENERATION_MODE == "parallel":
+    # Fan out: one isolated pipeline run per feature, joined in feature order
+    testcase_generator_step = ParallelFeatureGeneratorAgent(
+        max_concurrency=FEATURE_GENERATION_MAX_CONCURRENCY,
+        max_features=FEATURE_GENERATION_MAX_FEATURES,
+        sub_agents=[testcase_generator_agent],
+        description="Generates Testcase for all features concurrently and merges them in feature order",
+    )
+else:
+    # Work through the feature queue one feature at a time, in pages, until it is empty
+    testcase_generator_step = FeatureQueueManagerAgent(
+        name="TestcaseGeneratorLoop",
+        page_size=FEATURE_PAGE_SIZE,
+        max_features=FEATURE_GENERATION_MAX_FEATURES,
+        sub_agents=[testcase_generator_agent],
+        description="Iteratively generates Testcase until all features have been processed",
+    )
 
 new_testcase_generator = SequentialAgent(
     name="TestcaseGenerationPipeline",
     sub_agents=[
         testcase_requirements_generator,  # Step 1: Generate Testcase requirements
-        testcase_generator_loop,  # Step 2: Generate Testcase in a loop
+        context_prefetcher,  # Step 2: Prefetch retrieval context for every feature
+        testcase_generator_step,  # Step 3: Generate Testcase per feature (queue or fan-out)
     ],
     description="Generates and refines a Testcase through an iterative review process",
 )
\ No newline at end of file
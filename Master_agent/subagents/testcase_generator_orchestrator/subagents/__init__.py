@@ -1,4 +1,3 @@
-from .generated_testcase_collector import testcase_collector
+from .context_prefetcher import context_prefetcher
 from .requirement_analyst import testcase_requirements_generator
 from .testcase_generator_agent import testcase_generator_agent
-from .feature_manager import feature_manager
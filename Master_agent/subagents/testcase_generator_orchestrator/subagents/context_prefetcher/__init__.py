@@ -0,0 +1,5 @@
+"""
+Package for the Context Prefetch sub-agent.
+"""
+
+from .agent import ContextPrefetchAgent, context_prefetcher
@@ -0,0 +1,69 @@
+"""
+Context Prefetch Agent
+
+This agent retrieves the requirements and compliance context for the first
+features in features_to_process (a window of PREFETCH_WINDOW from the cursor)
+before the generation loop starts, so that the first loop iterations can start
+generating immediately. The feature runners prefetch the rest as the cursor
+moves (see common.context_prefetch).
+"""
+
+import logging
+from typing import AsyncGenerator, List
+from typing_extensions import override
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from .....common.context_prefetch import prefetch_feature_contexts, prefetch_window
+from .....common.feature_context import (
+    FEATURE_CONTEXT_KEY,
+    FEATURE_CURSOR_KEY,
+    PREFETCHED_CONTEXT_KEY,
+    feature_queue,
+)
+
+
+class ContextPrefetchAgent(BaseAgent):
+    """
+    An ADK agent that prefetches retrieval context for the features at the
+    front of the queue concurrently. The results go to the context store;
+    state keeps a reference bundle per feature (see common.feature_context).
+    """
+
+    def __init__(self, name: str = "ContextPrefetchAgent", **kwargs):
+        """Initializes the agent."""
+        super().__init__(name=name, **kwargs)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Runs the window's requirements and compliance retrievals with bounded
+        parallelism and writes the reference bundles to state.
+        """
+        logger = logging.getLogger(self.name)
+
+        state = ctx.session.state
+        features: List[str] = feature_queue(state)
+        window = prefetch_window(features, state.get(FEATURE_CURSOR_KEY) or 0, [])
+        if not window:
+            logger.info("No features to prefetch context for.")
+            return
+
+        prefetched = await prefetch_feature_contexts(window)
+        yield Event(
+            actions=EventActions(
+                state_delta={
+                    PREFETCHED_CONTEXT_KEY: prefetched,
+                    # Seed the bundle for the first feature the loop will process
+                    FEATURE_CONTEXT_KEY: prefetched[window[0]],
+                }
+            ),
+            author=self.name,
+        )
+
+
+context_prefetcher = ContextPrefetchAgent()
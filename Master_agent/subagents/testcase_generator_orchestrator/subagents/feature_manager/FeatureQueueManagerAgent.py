@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import math
+from typing import AsyncGenerator, Any, Dict, List
+from typing_extensions import override
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .....common.context_prefetch import prefetch_feature_contexts, prefetch_window
+from .....common.feature_context import (
+    CURRENT_FEATURE_KEY,
+    FEATURE_CONTEXT_KEY,
+    FEATURE_CURSOR_KEY,
+    PREFETCHED_CONTEXT_KEY,
+    feature_queue,
+)
+from .....common.suite_log import AGGREGATED_TESTCASES, TESTCASE_HISTORY, append_suites, read_suites
+from .....common.testcase_suite import render_testcases_markdown
+from .TestCaseProcessorAgent import (
+    collect_feature_testcases,
+    format_unprocessed_features,
+    missing_testcases_record,
+    summarize_testcases_output,
+)
+
+UNPROCESSED_FEATURES_KEY = "unprocessed_features"
+
+
+class FeatureQueueManagerAgent(BaseAgent):
+    """
+    An ADK agent that owns the feature queue of a serial generation run.
+
+    For the feature at feature_cursor in features_to_process it runs the
+    generation pipeline (the single sub-agent), collects the result, advances
+    the cursor and moves the prefetched retrieval context on to the next
+    feature. While a feature is generated, the context of the next
+    PREFETCH_WINDOW features is prefetched in the background, and
+    prefetched_context only keeps the references of that window. The
+    feature list itself is never rewritten and no LLM call is
+    made for queue handling. Each collected set is shown to the user as a
+    markdown table rendered from the record.
+
+    The run is sized from the queue: features are processed in pages of
+    page_size, with progress logged after each page. Each set is appended to
+    aggregated_testcases / all_testcases_history (see common.suite_log) in
+    the event that advances feature_cursor past its feature, so if a run
+    fails, every finished set is kept and a new run resumes at the failed
+    feature. At most
+    max_features are processed (0: all of them); any left over are stored in
+    unprocessed_features and listed in the final summary instead of being
+    dropped silently.
+    """
+
+    page_size: int = 5
+    max_features: int = 0
+
+    def __init__(self, name: str = "FeatureQueueManager", **kwargs):
+        """Initializes the agent."""
+        super().__init__(name=name, **kwargs)
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Runs the pipeline once per queued feature, page by page, and writes the
+        final summary after the last one.
+        """
+        logger = logging.getLogger(self.name)
+        pipeline = self.sub_agents[0]
+
+        state = ctx.session.state
+        features: List[str] = feature_queue(state)
+        start = state.get(FEATURE_CURSOR_KEY) or 0
+        if start >= len(features):
+            logger.info("No features to process.")
+            return
+
+        end = len(features)
+        if self.max_features > 0:
+            end = min(end, start + self.max_features)
+        page_size = max(1, self.page_size)
+        pages = math.ceil((end - start) / page_size)
+        logger.info(
+            f"Processing {end - start} of {len(features) - start} queued features "
+            f"in {pages} page(s) of up to {page_size}."
+        )
+
+        aggregated_testcases = read_suites(state, AGGREGATED_TESTCASES)
+        prefetched_context = state.get(PREFETCHED_CONTEXT_KEY) or {}
+
+        for page, page_start in enumerate(range(start, end, page_size), 1):
+            page_end = min(page_start + page_size, end)
+            for index in range(page_start, page_end):
+                feature = features[index]
+                logger.info(f"Generating test cases for feature {index + 1}/{len(features)}: {feature}")
+                upcoming = prefetch_window(features, index + 1, prefetched_context, end)
+                prefetch = asyncio.ensure_future(prefetch_feature_contexts(upcoming)) if upcoming else None
+                try:
+                    async for event in pipeline.run_async(ctx):
+                        yield event
+                    if prefetch is not None:
+                        prefetched_context = {**prefetched_context, **await prefetch}
+                finally:
+                    if prefetch is not None:
+                        prefetch.cancel()
+                # Only the window ahead of the cursor stays referenced in state
+                ahead = set(features[index + 1:end])
+                prefetched_context = {
+                    name: bundle for name, bundle in prefetched_context.items() if name in ahead
+                }
+
+                current_testcases = state.get("current_testcases")
+                if current_testcases:
+                    record = await collect_feature_testcases(current_testcases, feature)
+                else:
+                    record = missing_testcases_record(feature)
+                aggregated_testcases.append(record)
+
+                next_feature = features[index + 1] if index + 1 < end else ""
+                state_delta: Dict[str, Any] = {
+                    FEATURE_CURSOR_KEY: index + 1,
+                    CURRENT_FEATURE_KEY: next_feature,
+                    # Clear the current_testcases variable for the next feature
+                    "current_testcases": "",
+                    # Replace the finished feature's retrieval context with the next feature's prefetched one
+                    FEATURE_CONTEXT_KEY: prefetched_context.get(next_feature),
+                    PREFETCHED_CONTEXT_KEY: prefetched_context,
+                }
+                # The set goes in with the cursor move, so a failure later in the page cannot lose it
+                await append_suites(state, AGGREGATED_TESTCASES, [record], state_delta, session_id=ctx.session.id)
+                await append_suites(state, TESTCASE_HISTORY, [record], state_delta, session_id=ctx.session.id)
+                if index + 1 == page_end:
+                    logger.info(f"Finished page {page}/{pages} (features {page_start + 1}-{page_end}).")
+                if index + 1 == end:
+                    unprocessed_features = features[end:]
+                    if unprocessed_features:
+                        logger.warning(
+                            f"Feature limit of {self.max_features} reached; "
+                            f"{len(unprocessed_features)} features were not processed."
+                        )
+                    summary = await summarize_testcases_output(aggregated_testcases)
+                    state_delta[UNPROCESSED_FEATURES_KEY] = unprocessed_features
+                    state_delta["final_summary"] = summary + format_unprocessed_features(unprocessed_features)
+
+                yield Event(
+                    content=types.Content(
+                        role="model", parts=[types.Part(text=render_testcases_markdown(record))]
+                    ),
+                    actions=EventActions(state_delta=state_delta),
+                    author=self.name
+                )
@@ -0,0 +1,205 @@
+import asyncio
+import logging
+from typing import AsyncGenerator, Any, Dict, List, Tuple
+from typing_extensions import override
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .....common.context_prefetch import prefetch_feature_contexts
+from .....common.feature_context import (
+    CURRENT_FEATURE_KEY,
+    FEATURE_CURSOR_KEY,
+    FEATURES_KEY,
+    PREFETCHED_CONTEXT_KEY,
+    feature_queue,
+)
+from .....common.suite_log import AGGREGATED_TESTCASES, TESTCASE_HISTORY, append_suites, read_suites
+from .....common.testcase_suite import render_testcases_markdown
+from .FeatureQueueManagerAgent import UNPROCESSED_FEATURES_KEY
+from .TestCaseProcessorAgent import (
+    collect_feature_testcases,
+    format_unprocessed_features,
+    missing_testcases_record,
+    summarize_testcases_output,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ParallelFeatureGeneratorAgent(BaseAgent):
+    """
+    An ADK agent that runs its generation pipeline (the single sub-agent) once
+    per feature, concurrently, and joins the results in feature order.
+
+    Every feature runs against its own copy of the session, so the
+    pipeline's state keys (current_testcases, testcase_reviews,
+    feature_context, ...) never collide between features. Only the joined
+    sets (appended to aggregated_testcases / all_testcases_history) and
+    final_summary are written back to the real session. A feature whose
+    pipeline raises gets the missing test cases placeholder, so the other
+    features' sets are still joined and stored. At most max_features are run (0: all of
+    them); the rest are reported in unprocessed_features.
+    """
+
+    max_concurrency: int = 3
+    max_features: int = 0
+
+    def __init__(self, name: str = "ParallelFeatureGenerator", **kwargs):
+        """Initializes the agent."""
+        super().__init__(name=name, **kwargs)
+
+    async def _run_feature(
+        self,
+        ctx: InvocationContext,
+        index: int,
+        feature: str,
+        semaphore: asyncio.Semaphore,
+        forwarded: "asyncio.Queue[Event]",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs _generate_feature, turning a failure into the missing test cases placeholder.
+
+        Returns:
+            (record, refinement_report entries) as from _generate_feature
+        """
+        try:
+            return await self._generate_feature(ctx, index, feature, semaphore, forwarded)
+        except Exception as e:
+            logger.error(f"Test case generation failed for feature {index + 1} ({feature}): {e}")
+            return missing_testcases_record(feature), {}
+
+    async def _generate_feature(
+        self,
+        ctx: InvocationContext,
+        index: int,
+        feature: str,
+        semaphore: asyncio.Semaphore,
+        forwarded: "asyncio.Queue[Event]",
+    ) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Runs the pipeline for one feature in an isolated session copy.
+
+        Returns:
+            The record from collect_feature_testcases (or the missing test
+            cases placeholder) and the feature's refinement_report entries
+        """
+        pipeline = self.sub_agents[0]
+        state = ctx.session.state
+
+        feature_state = {
+            key: value
+            for key, value in state.items()
+            if key not in ("prefetched_context", "current_testcases", "testcase_reviews", "refinement_report")
+        }
+        feature_state[FEATURES_KEY] = [feature]
+        feature_state[FEATURE_CURSOR_KEY] = 0
+        feature_state[CURRENT_FEATURE_KEY] = feature
+        prefetched = (state.get(PREFETCHED_CONTEXT_KEY) or {}).get(feature)
+        feature_state["current_testcases"] = ""
+
+        feature_session = ctx.session.model_copy(
+            update={
+                "id": f"{ctx.session.id}:feature-{index}",
+                "state": feature_state,
+                "events": list(ctx.session.events),
+            }
+        )
+        feature_ctx = ctx.model_copy(update={"session": feature_session})
+
+        async with semaphore:
+            # Features beyond the prefetch window fetch their context when their turn comes
+            if prefetched is None:
+                prefetched = (await prefetch_feature_contexts([feature]))[feature]
+            feature_session.state["feature_context"] = prefetched
+            logger.info(f"Generating test cases for feature {index + 1}: {feature}")
+            async for event in pipeline.run_async(feature_ctx):
+                # Stand in for the session service: keep the copy's history and state current
+                feature_session.events.append(event)
+                for key, value in (event.actions.state_delta or {}).items():
+                    feature_session.state[key] = value
+                # Surface the pipeline's text answers in the real session, without its state writes
+                if event.is_final_response() and event.content and event.content.parts:
+                    await forwarded.put(event.model_copy(update={"actions": EventActions()}))
+
+        refinement_report = feature_session.state.get("refinement_report") or {}
+        current_testcases = feature_session.state.get("current_testcases")
+        if not current_testcases:
+            return missing_testcases_record(feature), refinement_report
+        record = await collect_feature_testcases(current_testcases, feature)
+        return record, refinement_report
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Fans the pipeline out over features_to_process with bounded
+        concurrency, then yields a single join event.
+        """
+        logger = logging.getLogger(self.name)
+
+        state = ctx.session.state
+        features: List[str] = feature_queue(state)[state.get(FEATURE_CURSOR_KEY) or 0:]
+        if not features:
+            logger.info("No features to process.")
+            return
+        unprocessed_features: List[str] = []
+        if self.max_features > 0:
+            features, unprocessed_features = features[:self.max_features], features[self.max_features:]
+        if unprocessed_features:
+            logger.warning(
+                f"Feature limit of {self.max_features} reached; "
+                f"{len(unprocessed_features)} features will not be processed."
+            )
+
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        forwarded: "asyncio.Queue[Event]" = asyncio.Queue()
+        tasks = [
+            asyncio.create_task(self._run_feature(ctx, index, feature, semaphore, forwarded))
+            for index, feature in enumerate(features)
+        ]
+        all_done = asyncio.ensure_future(asyncio.gather(*tasks))
+
+        try:
+            while not all_done.done() or not forwarded.empty():
+                get_event = asyncio.ensure_future(forwarded.get())
+                await asyncio.wait({get_event, all_done}, return_when=asyncio.FIRST_COMPLETED)
+                if get_event.done():
+                    yield get_event.result()
+                else:
+                    get_event.cancel()
+            results = all_done.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+
+        # Deterministic join: feature order, regardless of completion order
+        records = [record for record, _ in results]
+        refinement_report = dict(state.get("refinement_report") or {})
+        for _, feature_report in results:
+            refinement_report.update(feature_report)
+
+        summary = await summarize_testcases_output(read_suites(state, AGGREGATED_TESTCASES) + records)
+        state_delta: Dict[str, Any] = {
+            FEATURE_CURSOR_KEY: len(feature_queue(state)) - len(unprocessed_features),
+            CURRENT_FEATURE_KEY: "",
+            "current_testcases": "",
+            "feature_context": None,
+            PREFETCHED_CONTEXT_KEY: {},
+            "refinement_report": refinement_report,
+            UNPROCESSED_FEATURES_KEY: unprocessed_features,
+            "final_summary": summary + format_unprocessed_features(unprocessed_features),
+        }
+        await append_suites(state, AGGREGATED_TESTCASES, records, state_delta, session_id=ctx.session.id)
+        await append_suites(state, TESTCASE_HISTORY, records, state_delta, session_id=ctx.session.id)
+
+        logger.info(f"Generated test cases for {len(features)} features in parallel.")
+        tables = "\n\n".join(render_testcases_markdown(record) for record in records)
+        yield Event(
+            content=types.Content(role="model", parts=[types.Part(text=tables)]),
+            actions=EventActions(state_delta=state_delta),
+            author=self.name
+        )
@@ -1,16 +1,13 @@
-import logging
-import json
-from typing import AsyncGenerator, Any, Dict, List
-from typing_extensions import override
-
-from google.adk.agents import BaseAgent
-from google.adk.agents.invocation_context import InvocationContext
-from google.adk.events import Event, EventActions
-
-import uuid
+import asyncio
 import json
 import logging
-from vertexai.generative_models import GenerativeModel
+import uuid
+from typing import Any, Dict, List, Optional
+
+from .....common.config import LLM_CALL_TIMEOUT_SECONDS
+from .....common.markdown_tables import make_title, parse_testcase_markdown
+from .....common.model_clients import get_model
+from .....common.testcase_suite import load_suite, suite_to_record
 
 logger = logging.getLogger(__name__)
 
@@ -88,11 +85,14 @@ Return ONLY the formatted summary message, no additional text.
 """
     
     try:
-        # Initialize Vertex AI Generative Model
-        model = GenerativeModel(model_name)
+        # Reuse the shared Vertex AI Generative Model client
+        model = get_model(model_name)
         
-        # Generate content
-        response = model.generate_content(summarization_prompt)
+        # Generate content without blocking the event loop
+        response = await asyncio.wait_for(
+            model.generate_content_async(summarization_prompt),
+            timeout=LLM_CALL_TIMEOUT_SECONDS,
+        )
         summary_message = response.text.strip()
         
         return summary_message
@@ -145,18 +145,59 @@ def generate_fallback_summary(
     return "\n".join(summary_lines)
 
 
-async def parse_testcases_to_json(current_testcases: str, model_name: str = "gemini-2.0-flash") -> dict:
+def format_unprocessed_features(unprocessed_features: List[str]) -> str:
+    """
+    Formats the features left out of a run for the end of the summary message.
+
+    Args:
+        unprocessed_features: Features that were queued but not processed
+
+    Returns:
+        Markdown section listing them, or an empty string if there are none
     """
-    Parses markdown table test cases into structured JSON format using Vertex AI.
+    if not unprocessed_features:
+        return ""
+    lines = [
+        "\n### ⏭️ Features Not Processed:",
+        f"The per-request feature limit was reached, so **{len(unprocessed_features)} feature(s)** were not processed:",
+    ]
+    lines.extend(f"- {feature}" for feature in unprocessed_features)
+    lines.append("\nAsk again for these features to generate their test cases.")
+    return "\n".join(lines)
+
+
+async def parse_testcases_to_json(
+    current_testcases: str,
+    model_name: str = "gemini-2.0-flash",
+    title: Optional[str] = None,
+) -> dict:
+    """
+    Parses markdown table test cases into structured JSON format.
+
+    The table is parsed locally; Vertex AI is only called when the markdown does
+    not pass the local parser's validation.
     
     Args:
         current_testcases: Markdown table string containing test cases
-        model_name: Model identifier (default: gemini-2.0-flash)
+        model_name: Model identifier for the LLM fallback (default: gemini-2.0-flash)
+        title: Title for the test case set; derived from the markdown if not given
         
     Returns:
         Dictionary with parsed test cases and compliance information
     """
     
+    # Parse locally first; the LLM is only needed when the markdown does not validate
+    local_parse = parse_testcase_markdown(current_testcases)
+    if local_parse is not None:
+        testcases = local_parse["testcases"]
+        return {
+            "testcase_id": str(uuid.uuid4()),
+            "Testcase Title": make_title(title or local_parse["heading"] or testcases[0][1]),
+            "testcases": testcases,
+            "compliance_ids": local_parse["compliance_ids"],
+        }
+    logger.warning("Local test case parsing failed validation, falling back to the LLM parser")
+
     parsing_prompt = f"""
 You are a test case parser. Extract the following from the markdown table:
 
@@ -186,11 +227,14 @@ Important:
 """
     
     try:
-        # Initialize Vertex AI Generative Model
-        model = GenerativeModel(model_name)
+        # Reuse the shared Vertex AI Generative Model client
+        model = get_model(model_name)
         
-        # Generate content
-        response = model.generate_content(parsing_prompt)
+        # Generate content without blocking the event loop
+        response = await asyncio.wait_for(
+            model.generate_content_async(parsing_prompt),
+            timeout=LLM_CALL_TIMEOUT_SECONDS,
+        )
         response_text = response.text.strip()
         
         # Remove markdown code blocks if present
@@ -220,126 +264,67 @@ Important:
         raise
 
 
-# --- Configure logging to show output in the console ---
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+async def collect_feature_testcases(
+    current_testcases: Any,
+    feature: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Turns one feature's generated test cases into an aggregated_testcases record.
 
+    Args:
+        current_testcases: Output of the generation pipeline for the feature, a
+            StructuredSuite dict (or a legacy markdown table)
+        feature: The feature the test cases were generated for, used as the set title
+            and stored in the record's "feature" (the suite store indexes it)
 
-def get_feature_list(state):
-    requirements = state.get("requirements", {"features_to_process": [] })
-    features = requirements.get("features_to_process", [])
-    # Handle if accidentally stored as JSON string
-    if isinstance(features, str):
-        try:
-            features = json.loads(features)
-        except Exception:
-            # If it's not valid JSON, fallback to treating as plain string (unlikely, log or raise)
-            features = []
-    # At this point, features is always a list
-    return features
+    Returns:
+        The record; an error placeholder without test cases when parsing failed
+        (placeholders stay out of all_testcases_history, see common.suite_log)
+    """
+    record = await _collect_testcases(current_testcases, feature)
+    if feature:
+        record["feature"] = feature
+    return record
 
 
-class TestCaseProcessorAgent(BaseAgent):
+async def _collect_testcases(current_testcases: Any, feature: Optional[str]) -> Dict[str, Any]:
+    # Structured output needs no parsing
+    suite = load_suite(current_testcases)
+    if suite is not None:
+        return suite_to_record(suite, title=feature)
+
+    # Parse the test cases before appending (Vertex AI only as a fallback)
+    try:
+        parsed_json = await parse_testcases_to_json(
+            current_testcases,
+            model_name="gemini-2.0-flash",  # or "gemini-2.5-pro" for better accuracy
+            title=feature,
+        )
+        logger.info(f"Successfully parsed test cases: {parsed_json['testcase_id']}")
+        return parsed_json
+    except Exception as e:
+        logger.error(f"Failed to parse test cases: {e}")
+        # Fallback: error record
+        return {
+            "testcase_id": str(uuid.uuid4()),
+            "Testcase Title": "Parse Error",
+            "testcases": [],
+            "compliance_ids": [],
+            "raw_content": current_testcases,
+            "error": str(e)
+        }
+
+
+def missing_testcases_record(feature: str) -> Dict[str, Any]:
     """
-    An ADK agent that processes features, aggregates test cases, and terminates
-    a loop. This version correctly handles logging and event authoring.
+    Returns the aggregated_testcases placeholder for a feature whose pipeline
+    run produced no test cases.
     """
-
-    def __init__(self, name: str = "TestCaseProcessorAgent", **kwargs):
-        """Initializes the agent."""
-        super().__init__(name=name, **kwargs)
-        # The self.logger attribute is no longer initialized here to prevent the error.
-
-    @override
-    async def _run_async_impl(
-        self, ctx: InvocationContext
-    ) -> AsyncGenerator[Event, None]:
-        """
-        Implements the agent's logic with correct logging and event creation.
-        """
-        # --- Get the logger instance here ---
-        logger = logging.getLogger(self.name)
-
-
-        state = ctx.session.state
-        state_delta: Dict[str, Any] = {}
-        output_message = "Processed a feature and updated test cases."
-
-        requirements = state.get("requirements", {"features_to_process": [] })
-        features_to_process = requirements.get("features_to_process", [])
-        try:
-            features_to_process = json.loads(features_to_process)
-            logger.info(f"Current session state on invocation:\n{features_to_process}")
-        except Exception:
-            logger.error(f"Failed to parse features_to_process string as JSON list{features_to_process}")
-
-
-        # If the processing list is empty, terminate the loop.
-        if not features_to_process:
-            logger.info(f"Current session state on invocation:\n{state}")
-            logger.info("No features left to process. Terminating loop.")
-            yield Event(actions=EventActions(escalate=True), author=self.name)
-            return
-
-        # Process the first feature in the list
-        features_to_process.pop(0)
-        requirements["features_to_process"] = features_to_process
-        state_delta["requirements"] = requirements
-
-        current_testcases = state.get("current_testcases")
-        aggregated_testcases = state.get("aggregated_testcases", [])
-        
-        if aggregated_testcases is None:
-            aggregated_testcases = []
-            
-        all_testcases_history = list(state.get("all_testcases_history", []))
-        
-        if current_testcases:
-            # Parse the test cases using Vertex AI before appending
-            try:
-                parsed_json = await parse_testcases_to_json(
-                    current_testcases, 
-                    model_name="gemini-2.0-flash"  # or "gemini-2.5-pro" for better accuracy
-                )
-                logger.info(f"Successfully parsed test cases: {parsed_json['testcase_id']}")
-                
-                aggregated_testcases.append(parsed_json)
-                all_testcases_history.append(parsed_json)
-            except Exception as e:
-                logger.error(f"Failed to parse test cases: {e}")
-                # Fallback: append error record
-                aggregated_testcases.append({
-                    "testcase_id": str(uuid.uuid4()),
-                    "Testcase Title": "Parse Error",
-                    "testcases": [],
-                    "compliance_ids": [],
-                    "raw_content": current_testcases,
-                    "error": str(e)
-                })
-        
-        state_delta["aggregated_testcases"] = aggregated_testcases
-        state_delta["all_testcases_history"] = all_testcases_history
-        
-        # Clear the current_testcases variable for the next iteration
-        state_delta["current_testcases"] = ""
-        
-        # Check for termination condition *after* processing
-        if not features_to_process:
-            output_message = "Processed the final feature. Terminating loop."
-            logger.info(f"Current session state on invocation:\n{state}")
-            logger.info(output_message)
-            
-            summarize_testcases = await summarize_testcases_output(aggregated_testcases)
-            state_delta["final_summary"] = summarize_testcases
-            
-            yield Event(
-                actions=EventActions(state_delta=state_delta, escalate=True),
-                author=self.name
-            )
-            return
-
-        # If the loop is not finished, yield an event to update the state
-        logger.info(output_message)
-        yield Event(
-            actions=EventActions(state_delta=state_delta),
-            author=self.name
-        )
\ No newline at end of file
+    return {
+        "testcase_id": str(uuid.uuid4()),
+        "Testcase Title": "Test Cases Not Generated",
+        "testcases": [],
+        "compliance_ids": [],
+        "error_message": f"No test cases were produced for feature: {feature}",
+        "feature": feature,
+    }
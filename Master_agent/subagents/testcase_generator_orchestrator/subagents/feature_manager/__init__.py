@@ -2,5 +2,5 @@
 This acts as the initializer for the Feature Manager subagent module.
 """
 
-from .agent import feature_manager
-from .TestCaseProcessorAgent import TestCaseProcessorAgent
\ No newline at end of file
+from .FeatureQueueManagerAgent import FeatureQueueManagerAgent
+from .ParallelFeatureGeneratorAgent import ParallelFeatureGeneratorAgent
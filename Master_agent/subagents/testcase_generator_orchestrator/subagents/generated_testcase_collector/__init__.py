@@ -1,5 +0,0 @@
-"""
-Package for the Generated Testcase Collector sub-agent.
-"""
-
-from .agent import testcase_collector
\ No newline at end of file
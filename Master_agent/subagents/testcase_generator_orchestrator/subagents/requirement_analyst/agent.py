@@ -2,15 +2,60 @@
 Initial Testcase Requirements Generator Agent
 """
 
+import logging
+from typing import List, Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
-from pydantic import BaseModel, Field
-from typing import List
+from google.genai import types
+from pydantic import BaseModel, Field, ValidationError, field_validator
+
+from .....common.feature_context import CURRENT_FEATURE_KEY, FEATURE_CURSOR_KEY, FEATURES_KEY
+
+logger = logging.getLogger(__name__)
 
 
 class OutputSchema(BaseModel):
     features_to_process: List[str] = Field(
         description="List of features to process for test case generation")
 
+    @field_validator("features_to_process")
+    @classmethod
+    def drop_blank_and_duplicate_features(cls, features: List[str]) -> List[str]:
+        unique: List[str] = []
+        for feature in features:
+            feature = " ".join(feature.split())
+            if feature and feature not in unique:
+                unique.append(feature)
+        return unique
+
+
+def store_feature_queue(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Validate the analyst's output once and store the feature queue.
+
+    Writes the validated list to features_to_process and points
+    feature_cursor at its first entry; the generation agents then only move
+    the cursor.
+    """
+    state = callback_context.state
+    requirements = state.get("requirements") or {}
+    try:
+        if isinstance(requirements, str):
+            output = OutputSchema.model_validate_json(requirements)
+        else:
+            output = OutputSchema.model_validate(requirements)
+        features = output.features_to_process
+    except ValidationError as e:
+        logger.error(f"Requirements analyst output does not match OutputSchema: {e}")
+        features = []
+
+    logger.info(f"Queued {len(features)} features for test case generation.")
+    state[FEATURES_KEY] = features
+    state[FEATURE_CURSOR_KEY] = 0
+    state[CURRENT_FEATURE_KEY] = features[0] if features else ""
+    return None
+
 
 # Constants
 GEMINI_MODEL = "gemini-2.0-flash"
@@ -34,22 +79,8 @@ You are an expert Test Requirements Analyst agent. Your primary function is to r
    * If the request is vague or high-level, treat the entire subject as a single feature.
 
 3. **Format the Output:**
-   * Your output must strictly conform to the OutputSchema defined below.
-   * The features_to_process field must contain a list of strings, where each string is a clear and concise description of an individual feature.
-
-### Output Schema
-
-Your response MUST conform to the following Pydantic schema:
-
-```python
-class OutputSchema(BaseModel):
-    features_to_process: List[str] = Field(
-        description="List of features to process for test case generation")
-```
-
-### Critical Output Directive
-
-Your final output must be a valid JSON object matching the OutputSchema. Do not add any descriptive labels, code block specifiers like `python` or `json`, or any other explanatory text outside the JSON structure. The agent's response will be stored directly in the session state for parsing by other agents, and any extraneous content will cause a failure.
+   * Your response is constrained to the OutputSchema: a JSON object whose `features_to_process` field is a list of strings.
+   * Each string must be a clear and concise description of an individual feature.
 
 ### Examples
 
@@ -91,16 +122,14 @@ Your final output must be a valid JSON object matching the OutputSchema. Do not
 ### Validation Rules
 
 Before finalizing your output, ensure:
-- The output is valid JSON matching the OutputSchema
-- The features_to_process field is a list (array) of strings
 - Each string is clear, concise, and represents a testable feature
 - No duplicate features are listed
 - Features are appropriately granular (not too broad, not too narrow)
-- The JSON contains no additional fields beyond those in the schema
 
 ---
     """,
     description="Generates an initial list of features to be processed from the user's request",
     output_key="requirements",
     output_schema=OutputSchema,
+    after_agent_callback=store_feature_queue,
 )
@@ -0,0 +1,95 @@
+import logging
+from typing import AsyncGenerator, Any, Dict
+from typing_extensions import override
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+
+from .....common.feature_context import current_feature
+from .....common.review_table import (
+    REVIEW_APPROVED,
+    REVIEW_GENERATION_FAILURE,
+    REVIEW_UNREVIEWED,
+    count_issue_categories,
+    parse_review_table,
+    refinement_budget,
+    review_outcome,
+)
+
+REFINEMENT_REPORT_KEY = "refinement_report"
+
+
+class RefinementLoopAgent(BaseAgent):
+    """
+    An ADK agent that reviews a feature's test cases and refines them as many
+    times as the first review's findings warrant.
+
+    sub_agents must be [reviewer, refiner]. The budget comes from
+    refinement_budget (weighted IssueCategory counts). After every refine pass
+    that leaves budget the test cases are re-reviewed; the agent itself ends
+    the loop as soon as a review approves them or the budget is spent. The
+    last pass of a spent budget is not re-reviewed, so its final_review is
+    REVIEW_UNREVIEWED (last_review holds the outcome of the review before it).
+    """
+
+    def __init__(self, name: str = "TestcaseRefinementLoop", **kwargs):
+        """Initializes the agent."""
+        super().__init__(name=name, **kwargs)
+
+    def _parse_reviews(self, ctx: InvocationContext):
+        return parse_review_table(ctx.session.state.get("testcase_reviews") or "")
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Runs review -> (refine -> re-review)* within the computed budget and
+        records the iterations used for the current feature.
+        """
+        logger = logging.getLogger(self.name)
+        reviewer, refiner = self.sub_agents
+
+        async for event in reviewer.run_async(ctx):
+            yield event
+        reviews = self._parse_reviews(ctx)
+        outcome = review_outcome(reviews)
+        budget = refinement_budget(reviews)
+        issue_counts = count_issue_categories(reviews)
+        logger.info(f"Review outcome: {outcome}, issues: {issue_counts}, refinement budget: {budget}")
+
+        iterations = 0
+        last_review = outcome
+        while outcome != REVIEW_APPROVED:
+            # On a generation failure the refiner's callback writes the failure message without a model call
+            async for event in refiner.run_async(ctx):
+                yield event
+            if outcome == REVIEW_GENERATION_FAILURE:
+                break
+            iterations += 1
+            if iterations >= budget:
+                # testcase_reviews describes the test cases before this pass
+                outcome = REVIEW_UNREVIEWED
+                break
+
+            async for event in reviewer.run_async(ctx):
+                yield event
+            outcome = review_outcome(self._parse_reviews(ctx))
+            last_review = outcome
+            logger.info(f"Re-review after pass {iterations}: {outcome}")
+
+        feature = current_feature(ctx.session.state)
+        report: Dict[str, Any] = dict(ctx.session.state.get(REFINEMENT_REPORT_KEY) or {})
+        report[feature] = {
+            "iterations": iterations,
+            "budget": budget,
+            "issue_counts": issue_counts,
+            "final_review": outcome,
+            "last_review": last_review,
+        }
+        logger.info(f"Refinement of '{feature}' used {iterations}/{budget} iterations, final review: {outcome}.")
+        yield Event(
+            actions=EventActions(state_delta={REFINEMENT_REPORT_KEY: report}),
+            author=self.name
+        )
@@ -5,16 +5,16 @@ This module defines the root agent for the Testcase generation application.
 It uses a sequential agent with an initial testcase generator followed by a refinement loop.
 """
 
-from google.adk.agents import LoopAgent, SequentialAgent
+from google.adk.agents import SequentialAgent
 
+from .RefinementLoopAgent import RefinementLoopAgent
 from .subagents.testcase_generator import initial_testcase_generator
 from .subagents.testcase_refiner import testcase_refiner
 from .subagents.testcase_reviewer import testcase_reviewer
 
-# Create the Refinement Loop Agent
-refinement_loop = LoopAgent(
+# Create the Refinement Loop Agent (iteration budget derived from the first review)
+refinement_loop = RefinementLoopAgent(
     name="TestcaseRefinementLoop",
-    max_iterations=1,
     sub_agents=[
         testcase_reviewer,
         testcase_refiner,
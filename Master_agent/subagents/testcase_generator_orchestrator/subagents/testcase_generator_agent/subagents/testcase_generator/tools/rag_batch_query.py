@@ -0,0 +1,65 @@
+"""
+Batched RAG query tool that fans several retrievals out concurrently.
+"""
+
+import asyncio
+from typing import Any, Dict, List
+
+from google.adk.tools.tool_context import ToolContext
+
+from .rag_query import rag_query_async
+
+
+async def rag_batch_query(
+    queries: List[Dict[str, Any]],
+    tool_context: ToolContext,
+) -> Dict[str, Any]:
+    """
+    Run several RAG queries concurrently and return their results in one response.
+
+    Use this instead of consecutive rag_query_async calls when more than one
+    retrieval is needed (for example requirements and compliance for the same
+    feature). The total wait equals the slowest single query.
+
+    Args:
+      queries: List of query items, each a dict of the form
+               {"corpora": ["<corpus display name>", ...], "query": "<query text>"}
+      tool_context: ADK ToolContext
+
+    Returns:
+      dict: status, message, results (one rag_query result per item, in the
+            same order as queries), results_count
+    """
+    if not queries:
+        return {
+            "status": "error",
+            "message": "No queries provided.",
+            "results": [],
+            "results_count": 0,
+        }
+
+    responses = await asyncio.gather(
+        *[
+            rag_query_async(
+                list(item.get("corpora") or []),
+                str(item.get("query") or ""),
+                tool_context,
+            )
+            for item in queries
+        ]
+    )
+
+    statuses = [response.get("status") for response in responses]
+    if all(status == "success" for status in statuses):
+        status = "success"
+    elif all(status == "error" for status in statuses):
+        status = "error"
+    else:
+        status = "warning"
+
+    return {
+        "status": status,
+        "message": f"Ran {len(responses)} queries; {statuses.count('success')} returned results.",
+        "results": responses,
+        "results_count": sum(response.get("results_count", 0) for response in responses),
+    }
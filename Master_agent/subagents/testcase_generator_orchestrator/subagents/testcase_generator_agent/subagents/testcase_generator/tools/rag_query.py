@@ -4,16 +4,146 @@ Multi-corpus RAG query tool for Vertex AI RAG Engine.
 Drop-in compatible with your existing patterns; adds support for multiple corpora.
 """
 
+import asyncio
 import logging
-from typing import List, Dict, Any
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
+
+from ........common.config import RAG_QUERY_TIMEOUT_SECONDS
+from ........common.executor import run_blocking
+from ........common.feature_context import lookup_feature_context, record_feature_context
+from ........common.retrieval import retrieve_contexts
+from .utils import corpus_exists, get_corpus_resource_name, remember_corpus
 
 DEFAULT_DISTANCE_THRESHOLD = 0.8
 DEFAULT_TOP_K = 5
 
-from .utils import check_corpus_exists, get_corpus_resource_name
+
+def _error_response(message: str, query: str, corpora: List[str]) -> Dict[str, Any]:
+    return {
+        "status": "error",
+        "message": message,
+        "query": query,
+        "corpora": corpora,
+        "results": [],
+        "results_count": 0,
+    }
+
+
+def _prepare_query(
+    corpora: List[str],
+    query: str,
+    tool_context: ToolContext,
+) -> Tuple[List[str], Optional[Dict[str, Any]], Set[str]]:
+    """
+    Reads what a query needs from session state.
+
+    Returns:
+        (corpora, response, known): the corpora to query (current_corpus if
+        none were given), a finished response if the query needs no retrieval
+        (no corpus, or served from the feature context), and the corpora
+        already known to exist
+    """
+    # Resolve default from state
+    if not corpora:
+        current = tool_context.state.get("current_corpus")
+        corpora = [current] if current else []
+
+    if not corpora:
+        return corpora, _error_response("No corpus specified and no current corpus set.", query, corpora), set()
+
+    # Serve repeated queries for the current feature from the shared context bundle
+    bundled = lookup_feature_context(tool_context.state, corpora, query)
+    if bundled is not None:
+        return corpora, {
+            "status": "success" if bundled else "warning",
+            "message": f"Served query for corpora {corpora} from the feature context.",
+            "query": query,
+            "corpora": corpora,
+            "invalid_corpora": [],
+            "results": bundled,
+            "results_count": len(bundled),
+        }, set()
+
+    known = {name for name in corpora if tool_context.state.get(f"corpus_exists_{name}")}
+    return corpora, None, known
+
+
+def _query_corpora(
+    corpora: List[str],
+    query: str,
+    known: Set[str],
+) -> Tuple[List[str], List[str], Optional[List[Dict[str, Any]]]]:
+    """
+    Validates the corpora and runs the retrieval; blocking, and touches no session state.
+
+    Returns:
+        (valid, invalid, results): results is None if no corpus is valid
+    """
+    # Validate and resolve resource names
+    valid_display_names: List[str] = []
+    resources: List[str] = []
+    invalid: List[str] = []
+
+    for name in corpora:
+        if name not in known and not corpus_exists(name):
+            invalid.append(name)
+            continue
+        valid_display_names.append(name)
+        resources.append(get_corpus_resource_name(name))
+
+    if not resources:
+        return valid_display_names, invalid, None
+
+    # Single retrieval across multiple corpora (served from the shared cache when warm)
+    results: List[Dict[str, Any]] = retrieve_contexts(
+        resources,
+        query,
+        top_k=DEFAULT_TOP_K,
+        vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD,
+    )
+    return valid_display_names, invalid, results
+
+
+def _finish_query(
+    tool_context: ToolContext,
+    corpora: List[str],
+    query: str,
+    valid_display_names: List[str],
+    invalid: List[str],
+    results: Optional[List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    """Writes a query's state updates and builds its response."""
+    for name in valid_display_names:
+        remember_corpus(name, tool_context)
+
+    if results is None:
+        return _error_response(f"No valid corpora found. Invalid: {invalid}", query, corpora)
+
+    # Record the retrieval so later agents working on this feature can reuse it
+    record_feature_context(tool_context.state, valid_display_names, query, results)
+
+    if not results:
+        return {
+            "status": "warning",
+            "message": f"No results found in corpora {valid_display_names} for query.",
+            "query": query,
+            "corpora": valid_display_names,
+            "invalid_corpora": invalid,
+            "results": [],
+            "results_count": 0,
+        }
+
+    return {
+        "status": "success",
+        "message": f"Successfully queried corpora {valid_display_names}.",
+        "query": query,
+        "corpora": valid_display_names,
+        "invalid_corpora": invalid,
+        "results": results,
+        "results_count": len(results),
+    }
 
 
 def rag_query(
@@ -33,99 +163,49 @@ def rag_query(
       dict: status, message, corpora, results, results_count
     """
     try:
-        # Resolve default from state
-        if not corpora:
-            current = tool_context.state.get("current_corpus")
-            corpora = [current] if current else []
-
-        if not corpora:
-            return {
-                "status": "error",
-                "message": "No corpus specified and no current corpus set.",
-                "query": query,
-                "corpora": corpora,
-                "results": [],
-                "results_count": 0,
-            }
-
-        # Validate and resolve resource names
-        valid_display_names: List[str] = []
-        resources: List[rag.RagResource] = []
-        invalid: List[str] = []
-
-        for name in corpora:
-            if not check_corpus_exists(name, tool_context):
-                invalid.append(name)
-                continue
-            rn = get_corpus_resource_name(name)
-            valid_display_names.append(name)
-            resources.append(rag.RagResource(rag_corpus=rn))
-
-        if not resources:
-            return {
-                "status": "error",
-                "message": f"No valid corpora found. Invalid: {invalid}",
-                "query": query,
-                "corpora": corpora,
-                "results": [],
-                "results_count": 0,
-            }
-            
-        rag_retrieval_config = rag.RagRetrievalConfig(
-            top_k=DEFAULT_TOP_K,
-            filter=rag.Filter(vector_distance_threshold=DEFAULT_DISTANCE_THRESHOLD),
-        )
+        corpora, response, known = _prepare_query(corpora, query, tool_context)
+        if response is not None:
+            return response
+        return _finish_query(tool_context, corpora, query, *_query_corpora(corpora, query, known))
 
-        # Single retrieval across multiple corpora
-        response = rag.retrieval_query(
-            rag_resources=resources,
-            text=query,
-            rag_retrieval_config=rag_retrieval_config,
-        )
+    except Exception as e:
+        logging.error("Multi-corpus query error: %s", e)
+        return _error_response(f"Error querying corpora: {str(e)}", query, corpora)
 
-        results: List[Dict[str, Any]] = []
-        # Adapt to observed response shape in your current code
-        # Prefer a robust parse that works if response.contexts is either a list or an object
-        ctxs = getattr(response, "contexts", None)
-        if ctxs:
-            # Try iterable of context objects
-            iterable = getattr(ctxs, "contexts", ctxs)
-            for ctx in iterable:
-                results.append({
-                    "source_uri": getattr(ctx, "source_uri", "") or "",
-                    "source_name": getattr(ctx, "source_display_name", "") or "",
-                    "text": getattr(ctx, "text", "") or "",
-                    "score": getattr(ctx, "score", 0.0) or 0.0,
-                })
-
-        if not results:
-            return {
-                "status": "warning",
-                "message": f"No results found in corpora {valid_display_names} for query.",
-                "query": query,
-                "corpora": valid_display_names,
-                "invalid_corpora": invalid,
-                "results": [],
-                "results_count": 0,
-            }
 
-        return {
-            "status": "success",
-            "message": f"Successfully queried corpora {valid_display_names}.",
-            "query": query,
-            "corpora": valid_display_names,
-            "invalid_corpora": invalid,
-            "results": results,
-            "results_count": len(results),
-        }
+async def rag_query_async(
+    corpora: List[str],  # display names; may be empty to use current_corpus
+    query: str,
+    tool_context: ToolContext,
+) -> Dict[str, Any]:
+    """
+    Query one or more Vertex AI RAG corpora without blocking the event loop.
 
+    Same behaviour and result shape as rag_query. Only the blocking corpus
+    validation and retrieval run on the shared worker pool; session state is
+    read and written on the event loop, so a query abandoned after
+    RAG_QUERY_TIMEOUT_SECONDS cannot change state once the tool has returned.
+
+    Args:
+      corpora: List of corpus display names. If empty, uses tool_context.state["current_corpus"].
+      query: User query text
+      tool_context: ADK ToolContext
+
+    Returns:
+      dict: status, message, corpora, results, results_count
+    """
+    try:
+        corpora, response, known = _prepare_query(corpora, query, tool_context)
+        if response is not None:
+            return response
+        outcome = await run_blocking(
+            _query_corpora, corpora, query, known, timeout=RAG_QUERY_TIMEOUT_SECONDS
+        )
+        return _finish_query(tool_context, corpora, query, *outcome)
+
+    except asyncio.TimeoutError:
+        logging.error("Multi-corpus query timed out after %ss", RAG_QUERY_TIMEOUT_SECONDS)
+        return _error_response(f"Query timed out after {RAG_QUERY_TIMEOUT_SECONDS} seconds.", query, corpora)
     except Exception as e:
         logging.error("Multi-corpus query error: %s", e)
-        return {
-            "status": "error",
-            "message": f"Error querying corpora: {str(e)}",
-            "query": query,
-            "corpora": corpora,
-            "results": [],
-            "results_count": 0,
-        }
+        return _error_response(f"Error querying corpora: {str(e)}", query, corpora)
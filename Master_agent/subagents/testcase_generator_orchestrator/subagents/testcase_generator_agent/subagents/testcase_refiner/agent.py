@@ -4,101 +4,362 @@ Testcase Refiner Agent
 This agent refines Testcase based on review feedback.
 """
 
+import json
+import logging
+from typing import Dict, Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
+from google.genai import types
+
+from .......common.config import REFINEMENT_MODE
+from .......common.feature_context import feature_context_instruction
+from .......common.review_table import (
+    REVIEW_APPROVED,
+    REVIEW_GENERATION_FAILURE,
+    parse_review_table,
+    review_outcome,
+    split_review_items,
+)
+from .......common.testcase_patch import PatchError, SuitePatch, apply_patch_to_suite, load_patch
+from .......common.testcase_suite import (
+    SUITE_NOT_GENERATED,
+    StructuredSuite,
+    StructuredTestcase,
+    load_suite,
+    not_generated_suite,
+)
 
 # Constants
 GEMINI_MODEL = "gemini-2.0-flash"
+NO_TESTCASES_MESSAGE = "Test cases cannot be generated due to insufficient information."
+CURRENT_TESTCASES_JSON_KEY = "current_testcases_json"
+REFINEMENT_TARGETS_KEY = "refinement_targets"
+REFINEMENT_PATCH_KEY = "refinement_patch"
+
+logger = logging.getLogger(__name__)
+
+
+def skip_refinement_if_not_needed(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Skips the refiner's model call when the review leaves nothing to refine.
+
+    Reads `testcase_reviews` with the deterministic review-table parser:
+    - Approval only: current_testcases is kept as is.
+    - Generation Failure: current_testcases is set to a not_generated suite
+      with NO_TESTCASES_MESSAGE, as the refiner's "Cannot Generate Test Cases"
+      rule would.
+
+    Returns:
+        Content to end the agent without calling the model, or None to refine
+    """
+    reviews = parse_review_table(callback_context.state.get("testcase_reviews") or "")
+    outcome = review_outcome(reviews)
+
+    if outcome == REVIEW_APPROVED:
+        logger.info("Review approved the test cases; skipping refinement.")
+        message = "Review approved the test cases; no refinement needed."
+    elif outcome == REVIEW_GENERATION_FAILURE:
+        logger.info("Review reported a generation failure; skipping refinement.")
+        callback_context.state["current_testcases"] = not_generated_suite(NO_TESTCASES_MESSAGE)
+        message = NO_TESTCASES_MESSAGE
+    else:
+        return None
+
+    return types.Content(role="model", parts=[types.Part(text=message)])
+
+
+def _review_line(row: Dict[str, str]) -> str:
+    return f"{row['issue_category']}: {row.get('comment', '')} Recommendation: {row.get('recommendation', '')}"
+
+
+def format_refinement_targets(suite: StructuredSuite, testcase_reviews: str) -> str:
+    """
+    Render what the targeted refiner needs to see: the flagged test cases in
+    full with their review items, the new-coverage items, and, when new test
+    cases are requested, a one-line list of the other test cases so they are
+    not duplicated.
+    """
+    testcases = sorted(suite.testcases, key=lambda testcase: testcase.sr_no)
+    # Reviews name test cases by sr_no, which need not match their position
+    by_sr_no: Dict[int, StructuredTestcase] = {}
+    for testcase in testcases:
+        by_sr_no.setdefault(testcase.sr_no, testcase)
+    reviews = parse_review_table(testcase_reviews)
+    targeted, coverage = split_review_items(reviews, by_sr_no)
+
+    lines = [
+        f"**Suite:** {suite.title} ({len(testcases)} test cases)",
+        f"**Applied compliance rules:** {', '.join(suite.applied_compliance_rules) or 'none'}",
+        "",
+        "### Flagged Test Cases",
+    ]
+    for number, rows in targeted.items():
+        testcase = by_sr_no[number]
+        lines += [
+            f"#### Test case {number}",
+            f"- Description: {testcase.description}",
+            f"- Expected result: {testcase.expected_result}",
+            f"- Compliance IDs: {', '.join(testcase.compliance_ids) or 'none'}",
+            f"- Traceability tags: {', '.join(testcase.traceability_tags) or 'none'}",
+            "- Review items:",
+        ]
+        lines += [f"  - {_review_line(row)}" for row in rows]
+    if not targeted:
+        lines.append("None")
+
+    lines += ["", "### New Coverage Items"]
+    if reviews is None:
+        # The review could not be parsed; pass it on as is
+        lines.append(testcase_reviews)
+    else:
+        lines += [f"- {_review_line(row)}" for row in coverage] or ["None"]
+
+    if coverage or reviews is None:
+        lines += ["", "### Other Test Cases (context only)"]
+        lines += [
+            f"- {testcase.sr_no}. {testcase.description}"
+            for testcase in testcases
+            if testcase.sr_no not in targeted
+        ]
+    return "\n".join(lines)
+
+
+def prepare_full_refinement(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Skips the model call like skip_refinement_if_not_needed; otherwise writes
+    current_testcases as JSON for the full refiner to read.
+    """
+    content = skip_refinement_if_not_needed(callback_context)
+    if content is not None:
+        return content
+
+    callback_context.state[CURRENT_TESTCASES_JSON_KEY] = json.dumps(
+        callback_context.state.get("current_testcases"), indent=1
+    )
+    return None
+
+
+def prepare_targeted_refinement(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Skips the model call like skip_refinement_if_not_needed; otherwise writes
+    refinement_targets for the targeted refiner and clears the previous
+    pass's refinement_patch.
+    """
+    content = skip_refinement_if_not_needed(callback_context)
+    if content is not None:
+        return content
+
+    suite = load_suite(callback_context.state.get("current_testcases"))
+    if suite is None or not suite.testcases:
+        logger.info("No structured test cases to refine; skipping refinement.")
+        return types.Content(role="model", parts=[types.Part(text="No test cases to refine.")])
+
+    callback_context.state[REFINEMENT_TARGETS_KEY] = format_refinement_targets(
+        suite, callback_context.state.get("testcase_reviews") or ""
+    )
+    callback_context.state[REFINEMENT_PATCH_KEY] = None
+    return None
+
+
+def merge_refinement_patch(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Applies the targeted refiner's edits to current_testcases and renumbers
+    the test cases. A patch that does not fit the suite leaves it unchanged,
+    so the next review sees the unrefined suite.
+    """
+    patch = load_patch(callback_context.state.get(REFINEMENT_PATCH_KEY))
+    suite = load_suite(callback_context.state.get("current_testcases"))
+    if patch is None or suite is None:
+        return None
 
-# Define the Testcase Refiner Agent
-testcase_refiner = LlmAgent(
-    name="TestcaseRefinerAgent",
-    model=GEMINI_MODEL,
-    instruction="""
+    if patch.status == SUITE_NOT_GENERATED:
+        callback_context.state["current_testcases"] = not_generated_suite(NO_TESTCASES_MESSAGE)
+        return None
+    try:
+        refined = apply_patch_to_suite(suite, patch)
+    except PatchError as e:
+        logger.warning(f"Discarding refinement edits that do not fit the suite: {e}")
+        return None
+    logger.info(
+        f"Merged {len(patch.edits)} refinement edits: "
+        f"{len(suite.testcases)} -> {len(refined.testcases)} test cases."
+    )
+    callback_context.state["current_testcases"] = refined.model_dump()
+    return None
+
+
+def build_full_testcase_refiner() -> LlmAgent:
+    """Build the Testcase Refiner Agent that rewrites the whole suite."""
+    return LlmAgent(
+        name="TestcaseRefinerAgent",
+        model=GEMINI_MODEL,
+        instruction=feature_context_instruction("""
 You are a meticulous Test Case Refiner Agent. Your responsibility is to refine and update an existing set of test cases based on structured review feedback. You must read the test cases from the shared state variable `current_testcases` and the reviews from `testcase_reviews`, apply all valid recommendations, and write the fully updated test suite back to `current_testcases`.
 
 ## INPUTS
 **Current Testcase:**
-`{current_testcases}`
+`{current_testcases_json}`
 
 **Review Feedback:**
 `{testcase_reviews}`
 
+**Retrieved Feature Context:**
+`{feature_context?}`
+
 ### Inputs and Outputs
 *   **Input (read-only)**:
-    *   `current_testcases`: Markdown table with exactly three columns: `Sr.No`, `Test Description`, `Expected Result`.
+    *   `current_testcases`: Structured test suite. Each entry of `testcases` has `sr_no`, `description`, `expected_result`, `compliance_ids` and `traceability_tags`; `applied_compliance_rules` lists the rules applied across the suite.
     *   `testcase_reviews`: Markdown table with four columns: `TestCaseID`, `IssueCategory`, `Comment`, `Recommendation`.
+    *   `feature_context`: Requirements and compliance search results already retrieved for this feature by the generator and reviewer.
 *   **Output (write-only)**:
-    *   `current_testcases`: The fully refined Markdown table containing the updated test suite.
+    *   `current_testcases`: The fully refined test suite, in the same structure.
 
 ### Special Case: Cannot Generate Test Cases
 **CRITICAL**: If either `testcase_reviews` or `current_testcases` explicitly indicates that test cases cannot be generated (due to insufficient requirements, missing documentation, unclear specifications, or any blocking issue), you MUST:
-1. Set `current_testcases` to contain ONLY the following message: "Test cases cannot be generated due to insufficient information."
+1. Return a suite with `status` "not_generated" and ONLY the following `message`: "Test cases cannot be generated due to insufficient information."
 2. Do NOT attempt any refinement process.
-3. Do NOT add any test case table, compliance rules, or additional explanatory text.
-4. Immediately terminate processing after writing this message to `current_testcases`.
+3. Do NOT add any test cases or compliance rules.
+4. Immediately terminate processing after writing this suite to `current_testcases`.
 
 ### Operational Workflow
 1.  **Load Inputs**:
-    *   Parse the `current_testcases` table into an ordered list keyed by `Sr.No` (integers).
+    *   Read the `testcases` of `current_testcases` as an ordered list keyed by `sr_no`.
     *   Parse the `testcase_reviews` table into a list of review items keyed by `TestCaseID`; allow `TestCaseID` to be "N/A" for new coverage items.
 
 2.  **Normalize and Map**:
-    *   Build a lookup map: `Sr.No` → `{description, expected_result}`.
+    *   Build a lookup map: `sr_no` → `{description, expected_result}`.
     *   Build a review index grouped by `IssueCategory`: `Coverage Gap`, `Compliance Gap`, `Incorrectness`, `Lack of Clarity`, `Incompleteness`, `Redundancy`, and any additional categories encountered.
 
 3.  **Enrich Context When Needed**:
-    *   If a review's `Recommendation` or `Comment` references requirements or compliance details that are not explicit, use your retrieval capability to query the **Requirements** and **Compliance** corpora to clarify specifics. During this process, maintain a collection of all compliance rules that are identified and applied.
-    *   Do not add new fields; embed traceability references inline in `Test Description` using bracketed tags (for example: `[REQ-123]`, `[COMP-PII-07]`).
+    *   If a review's `Recommendation` or `Comment` references requirements or compliance details that are not explicit, look them up in the `feature_context` search results to clarify specifics. During this process, maintain a collection of all compliance rules that are identified and applied.
+    *   Do not add new fields; record traceability references in the test case's `traceability_tags` (for example: `REQ-123`, `COMP-PII-07`).
 
 4.  **Apply Review Categories Deterministically**:
-    *   **Incorrectness**: Update the affected test case to align with the `Recommendation` and source requirements/compliance. Ensure `Expected Result` states precise, verifiable outcomes.
-    *   **Lack of Clarity**: Rewrite `Test Description` and `Expected Result` to be specific, measurable, and unambiguous. Include preconditions, action, and main input in `Test Description`.
+    *   **Incorrectness**: Update the affected test case to align with the `Recommendation` and source requirements/compliance. Ensure `expected_result` states precise, verifiable outcomes.
+    *   **Lack of Clarity**: Rewrite `description` and `expected_result` to be specific, measurable, and unambiguous. Include preconditions, action, and main input in `description`.
     *   **Coverage Gap** (`TestCaseID` = "N/A" or missing): Create new test cases that address every uncovered requirement or scenario described. Add at least one positive, one negative, and, where applicable, boundary case per identified gap.
-    *   **Compliance Gap**: Add explicit tests to verify each mandated rule (masking, retention, consent, encryption, etc.). Include traceability tags like `[COMP-...]` in `Test Description`. Ensure every rule identified here is added to the collection of applied compliance rules for the final output.
+    *   **Compliance Gap**: Add explicit tests to verify each mandated rule (masking, retention, consent, encryption, etc.). Include traceability tags like `COMP-...` in `traceability_tags`. Ensure every rule identified here is added to the collection of applied compliance rules for the final output.
     *   **Incompleteness**: Add missing negative, boundary, and error-path cases.
     *   **Redundancy**: Merge or remove duplicates. Keep the most precise version.
+    *   **Schema Violation**: Fill in empty descriptions or expected results (or remove test cases that have no purpose) and renumber `sr_no` sequentially from 1.
     *   **Conflicting Reviews**: Resolve conflicts with the following precedence: **Compliance** > **Requirement** > **Existing Test**. If ambiguous, choose the interpretation that maximizes safety and compliance.
 
 5.  **Refinement Rules and Quality Gates**:
-    *   Do not change the three-column schema.
+    *   Do not change the test suite schema.
     *   Keep each row atomic: one clear purpose per test.
     *   Use consistent terminology from the requirements.
     *   Avoid vague words; replace with observable outcomes. Quote exact messages or UI labels.
     *   For data privacy, use masked or synthetic placeholders.
-    *   Add inline traceability tags in `Test Description` for requirements and compliance (e.g., `[REQ-45.2]`, `[COMP-GDPR-RTBF]`). The corresponding compliance rules for these tags must be listed in the final output.
+    *   Add traceability tags to `traceability_tags` for requirements and compliance (e.g., `REQ-45.2`, `COMP-GDPR-RTBF`). The corresponding compliance rules for these tags must be listed in `applied_compliance_rules`.
     *   Ensure every compliance rule and requirement referenced in reviews has at least one explicit test case after refinement.
 
 6.  **Reordering, Renumbering, and Consistency**:
     *   Preserve original order where practical; append new cases.
-    *   After all changes, renumber `Sr.No` sequentially starting at 1.
+    *   After all changes, renumber `sr_no` sequentially starting at 1.
     *   Ensure there are no duplicate or empty rows.
 
 7.  **Final Validation Checklist**:
     *   No remaining unaddressed items from `testcase_reviews`.
     *   All `Coverage Gap` and `Compliance Gap` items resulted in new or updated tests.
     *   All `Redundancy` items resolved.
-    *   All rows comply with the three-column schema and atomicity rule.
+    *   All test cases comply with the schema and atomicity rule.
     *   Traceability tags and the list of applied compliance rules are complete.
 
 8.  **Write Output and Format Response**:
-    *   Overwrite the shared state `current_testcases` with the final, refined Markdown table.
+    *   Overwrite the shared state `current_testcases` with the final, refined test suite.
     *   Assemble your final response according to the `Final Output Structure` rules below.
 
 ### Final Output Structure
 
-Your final response must be structured as follows. Do not include any other text, introductions, or summaries.
+Your response is constrained to the test suite schema. Do not add any text outside it.
 
-1.  The refined Markdown table containing the test cases.
+*   `status`: "generated"
+*   `title`: The suite's title, unchanged unless the refinement changes its scope.
+*   `testcases`: The refined test cases, numbered with `sr_no` from 1.
+*   `applied_compliance_rules`: All compliance rules applied or verified during the refinement process.
+"""
+    ),
+        description="Refines Testcase based on feedback to improve quality",
+        before_agent_callback=prepare_full_refinement,
+        output_key="current_testcases",
+        output_schema=StructuredSuite,
+    )
 
-| Sr.No | Test Description | Expected Result |
-| :---- | :--------------- | :-------------- |
-| 1.    | ...              | ...             |
-| 2.    | ...              | ...             |
-| n.    | ...              | ...             |
 
-2.  A Markdown list of all compliance rules applied or verified during the refinement process, presented under the header `### Applied Compliance Rules`.
-"""
-,
-    description="Refines Testcase based on feedback to improve quality",
-    output_key="current_testcases",
-)
+def build_targeted_testcase_refiner() -> LlmAgent:
+    """Build the Testcase Refiner Agent that only edits the test cases the review flagged."""
+    return LlmAgent(
+        name="TestcaseRefinerAgent",
+        model=GEMINI_MODEL,
+        instruction=feature_context_instruction("""
+You are a meticulous Test Case Refiner Agent. Your responsibility is to apply structured review feedback to an existing test suite by returning a list of edits. You only see the test cases the review flagged and the review items that ask for new coverage; every test case you do not edit is kept as is, and your edits are merged into the suite and renumbered automatically.
+
+## INPUTS
+**Refinement Targets:**
+{refinement_targets?}
+
+**Retrieved Feature Context:**
+`{feature_context?}`
+
+### Inputs and Outputs
+*   **Input (read-only)**:
+    *   `refinement_targets`: The suite's title and applied compliance rules; each flagged test case (by its number) with its description, expected result, compliance IDs, traceability tags and review items; the new-coverage review items; and, when new test cases are needed, a one-line list of the other test cases so you do not duplicate them.
+    *   `feature_context`: Requirements and compliance search results already retrieved for this feature by the generator and reviewer.
+*   **Output**: The edit list described under Final Output Structure.
+
+### Special Case: Cannot Generate Test Cases
+**CRITICAL**: If the review items explicitly indicate that test cases cannot be generated (due to insufficient requirements, missing documentation, unclear specifications, or any blocking issue), you MUST return `status` "not_generated" with ONLY the following `message`: "Test cases cannot be generated due to insufficient information." and no edits.
+
+### Operational Workflow
+1.  **Enrich Context When Needed**: If a review's recommendation or comment references requirements or compliance details that are not explicit, look them up in the `feature_context` search results. Record traceability references in `traceability_tags` (for example: `REQ-123`, `COMP-PII-07`).
+
+2.  **Apply Review Categories**:
+    *   **Incorrectness**: `update` the flagged test case to align with the recommendation and source requirements/compliance, with a precise, verifiable `expected_result`.
+    *   **Lack of Clarity**: `update` the `description` and `expected_result` to be specific, measurable, and unambiguous. Include preconditions, action, and main input in `description`.
+    *   **Coverage Gap** (new-coverage items): `insert_after` new test cases that address every uncovered requirement or scenario described; at least one positive, one negative, and, where applicable, boundary case per gap.
+    *   **Compliance Gap**: `insert_after` explicit tests (or `update` the flagged one) to verify each mandated rule, with `compliance_ids` and `COMP-...` traceability tags; use `add_compliance` when an existing test case already verifies the rule.
+    *   **Incompleteness**: `insert_after` the missing negative, boundary, and error-path cases.
+    *   **Redundancy**: `delete` the duplicates and keep the most precise version, updating it if needed.
+    *   **Schema Violation**: `update` the flagged test case to fill in its empty field, or `delete` it if it has no purpose. Numbering is corrected automatically when your edits are merged, so a numbering finding needs no edit.
+    *   **Conflicting Reviews**: Resolve conflicts with the following precedence: **Compliance** > **Requirement** > **Existing Test**.
+
+3.  **Quality Gates**:
+    *   Keep each test case atomic: one clear purpose per test.
+    *   Use consistent terminology from the requirements; avoid vague words and quote exact messages or UI labels.
+    *   For data privacy, use masked or synthetic placeholders.
+    *   Address every review item; do not edit test cases that no review item concerns.
+
+### Final Output Structure
+
+Your response is constrained to the test suite patch schema. Return ONLY the edits. Do not add any text outside it.
+
+*   `status`: "generated"
+*   `testcase_id`: Leave empty.
+*   `title`: Leave empty unless the refinement changes the suite's scope.
+*   `edits`: The changes, in order. `row` is always the test case number shown in the Refinement Targets:
+    *   `{"op": "update", "row": N, ...}`: New `description` and/or `expected_result` for test case N (an empty field keeps the current text), plus `compliance_ids` and `traceability_tags` to add.
+    *   `{"op": "insert_after", "row": N, ...}`: A new test case after test case N (0: at the top; use the last test case number to append) with `description`, `expected_result`, `compliance_ids` and `traceability_tags`.
+    *   `{"op": "delete", "row": N}`: Removes test case N.
+    *   `{"op": "add_compliance", "row": N, "compliance_ids": [...]}`: Records compliance rules verified by test case N.
+*   `applied_compliance_rules`: All compliance rules applied or verified by your edits.
+    """),
+        description="Refines the Testcase rows flagged by the review and adds the requested coverage",
+        before_agent_callback=prepare_targeted_refinement,
+        after_agent_callback=merge_refinement_patch,
+        output_key=REFINEMENT_PATCH_KEY,
+        output_schema=SuitePatch,
+    )
+
+def build_testcase_refiner(mode: str = REFINEMENT_MODE) -> LlmAgent:
+    """
+    Build the refiner for the given REFINEMENT_MODE: "full" rewrites the whole
+    suite; any other mode sends only the flagged rows and new-coverage items to
+    the model and merges its edits locally.
+    """
+    if mode == "full":
+        return build_full_testcase_refiner()
+    return build_targeted_testcase_refiner()
+
+
+testcase_refiner = build_testcase_refiner()
@@ -0,0 +1,147 @@
+import asyncio
+import logging
+from typing import AsyncGenerator, Any, Dict, List, Optional, Tuple
+from typing_extensions import override
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.genai import types
+
+from .......common.review_table import merge_review_outputs, parse_review_table, render_review_table
+from .......common.testcase_linter import lint_coverage, lint_suite
+from .......common.testcase_suite import SUITE_GENERATED, StructuredSuite, load_suite
+
+REVIEW_CHUNK_KEY = "review_chunk"
+LINT_REVIEWS_KEY = "lint_reviews"
+LINT_ADVISORIES_KEY = "lint_advisories"
+
+
+def format_review_chunk(suite: StructuredSuite, start: int, end: int) -> str:
+    """
+    Render rows start..end-1 of a suite for a row-level review.
+
+    The test cases keep their sr_no, so the chunk's findings use the
+    suite's row IDs.
+    """
+    chunk = suite.model_copy(update={"testcases": suite.testcases[start:end]})
+    return (
+        f"Test cases {start + 1}-{end} of {len(suite.testcases)} in the suite "
+        f"'{suite.title}':\n{chunk.model_dump_json(indent=1)}"
+    )
+
+
+class ChunkedReviewerAgent(BaseAgent):
+    """
+    An ADK agent that reviews large test suites in parallel chunks.
+
+    sub_agents must be [full_reviewer, row_reviewer, suite_reviewer]. Suites
+    of at most chunk_rows test cases (and generation failures) are reviewed
+    by full_reviewer as before. Larger suites are split into chunks of
+    chunk_rows rows, each reviewed by row_reviewer (review_chunk) for
+    row-level issues, while suite_reviewer checks the whole suite for
+    coverage, compliance gaps and redundancy; at most max_concurrency reviews
+    run at a time. Every review runs against its own copy of the session,
+    and the tables are merged, after the local linter's findings for the
+    whole suite (lint_reviews), into a single testcase_reviews with the
+    suite's row IDs. The linter's advisory coverage rows are added only if
+    the merged review has other issues.
+    """
+
+    chunk_rows: int = 20
+    max_concurrency: int = 4
+
+    def __init__(self, name: str = "ChunkedTestcaseReviewer", **kwargs):
+        """Initializes the agent."""
+        super().__init__(name=name, **kwargs)
+
+    async def _review(
+        self,
+        ctx: InvocationContext,
+        reviewer: BaseAgent,
+        label: str,
+        extra_state: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+    ) -> str:
+        """
+        Runs one reviewer in an isolated session copy.
+
+        Returns:
+            Its testcase_reviews output
+        """
+        review_state = dict(ctx.session.state)
+        review_state.update(extra_state)
+        review_state["testcase_reviews"] = ""
+        review_session = ctx.session.model_copy(
+            update={
+                "id": f"{ctx.session.id}:{label}",
+                "state": review_state,
+                "events": list(ctx.session.events),
+            }
+        )
+        review_ctx = ctx.model_copy(update={"session": review_session})
+
+        async with semaphore:
+            async for event in reviewer.run_async(review_ctx):
+                # Stand in for the session service: keep the copy's history and state current
+                review_session.events.append(event)
+                for key, value in (event.actions.state_delta or {}).items():
+                    review_session.state[key] = value
+        return review_session.state.get("testcase_reviews") or ""
+
+    @override
+    async def _run_async_impl(
+        self, ctx: InvocationContext
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Reviews current_testcases in one pass or in chunks, depending on its size.
+        """
+        logger = logging.getLogger(self.name)
+        full_reviewer, row_reviewer, suite_reviewer = self.sub_agents
+
+        suite: Optional[StructuredSuite] = load_suite(ctx.session.state.get("current_testcases"))
+        chunk_rows = self.chunk_rows
+        if (
+            chunk_rows <= 0
+            or suite is None
+            or suite.status != SUITE_GENERATED
+            or len(suite.testcases) <= chunk_rows
+        ):
+            async for event in full_reviewer.run_async(ctx):
+                yield event
+            return
+
+        count = len(suite.testcases)
+        chunks: List[Tuple[int, int]] = [
+            (start, min(start + chunk_rows, count)) for start in range(0, count, chunk_rows)
+        ]
+        logger.info(f"Reviewing {count} test cases in {len(chunks)} chunks of up to {chunk_rows} rows.")
+
+        lint_reviews = lint_suite(suite)
+        lint_table = render_review_table(lint_reviews) if lint_reviews else ""
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+        outputs = await asyncio.gather(
+            self._review(ctx, suite_reviewer, "review-suite", {LINT_REVIEWS_KEY: lint_table}, semaphore),
+            *[
+                self._review(
+                    ctx,
+                    row_reviewer,
+                    f"review-rows-{start + 1}",
+                    {REVIEW_CHUNK_KEY: format_review_chunk(suite, start, end), LINT_REVIEWS_KEY: lint_table},
+                    semaphore,
+                )
+                for start, end in chunks
+            ],
+        )
+        for output in outputs:
+            if parse_review_table(output) is None:
+                logger.warning(f"Partial review without a review table: {output[:200]!r}")
+
+        # Linter findings, then row-level findings in row order, then the suite-level ones
+        testcase_reviews = merge_review_outputs([*outputs[1:], outputs[0]], lint_reviews, lint_coverage(suite))
+
+        yield Event(
+            content=types.Content(role="model", parts=[types.Part(text=testcase_reviews)]),
+            actions=EventActions(state_delta={"testcase_reviews": testcase_reviews}),
+            author=self.name
+        )
@@ -1,7 +1,8 @@
 """
-LinkedIn Post Reviewer Agent Package
+Testcase Reviewer Agent Package
 
-This package provides an agent for reviewing and validating LinkedIn posts.
+This package provides the agents that review generated test cases against the
+requirements and compliance corpora.
 """
 
 from .agent import testcase_reviewer
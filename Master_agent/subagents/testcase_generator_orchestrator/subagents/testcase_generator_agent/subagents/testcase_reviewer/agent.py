@@ -4,19 +4,87 @@ Testcase Reviewer Agent
 This agent reviews Testcase for quality and provides feedback.
 """
 
+import logging
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import LlmAgent
+from google.genai import types
 
-from .tools.rag_query import rag_query
-from .tools.exit_loop import exit_loop
+from .......common.config import REVIEW_CHUNK_ROWS, REVIEW_MAX_CONCURRENCY
+from .......common.feature_context import feature_context_instruction
+from .......common.review_table import (
+    REVIEW_GENERATION_FAILURE,
+    merge_review_outputs,
+    parse_review_table,
+    render_review_table,
+    review_outcome,
+)
+from .......common.testcase_linter import lint_coverage, lint_suite
+from .......common.testcase_suite import load_suite
+from .ChunkedReviewerAgent import LINT_ADVISORIES_KEY, LINT_REVIEWS_KEY, ChunkedReviewerAgent
+from .tools.rag_batch_query import rag_batch_query
+from .tools.rag_query import rag_query_async
 
 # Constants
 GEMINI_MODEL = "gemini-2.0-flash"
 
+logger = logging.getLogger(__name__)
+
+
+def lint_before_review(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    Runs the local linter over current_testcases before the reviewer's model call.
+
+    - Findings are stored in `lint_reviews`, where the prompt lists them, and
+      merged into testcase_reviews by merge_lint_reviews.
+    - Advisory coverage rows (lint_coverage) are stored in `lint_advisories`
+      and only merged if the review has other issues.
+    - No test cases: the Generation Failure table is written without a model call.
+    - Test cases not in the structured format are left to the model.
+
+    Returns:
+        Content to end the agent without calling the model, or None to review
+    """
+    state = callback_context.state
+    value = state.get("current_testcases")
+    suite = load_suite(value)
+    if value and suite is None:
+        state[LINT_REVIEWS_KEY] = ""
+        state[LINT_ADVISORIES_KEY] = ""
+        return None
+
+    lint_reviews = lint_suite(suite)
+    if review_outcome(lint_reviews) == REVIEW_GENERATION_FAILURE:
+        logger.info("No test cases to review; reporting a generation failure without a model call.")
+        testcase_reviews = render_review_table(lint_reviews)
+        state["testcase_reviews"] = testcase_reviews
+        state[LINT_REVIEWS_KEY] = ""
+        state[LINT_ADVISORIES_KEY] = ""
+        return types.Content(role="model", parts=[types.Part(text=testcase_reviews)])
+
+    state[LINT_REVIEWS_KEY] = render_review_table(lint_reviews) if lint_reviews else ""
+    advisories = lint_coverage(suite)
+    state[LINT_ADVISORIES_KEY] = render_review_table(advisories) if advisories else ""
+    return None
+
+
+def merge_lint_reviews(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Merges the linter's findings into the reviewer's testcase_reviews table."""
+    state = callback_context.state
+    lint_reviews = parse_review_table(state.get(LINT_REVIEWS_KEY) or "")
+    advisories = parse_review_table(state.get(LINT_ADVISORIES_KEY) or "")
+    if lint_reviews or advisories:
+        state["testcase_reviews"] = merge_review_outputs(
+            [state.get("testcase_reviews") or ""], lint_reviews, advisories
+        )
+    return None
+
 # Define the Testcase Reviewer Agent
-testcase_reviewer = LlmAgent(
+full_testcase_reviewer = LlmAgent(
     name="TestcaseReviewer",
     model=GEMINI_MODEL,
-    instruction="""
+    instruction=feature_context_instruction("""
 ***
 
 You are an expert Test Case Reviewer Agent. Your primary function is to meticulously audit a set of test cases provided by a preceding agent. You must validate these test cases against the `requirements` and `compliance` corpora to ensure accuracy, completeness, and adherence to standards.
@@ -26,34 +94,33 @@ You operate as a specialized agent within a larger workflow managed by a parent
 
 ## Operational Workflow
 ### Ingest and Validate Input
-*   Load the content from the `current_testcases` state variable.
-*   **Check for Generation Failure**: Analyze the loaded content. If it is a simple string message indicating an error (e.g., "insufficient information," "feature not present") and not a structured test case table, you must skip the review. In this case, your output must be a review table with a single entry detailing the failure. Then, halt all further steps.
-*   **Analyze Test Cases**: If the input is a valid test case table, analyze the `Test Description` column across all loaded test cases to identify the primary feature or system component being tested. This "feature context" is essential for your subsequent queries.
-
-### Retrieve Source Requirements
-*   Based on the identified feature context, formulate a precise query to fetch the original specifications.
-*   Use the `rag_query` tool to search the `requirements` corpus.
-*   An example tool call is: `rag_query(corpora=['requirements'], query='Full requirements and acceptance criteria for <identified_feature_name>')`.
+*   Load the structured test suite from the `current_testcases` state variable. Each entry of `testcases` has a `sr_no`, `description`, `expected_result`, `compliance_ids` and `traceability_tags`; `applied_compliance_rules` lists the rules applied across the suite.
+*   **Check for Generation Failure**: If `status` is "not_generated" (its `message` gives the reason, e.g. "insufficient information," "feature not present") or `testcases` is empty, you must skip the review. In this case, your output must be a review table with a single entry detailing the failure. Then, halt all further steps.
+*   **Local Linter Findings**: Mechanical checks have already been run; their findings are listed under **Local Linter Findings** below and are added to your review automatically. Do not report them again.
+*   **Analyze Test Cases**: Otherwise, analyze the `description` of all loaded test cases to identify the primary feature or system component being tested. This "feature context" is essential for your subsequent queries. Use each test case's `sr_no` as its `TestCaseID` in your findings.
 
-### Retrieve Compliance Mandates
-*   Using the same feature context, formulate a query to find all applicable regulations.
-*   Use the `rag_query` tool to search the `compliance` corpus.
-*   An example tool call is: `rag_query(corpora=['compliance'], query='All compliance rules and data handling policies for <identified_feature_name_or_domain>')`.
+### Retrieve Source Requirements and Compliance Mandates
+*   First use the requirements and compliance retrievals already made for this feature, listed under **Retrieved Feature Context** below. Do not repeat a search that is already listed there.
+*   Only if that context is empty or does not cover something you need to verify, formulate a precise query to fetch the original specifications and/or a query to find all applicable regulations.
+*   Use the `rag_batch_query` tool to search the `requirements` and `compliance` corpora in a single call.
+*   An example tool call is: `rag_batch_query(queries=[{'corpora': ['requirements'], 'query': 'Full requirements and acceptance criteria for <identified_feature_name>'}, {'corpora': ['compliance'], 'query': 'All compliance rules and data handling policies for <identified_feature_name_or_domain>'}])`.
+*   Use the `rag_query_async` tool only for follow-up searches.
 
 ### Conduct a Multi-point Review
-*   Cross-reference the `current_testcases` against the data retrieved from your `rag_query` calls.
+*   Cross-reference the `current_testcases` against the retrieved feature context and any data retrieved from your own `rag_batch_query` and `rag_query_async` calls.
 *   Systematically check for the following issues:
     *   **Coverage Gaps**: Identify any requirements from the `requirements` corpus that are not covered by at least one test case.
     *   **Compliance Gaps**: Find any compliance rules from the `compliance` corpus that are not being explicitly validated by a test case.
-    *   **Incorrectness**: Flag test cases where the `Expected Result` contradicts the documented requirements or compliance rules.
-    *   **Lack of Clarity**: Identify test cases where the `Test Description` is ambiguous or the `Expected Result` is not specific, measurable, or verifiable.
-    *   **Incompleteness**: Note where the test suite lacks crucial scenarios (e.g., missing negative tests, boundary value analysis).
-    *   **Redundancy**: Pinpoint test cases that are semantically identical to others.
+    *   **Incorrectness**: Flag test cases where the `expected_result` contradicts the documented requirements or compliance rules.
+    *   **Lack of Clarity**: Identify test cases where the `description` is ambiguous or the `expected_result` is not specific, measurable, or verifiable.
+    *   **Incompleteness**: Note where the test suite lacks crucial scenarios (e.g., missing error paths or state transitions, or a suite without any negative or boundary test where the feature needs them).
+    *   **Redundancy**: Pinpoint test cases that are semantically identical to others (identical descriptions are already reported by the linter).
+*   Do not check `sr_no` numbering or empty fields; the linter reports them.
 
 ### Consolidate and Report Findings
 *   Your final output must **always** be a review table, which will be stored in the `testcase_reviews` shared state.
 *   **If your review identifies any issues**: Consolidate all findings into the structured review table with one row per issue.
-*   **If the test cases meet ALL requirements**: Your output must be a review table containing a single entry that confirms approval.
+*   **If the test cases meet ALL requirements**: Your output must be a review table containing a single entry that confirms approval (the linter's findings are kept regardless).
 
 ## Final Output Structure
 This is the required format for the `testcase_reviews` state. Your output must always be a table like the one below, populated according to your findings.
@@ -67,12 +134,131 @@ This is the required format for the `testcase_reviews` state. Your output must a
 | 12 | Lack of Clarity | The expected result "User is logged in" is too vague. | Change the expected result to: "User is redirected to the dashboard page." |
 | 14 | Redundancy | This test case is a semantic duplicate of test case #8. | Merge this test case with test case #8 and delete this one. |
 
+## Local Linter Findings
+{lint_reviews?}
+
+## Retrieved Feature Context
+{feature_context?}
+
 ## Testcase to Review
 {current_testcases}
 
 ***
-    """,
+    """),
     description="Reviews Testcase quality and provides feedback on what to improve",
-    tools=[rag_query],
+    tools=[rag_batch_query, rag_query_async],
+    before_agent_callback=lint_before_review,
+    after_agent_callback=merge_lint_reviews,
     output_key="testcase_reviews",
 )
+
+
+# Define the row-level reviewer for one chunk of a large suite
+row_chunk_reviewer = LlmAgent(
+    name="TestcaseRowReviewer",
+    model=GEMINI_MODEL,
+    instruction=feature_context_instruction("""
+***
+
+You are an expert Test Case Reviewer Agent. You review one chunk of a larger test suite for row-level issues. The rest of the suite is reviewed in parallel, and a separate suite-level review checks coverage gaps, compliance gaps, incompleteness and redundancy, so you must **not** report those categories.
+
+## Operational Workflow
+### Ingest Input
+*   The chunk under **Test Cases to Review** gives its position in the suite and a JSON object whose `testcases` each have a `sr_no`, `description`, `expected_result`, `compliance_ids` and `traceability_tags`. Use each test case's `sr_no` as its `TestCaseID`; never renumber.
+
+### Retrieve Source Requirements and Compliance Mandates
+*   First use the requirements and compliance retrievals already made for this feature, listed under **Retrieved Feature Context** below. Do not repeat a search that is already listed there.
+*   Only if that context does not cover something you need to verify, use the `rag_batch_query` tool to search the `requirements` and `compliance` corpora in a single call, and `rag_query_async` only for follow-up searches.
+
+### Review Each Test Case
+*   **Incorrectness**: Flag test cases where the `expected_result` contradicts the documented requirements or compliance rules.
+*   **Lack of Clarity**: Identify test cases where the `description` is ambiguous or the `expected_result` is not specific, measurable, or verifiable.
+*   Mechanical issues (empty fields, numbering, identical descriptions, stock vague phrases such as "works correctly") are reported by a local linter, listed under **Local Linter Findings**; do not report them again.
+
+## Final Output Structure
+Your output must always be a table like the one below, with one row per issue. If no test case in the chunk has an issue, output a table with a single Approval row.
+
+| TestCaseID | IssueCategory | Comment | Recommendation |
+| :--- | :--- | :--- | :--- |
+| N/A | Approval | Test cases in this chunk meet all requirements and compliance standards. | No further refinement needed. |
+| 12 | Lack of Clarity | The expected result "User is logged in" is too vague. | Change the expected result to: "User is redirected to the dashboard page." |
+| 17 | Incorrectness | The lockout threshold contradicts REQ-4.2, which specifies 5 attempts. | Change the expected result to lock the account after the 5th failed attempt. |
+
+## Local Linter Findings
+{lint_reviews?}
+
+## Retrieved Feature Context
+{feature_context?}
+
+## Test Cases to Review
+{review_chunk}
+
+***
+    """),
+    description="Reviews a chunk of a large Testcase suite for row-level issues",
+    tools=[rag_batch_query, rag_query_async],
+    include_contents="none",
+    output_key="testcase_reviews",
+)
+
+# Define the suite-level reviewer that runs next to the chunk reviews
+suite_level_reviewer = LlmAgent(
+    name="TestcaseSuiteReviewer",
+    model=GEMINI_MODEL,
+    instruction=feature_context_instruction("""
+***
+
+You are an expert Test Case Reviewer Agent. You review a large test suite as a whole. Row-level issues (incorrect expected results, lack of clarity) are reviewed separately, chunk by chunk, so you must **not** report those categories; report only issues that concern the suite as a whole.
+
+## Operational Workflow
+### Ingest Input
+*   Load the structured test suite from **Test Suite to Review**. Each entry of `testcases` has a `sr_no`, `description`, `expected_result`, `compliance_ids` and `traceability_tags`; `applied_compliance_rules` lists the rules applied across the suite. Use `sr_no` as the `TestCaseID` wherever a finding concerns a specific test case.
+
+### Retrieve Source Requirements and Compliance Mandates
+*   First use the requirements and compliance retrievals already made for this feature, listed under **Retrieved Feature Context** below. Do not repeat a search that is already listed there.
+*   Only if that context does not cover something you need to verify, use the `rag_batch_query` tool to search the `requirements` and `compliance` corpora in a single call, and `rag_query_async` only for follow-up searches.
+
+### Review the Suite
+*   **Coverage Gaps**: Identify any requirements from the `requirements` corpus that are not covered by at least one test case.
+*   **Compliance Gaps**: Find any compliance rules from the `compliance` corpus that are not being explicitly validated by a test case.
+*   **Incompleteness**: Note where the test suite lacks crucial scenarios (e.g., missing negative tests, boundary value analysis).
+*   **Redundancy**: Pinpoint test cases that are semantically identical to others.
+*   A local linter has already reported identical descriptions, numbering and empty fields; its findings are listed under **Local Linter Findings**. Do not report them again.
+
+## Final Output Structure
+Your output must always be a table like the one below, with one row per issue. If the suite has none of these issues, output a table with a single Approval row.
+
+| TestCaseID | IssueCategory | Comment | Recommendation |
+| :--- | :--- | :--- | :--- |
+| N/A | Approval | Test case suite meets all requirements and compliance standards. | No further refinement needed. |
+| N/A | Compliance Gap | No test cases exist to verify compliance with GDPR data deletion requests. | Create a new test suite for GDPR right-to-be-forgotten scenarios. |
+| 14 | Redundancy | This test case is a semantic duplicate of test case #8. | Merge this test case with test case #8 and delete this one. |
+
+## Local Linter Findings
+{lint_reviews?}
+
+## Retrieved Feature Context
+{feature_context?}
+
+## Test Suite to Review
+{current_testcases}
+
+***
+    """),
+    description="Reviews a large Testcase suite for coverage, compliance gaps and redundancy",
+    tools=[rag_batch_query, rag_query_async],
+    include_contents="none",
+    output_key="testcase_reviews",
+)
+
+if REVIEW_CHUNK_ROWS > 0:
+    # Suites over REVIEW_CHUNK_ROWS rows get parallel chunk reviews plus a suite-level pass
+    testcase_reviewer = ChunkedReviewerAgent(
+        name="ChunkedTestcaseReviewer",
+        chunk_rows=REVIEW_CHUNK_ROWS,
+        max_concurrency=REVIEW_MAX_CONCURRENCY,
+        sub_agents=[full_testcase_reviewer, row_chunk_reviewer, suite_level_reviewer],
+        description="Reviews Testcase quality, in parallel chunks for large suites",
+    )
+else:
+    testcase_reviewer = full_testcase_reviewer
@@ -4,10 +4,12 @@ RAG Tools package for interacting with Vertex AI RAG corpora.
 
 from .get_corpus_info import get_corpus_info
 from .list_corpora import list_corpora
-from .rag_query import rag_query
+from .rag_batch_query import rag_batch_query
+from .rag_query import rag_query, rag_query_async
 from .utils import (
     check_corpus_exists,
     get_corpus_resource_name,
+    invalidate_corpus_cache,
     set_current_corpus,
 )
 
@@ -15,8 +17,11 @@ __all__ = [
     "list_corpora",
     "exit_loop",
     "rag_query",
+    "rag_query_async",
+    "rag_batch_query",
     "get_corpus_info",
     "check_corpus_exists",
     "get_corpus_resource_name",
+    "invalidate_corpus_cache",
     "set_current_corpus",
 ]
@@ -6,8 +6,8 @@ import logging
 import re
 
 from google.adk.tools.tool_context import ToolContext
-from vertexai import rag
 
+from ........common.corpus_resolver import corpus_resolver
 from ..config import (
     LOCATION,
     PROJECT_ID,
@@ -35,11 +35,10 @@ def get_corpus_resource_name(corpus_name: str) -> str:
 
     # Check if this is a display name of an existing corpus
     try:
-        # List all corpora and check if there's a match with the display name
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if hasattr(corpus, "display_name") and corpus.display_name == corpus_name:
-                return corpus.name
+        # Resolve through the shared, TTL-cached corpus listing
+        resource_name = corpus_resolver.resolve(corpus_name)
+        if resource_name:
+            return resource_name
     except Exception as e:
         logger.warning(f"Error when checking for corpus display name: {str(e)}")
         # If we can't check, continue with the default behavior
@@ -74,31 +73,52 @@ def check_corpus_exists(corpus_name: str, tool_context: ToolContext) -> bool:
     if tool_context.state.get(f"corpus_exists_{corpus_name}"):
         return True
 
+    if corpus_exists(corpus_name):
+        remember_corpus(corpus_name, tool_context)
+        return True
+    return False
+
+
+def corpus_exists(corpus_name: str) -> bool:
+    """
+    Check the shared corpus listing for a corpus, without touching session state.
+
+    This may list the corpora (a blocking Vertex AI call), so async tools run
+    it on the worker pool and record the result with remember_corpus.
+
+    Args:
+        corpus_name (str): The name of the corpus to check
+
+    Returns:
+        bool: True if the corpus exists, False otherwise
+    """
     try:
         # Get full resource name
         corpus_resource_name = get_corpus_resource_name(corpus_name)
 
-        # List all corpora and check if this one exists
-        corpora = rag.list_corpora()
-        for corpus in corpora:
-            if (
-                corpus.name == corpus_resource_name
-                or corpus.display_name == corpus_name
-            ):
-                # Update state
-                tool_context.state[f"corpus_exists_{corpus_name}"] = True
-                # Also set this as the current corpus if no current corpus is set
-                if not tool_context.state.get("current_corpus"):
-                    tool_context.state["current_corpus"] = corpus_name
-                return True
-
-        return False
+        # Check the shared corpus listing for this one
+        return corpus_resolver.exists(corpus_resource_name) or corpus_resolver.exists(corpus_name)
     except Exception as e:
         logger.error(f"Error checking if corpus exists: {str(e)}")
         # If we can't check, assume it doesn't exist
         return False
 
 
+def remember_corpus(corpus_name: str, tool_context: ToolContext) -> None:
+    """
+    Record in session state that a corpus exists.
+
+    Args:
+        corpus_name (str): The name of a corpus that exists
+        tool_context (ToolContext): The tool context for state management
+    """
+    if not tool_context.state.get(f"corpus_exists_{corpus_name}"):
+        tool_context.state[f"corpus_exists_{corpus_name}"] = True
+    # Also set this as the current corpus if no current corpus is set
+    if not tool_context.state.get("current_corpus"):
+        tool_context.state["current_corpus"] = corpus_name
+
+
 def set_current_corpus(corpus_name: str, tool_context: ToolContext) -> bool:
     """
     Set the current corpus in the tool context state.
@@ -115,3 +135,12 @@ def set_current_corpus(corpus_name: str, tool_context: ToolContext) -> bool:
         tool_context.state["current_corpus"] = corpus_name
         return True
     return False
+
+
+def invalidate_corpus_cache() -> None:
+    """
+    Drop the shared corpus listing so the next lookup re-lists the corpora.
+
+    Call this after creating, deleting or renaming a corpus.
+    """
+    corpus_resolver.invalidate()
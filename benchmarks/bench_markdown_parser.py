@@ -0,0 +1,79 @@
+"""
+Benchmark for the local test case markdown parser.
+
+Builds generator-style test case tables of increasing size and times parsing
+them in one go and fed as a stream of small chunks.
+
+Usage:
+    python benchmarks/bench_markdown_parser.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from Master_agent.common.markdown_tables import (  # noqa: E402
+    TestcaseMarkdownParser,
+    parse_testcase_markdown,
+)
+
+ROW_COUNTS = [10, 100, 1000, 10000]
+REPEATS = 5
+CHUNK_SIZE = 64
+
+
+def build_markdown(rows: int) -> str:
+    lines = [
+        "### Generated Test Cases",
+        "| Sr.No | Test Description | Expected Result |",
+        "| :---- | :--------------- | :-------------- |",
+    ]
+    for i in range(1, rows + 1):
+        lines.append(
+            f"| {i}. | Submit the form with value `a\\|{i}` and verify the audit "
+            f"entry [COMP-LOG-{i % 7:02d}] | The request is accepted and logged "
+            f"with user ID and timestamp |"
+        )
+    lines.append("")
+    lines.append("### Applied Compliance Rules")
+    for i in range(7):
+        lines.append(f"- COMP-LOG-{i:02d}: Audit logging rule {i}")
+    return "\n".join(lines) + "\n"
+
+
+def best_of(func, repeats: int = REPEATS) -> float:
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def stream(markdown: str):
+    parser = TestcaseMarkdownParser()
+    for i in range(0, len(markdown), CHUNK_SIZE):
+        parser.feed(markdown[i:i + CHUNK_SIZE])
+    return parser.close()
+
+
+def main():
+    print(f"{'rows':>8} {'size KB':>9} {'whole ms':>10} {'stream ms':>10} {'rows/s':>12}")
+    for rows in ROW_COUNTS:
+        markdown = build_markdown(rows)
+        result = parse_testcase_markdown(markdown)
+        assert result is not None and len(result["testcases"]) == rows
+        assert stream(markdown) == result
+
+        whole = best_of(lambda: parse_testcase_markdown(markdown))
+        streamed = best_of(lambda: stream(markdown))
+        print(
+            f"{rows:>8} {len(markdown) / 1024:>9.1f} {whole * 1000:>10.2f} "
+            f"{streamed * 1000:>10.2f} {rows / whole:>12.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
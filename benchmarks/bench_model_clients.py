@@ -0,0 +1,109 @@
+"""
+Benchmark for the shared GenerativeModel client registry.
+
+Runs the generator's per-feature queue (FeatureQueueManagerAgent around a
+stub generator step) against a counting fake GenerativeModel and reports
+how many model calls were made and how many clients were constructed per
+pipeline run. Before the registry, every call constructed its own client.
+
+Usage:
+    python benchmarks/bench_model_clients.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+from typing import AsyncGenerator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the benchmark's test suites in a private in-memory suite store
+os.environ.setdefault("SUITE_STORE_PATH", ":memory:")
+
+from google.adk.agents import BaseAgent  # noqa: E402
+from google.adk.agents.invocation_context import InvocationContext  # noqa: E402
+from google.adk.events import Event, EventActions  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+
+import Master_agent  # noqa: E402,F401
+from Master_agent.common import model_clients  # noqa: E402
+from Master_agent.subagents.testcase_generator_orchestrator.subagents.feature_manager import (  # noqa: E402
+    FeatureQueueManagerAgent,
+)
+
+FEATURE_COUNTS = [1, 5, 20]
+RUNS = 3
+
+# Not a table, so every feature goes through the LLM parsing fallback
+GENERATED_OUTPUT = "Test cases for this feature are listed below as prose."
+
+PARSED_JSON = (
+    '{"testcase_id": "generate-random-uuid", "Testcase Title": "Stub", '
+    '"testcases": [["1.", "Do x", "Y happens"]], "compliance_ids": []}'
+)
+
+stats = {"constructions": 0, "calls": 0}
+
+
+class CountingModel:
+    """Stands in for GenerativeModel and counts constructions and calls."""
+
+    def __init__(self, model_name, **kwargs):
+        stats["constructions"] += 1
+
+    def _respond(self, prompt):
+        stats["calls"] += 1
+        text = PARSED_JSON if "test case parser" in prompt else "Summary"
+        return type("Response", (), {"text": text})()
+
+    def generate_content(self, prompt):
+        return self._respond(prompt)
+
+    async def generate_content_async(self, prompt):
+        return self._respond(prompt)
+
+
+class StubGeneratorAgent(BaseAgent):
+    """Writes a fixed generator output for the current feature."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        yield Event(
+            actions=EventActions(state_delta={"current_testcases": GENERATED_OUTPUT}),
+            author=self.name,
+        )
+
+
+async def run_pipeline(features: int) -> None:
+    queue = FeatureQueueManagerAgent(
+        name="BenchGeneratorQueue",
+        sub_agents=[StubGeneratorAgent(name="StubGenerator")],
+    )
+    session_service = InMemorySessionService()
+    session = await session_service.create_session(
+        app_name="bench",
+        user_id="bench",
+        state={"features_to_process": [f"Feature {i}" for i in range(features)], "feature_cursor": 0},
+    )
+    runner = Runner(agent=queue, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text="generate")])
+    async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        pass
+
+
+async def main():
+    # The parsing fallback logs a warning for every feature
+    logging.disable(logging.WARNING)
+    model_clients.GenerativeModel = CountingModel
+    print(f"{'features':>8} {'run':>4} {'model calls':>12} {'clients built':>14}")
+    for features in FEATURE_COUNTS:
+        model_clients.clear_model_clients()
+        for run in range(1, RUNS + 1):
+            stats["constructions"] = stats["calls"] = 0
+            await run_pipeline(features)
+            print(f"{features:>8} {run:>4} {stats['calls']:>12} {stats['constructions']:>14}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
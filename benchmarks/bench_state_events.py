@@ -0,0 +1,142 @@
+"""
+Benchmark for append-only test suite state deltas.
+
+Runs the generator's per-feature queue (FeatureQueueManagerAgent with
+page_size=1 around a stub generator step) and reports, per iteration, the
+JSON size of the queue's state_delta with the records kept in session
+state and with them in the SQLite suite store (in memory here), next to the
+size the same event had when it re-sent the whole aggregated_testcases and
+all_testcases_history lists.
+
+Usage:
+    python benchmarks/bench_state_events.py
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from google.adk.agents import BaseAgent  # noqa: E402
+from google.adk.agents.invocation_context import InvocationContext  # noqa: E402
+from google.adk.events import Event, EventActions  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.genai import types  # noqa: E402
+
+import Master_agent  # noqa: E402,F401
+from Master_agent.common import model_clients, suite_log  # noqa: E402
+from Master_agent.common.suite_log import (  # noqa: E402
+    AGGREGATED_TESTCASES,
+    SUITE_KEY_PREFIX,
+    TESTCASE_HISTORY,
+    read_suites,
+)
+from Master_agent.common.suite_store import SuiteStore  # noqa: E402
+from Master_agent.subagents.testcase_generator_orchestrator.subagents.feature_manager import (  # noqa: E402
+    FeatureQueueManagerAgent,
+)
+
+FEATURES = 20
+TESTCASES_PER_SUITE = 8
+
+
+class SummaryModel:
+    """Stands in for GenerativeModel so the final summary needs no Vertex AI."""
+
+    def __init__(self, model_name, **kwargs):
+        pass
+
+    def generate_content(self, prompt):
+        return type("Response", (), {"text": "Summary"})()
+
+    async def generate_content_async(self, prompt):
+        return self.generate_content(prompt)
+
+
+class StubGeneratorAgent(BaseAgent):
+    """Writes a structured suite for the current feature."""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        feature = ctx.session.state.get("current_feature") or ""
+        suite = {
+            "status": "generated",
+            "title": feature,
+            "testcases": [
+                {
+                    "sr_no": number,
+                    "description": f"Verify {feature} behaves as specified in scenario {number}",
+                    "expected_result": f"The system accepts the input and records outcome {number}",
+                    "compliance_ids": ["HIPAA 164.312"],
+                    "traceability_tags": [f"REQ-{number}.1"],
+                }
+                for number in range(1, TESTCASES_PER_SUITE + 1)
+            ],
+            "applied_compliance_rules": ["HIPAA 164.312"],
+        }
+        yield Event(actions=EventActions(state_delta={"current_testcases": suite}), author=self.name)
+
+
+def _size(value: Any) -> int:
+    return len(json.dumps(value, default=str))
+
+
+async def run_queue(store: Optional[SuiteStore]) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """Runs the queue over FEATURES features; returns its state deltas and the final state."""
+    suite_log.suite_store = store
+    queue = FeatureQueueManagerAgent(
+        name="BenchGeneratorQueue",
+        page_size=1,
+        sub_agents=[StubGeneratorAgent(name="StubGenerator")],
+    )
+    features = [f"Feature {i}" for i in range(FEATURES)]
+    session_service = InMemorySessionService()
+    session = await session_service.create_session(
+        app_name="bench",
+        user_id="bench",
+        state={"features_to_process": features, "feature_cursor": 0, "current_feature": features[0]},
+    )
+    runner = Runner(agent=queue, app_name="bench", session_service=session_service)
+    message = types.Content(role="user", parts=[types.Part(text="generate")])
+
+    deltas = []
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        if event.author == queue.name and event.actions.state_delta:
+            deltas.append(dict(event.actions.state_delta))
+
+    session = await session_service.get_session(app_name="bench", user_id="bench", session_id=session.id)
+    return deltas, session.state
+
+
+async def main():
+    logging.disable(logging.WARNING)
+    model_clients.GenerativeModel = SummaryModel
+    model_clients.clear_model_clients()
+
+    state_deltas, state = await run_queue(None)
+    store_deltas, store_state = await run_queue(SuiteStore(":memory:"))
+    aggregated = read_suites(state, AGGREGATED_TESTCASES)
+    history = read_suites(state, TESTCASE_HISTORY)
+    assert len(aggregated) == len(history) == FEATURES
+    assert len(read_suites(store_state, TESTCASE_HISTORY)) == FEATURES
+
+    print(f"{FEATURES} features, {TESTCASES_PER_SUITE} test cases per suite, page_size=1")
+    print(f"{'iteration':>9} {'full-list bytes':>16} {'append-only bytes':>18} {'store refs bytes':>17}")
+    for iteration, (delta, store_delta) in enumerate(zip(state_deltas, store_deltas), 1):
+        # The same event with both lists re-sent in full instead of the log entries
+        full_delta: Dict[str, Any] = {
+            key: value
+            for key, value in delta.items()
+            if not key.startswith((SUITE_KEY_PREFIX, f"{AGGREGATED_TESTCASES}:", f"{TESTCASE_HISTORY}:"))
+        }
+        full_delta[AGGREGATED_TESTCASES] = aggregated[:iteration]
+        full_delta[TESTCASE_HISTORY] = history[:iteration]
+        print(f"{iteration:>9} {_size(full_delta):>16} {_size(delta):>18} {_size(store_delta):>17}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,139 @@
+"""
+Benchmark for resetting session state in a callback instead of a tool call.
+
+Compares per-request latency and model calls of a root agent that clears state
+through a clear_session_state tool (model turn -> tool call -> follow-up model
+turn) with one that clears it in reset_session_state, its before-agent
+callback. Both use a fake model with a fixed per-call latency.
+
+Usage:
+    python benchmarks/bench_state_reset.py
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# Keep the benchmark's test suites in a private in-memory suite store
+os.environ.setdefault("SUITE_STORE_PATH", ":memory:")
+
+from google.adk.agents import Agent  # noqa: E402
+from google.adk.models.base_llm import BaseLlm  # noqa: E402
+from google.adk.models.llm_response import LlmResponse  # noqa: E402
+from google.adk.runners import Runner  # noqa: E402
+from google.adk.sessions import InMemorySessionService  # noqa: E402
+from google.adk.tools.tool_context import ToolContext  # noqa: E402
+from google.genai import types  # noqa: E402
+
+from Master_agent.agent import reset_session_state  # noqa: E402
+from Master_agent.common.suite_log import (  # noqa: E402
+    AGGREGATED_TESTCASES,
+    TESTCASE_HISTORY,
+    append_suites,
+    history_state_keys,
+    read_suites,
+)
+
+MODEL_LATENCY_SECONDS = 0.25
+REQUESTS = 10
+
+HISTORY_RECORD = {"testcase_id": "1", "Testcase Title": "Login", "testcases": [["1.", "a", "b"]]}
+
+INITIAL_STATE: Dict[str, Any] = {
+    "current_testcases": "| Sr.No | Test Description | Expected Result |",
+    "final_summary": "Previous answer",
+}
+asyncio.run(append_suites(INITIAL_STATE, TESTCASE_HISTORY, [HISTORY_RECORD], INITIAL_STATE))
+asyncio.run(append_suites(INITIAL_STATE, AGGREGATED_TESTCASES, [HISTORY_RECORD], INITIAL_STATE))
+
+
+def clear_session_state(tool_context: ToolContext) -> dict:
+    """The tool the root agent used to call before routing (kept here for comparison)."""
+    state_keys = list(tool_context.state.to_dict().keys())
+    preserved = history_state_keys(tool_context.state)
+    for key in state_keys:
+        if key not in preserved:
+            tool_context.state[key] = None
+    return {"status": "success", "cleared_keys": state_keys}
+
+
+class FakeRouterModel(BaseLlm):
+    """Sleeps for MODEL_LATENCY_SECONDS, then calls the reset tool once if it has one."""
+
+    model: str = "fake-router"
+    calls: List[int] = []
+
+    async def generate_content_async(self, llm_request, stream=False):
+        self.calls.append(1)
+        await asyncio.sleep(MODEL_LATENCY_SECONDS)
+        last_parts = llm_request.contents[-1].parts or []
+        answered_tool = any(part.function_response for part in last_parts)
+        if "clear_session_state" in llm_request.tools_dict and not answered_tool:
+            part = types.Part(function_call=types.FunctionCall(name="clear_session_state", args={}))
+        else:
+            part = types.Part(text="HIPAA is a US healthcare regulation...")
+        yield LlmResponse(content=types.Content(role="model", parts=[part]))
+
+
+async def measure(agent: Agent, model: FakeRouterModel) -> Dict[str, float]:
+    session_service = InMemorySessionService()
+    runner = Runner(agent=agent, app_name="bench", session_service=session_service)
+    latencies = []
+    model.calls.clear()
+    for _ in range(REQUESTS):
+        session = await session_service.create_session(
+            app_name="bench", user_id="bench", state=dict(INITIAL_STATE)
+        )
+        message = types.Content(role="user", parts=[types.Part(text="What is HIPAA compliance?")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        latencies.append(time.perf_counter() - start)
+
+        session = await session_service.get_session(
+            app_name="bench", user_id="bench", session_id=session.id
+        )
+        assert read_suites(session.state, TESTCASE_HISTORY) == [HISTORY_RECORD]
+        assert read_suites(session.state, AGGREGATED_TESTCASES) == []
+        assert session.state["current_testcases"] is None
+    return {
+        "mean_ms": 1000 * sum(latencies) / len(latencies),
+        "model_calls": len(model.calls) / REQUESTS,
+    }
+
+
+async def main():
+    logging.disable(logging.WARNING)
+    tool_model = FakeRouterModel()
+    tool_agent = Agent(
+        name="ToolResetRouter",
+        model=tool_model,
+        instruction="Call clear_session_state first, then answer.",
+        tools=[clear_session_state],
+        output_key="final_summary",
+    )
+    callback_model = FakeRouterModel()
+    callback_agent = Agent(
+        name="CallbackResetRouter",
+        model=callback_model,
+        instruction="Answer the question.",
+        before_agent_callback=reset_session_state,
+        output_key="final_summary",
+    )
+
+    print(f"fake model latency: {MODEL_LATENCY_SECONDS * 1000:.0f} ms per call, {REQUESTS} requests")
+    print(f"{'reset via':<16} {'mean ms':>9} {'model calls':>12}")
+    for label, agent, model in [
+        ("tool call", tool_agent, tool_model),
+        ("agent callback", callback_agent, callback_model),
+    ]:
+        result = await measure(agent, model)
+        print(f"{label:<16} {result['mean_ms']:>9.1f} {result['model_calls']:>12.1f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+from Master_agent.common.markdown_tables import (
+    TestcaseMarkdownParser,
+    extract_rule_id,
+    parse_testcase_markdown,
+    split_table_row,
+)
+
+HEADER = "| Sr.No | Test Description | Expected Result |\n| :---- | :--------------- | :-------------- |\n"
+
+
+def test_split_table_row_keeps_escaped_pipes():
+    assert split_table_row(r"| 1. | a \| b | c |") == ["1.", "a | b", "c"]
+
+
+def test_split_table_row_without_outer_pipes():
+    assert split_table_row("1. | a | b") == ["1.", "a", "b"]
+
+
+def test_split_table_row_keeps_trailing_escaped_pipe():
+    assert split_table_row(r"| 1. | a | b \|") == ["1.", "a", "b |"]
+
+
+def test_parse_table_and_compliance_rules():
+    text = (
+        "### User Login\n"
+        + HEADER
+        + "| 1. | Log in with valid credentials | Dashboard is shown |\n"
+        + "| 2. | Log in with a wrong password | Error 'Invalid password' is shown |\n"
+        + "\n### Applied Compliance Rules\n"
+        + "- HIPAA-164.312: Access control\n"
+        + "- **GDPR Article 32** - Security of processing\n"
+    )
+    result = parse_testcase_markdown(text)
+    assert result == {
+        "testcases": [
+            ["1.", "Log in with valid credentials", "Dashboard is shown"],
+            ["2.", "Log in with a wrong password", "Error 'Invalid password' is shown"],
+        ],
+        "compliance_ids": ["HIPAA-164.312", "GDPR Article 32"],
+        "heading": "User Login",
+    }
+
+
+def test_escaped_pipe_inside_a_cell():
+    result = parse_testcase_markdown(HEADER + r"| 1. | Enter a \| b | Value a \| b is saved |")
+    assert result["testcases"] == [["1.", "Enter a | b", "Value a | b is saved"]]
+
+
+def test_overflowing_row_is_glued_into_the_last_column():
+    parser = TestcaseMarkdownParser()
+    parser.feed(HEADER + "| 1. | Filter by status | Rows with A | B are shown |\n")
+    result = parser.close()
+    assert result["testcases"] == [["1.", "Filter by status", "Rows with A | B are shown"]]
+    assert parser.ragged_rows == 1
+
+
+def test_short_row_does_not_validate():
+    parser = TestcaseMarkdownParser()
+    parser.feed(HEADER + "| 1. | Only a description |\n")
+    assert parser.close() is None
+    assert parser.ragged_rows == 1
+
+
+def test_missing_sr_no_column_is_numbered():
+    text = "| Description | Expected Result |\n| --- | --- |\n| a | b |\n| c | d |\n"
+    assert parse_testcase_markdown(text)["testcases"] == [["1.", "a", "b"], ["2.", "c", "d"]]
+
+
+def test_compliance_column_rules_are_collected():
+    text = (
+        "| Sr.No | Description | Expected Result | Compliance |\n"
+        "| --- | --- | --- | --- |\n"
+        "| 1. | a | b | SOC-2.1, PCI-DSS-3.4 |\n"
+        "| 2. | c | d | N/A |\n"
+    )
+    assert parse_testcase_markdown(text)["compliance_ids"] == ["SOC-2.1", "PCI-DSS-3.4"]
+
+
+def test_streamed_chunks_match_a_single_feed():
+    text = HEADER + "| 1. | a | b |\n| 2. | c | d |"
+    parser = TestcaseMarkdownParser()
+    for start in range(0, len(text), 7):
+        parser.feed(text[start:start + 7])
+    assert parser.close() == parse_testcase_markdown(text)
+
+
+def test_review_table_is_ignored():
+    text = "| Testcase ID | Issue Category | Comment | Recommendation |\n| --- | --- | --- | --- |\n| 1 | Redundancy | x | y |\n"
+    assert parse_testcase_markdown(text) is None
+
+
+def test_extract_rule_id():
+    assert extract_rule_id("HIPAA-164.312: Access control") == "HIPAA-164.312"
+    assert extract_rule_id("SOC 2") == "SOC 2"
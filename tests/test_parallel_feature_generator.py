@@ -0,0 +1,75 @@
+import asyncio
+import importlib
+from typing import AsyncGenerator
+
+from google.adk.agents import BaseAgent
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.events import Event, EventActions
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from Master_agent.common.feature_context import CURRENT_FEATURE_KEY, FEATURES_KEY, PREFETCHED_CONTEXT_KEY
+from Master_agent.common import suite_log
+from Master_agent.common.suite_log import AGGREGATED_TESTCASES, TESTCASE_HISTORY, read_suites
+
+parallel = importlib.import_module(
+    "Master_agent.subagents.testcase_generator_orchestrator.subagents.feature_manager.ParallelFeatureGeneratorAgent"
+)
+
+FEATURES = ["Login", "Signup", "Checkout"]
+
+
+class StubPipeline(BaseAgent):
+    """Generates one test case for its feature, or raises for the failing one."""
+
+    failing_feature: str = ""
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        feature = ctx.session.state[CURRENT_FEATURE_KEY]
+        if feature == self.failing_feature:
+            raise RuntimeError("model unavailable")
+        suite = {
+            "status": "generated",
+            "title": feature,
+            "testcases": [{"sr_no": 1, "description": f"Open {feature}", "expected_result": f"The {feature} page is shown"}],
+            "applied_compliance_rules": [],
+        }
+        yield Event(actions=EventActions(state_delta={"current_testcases": suite}), author=self.name)
+
+
+async def run_generator(failing_feature):
+    agent = parallel.ParallelFeatureGeneratorAgent(
+        sub_agents=[StubPipeline(name="StubPipeline", failing_feature=failing_feature)]
+    )
+    service = InMemorySessionService()
+    session = await service.create_session(
+        app_name="test",
+        user_id="user",
+        state={
+            FEATURES_KEY: FEATURES,
+            # Already prefetched, so no retrieval runs
+            PREFETCHED_CONTEXT_KEY: {feature: {"feature": feature, "retrievals": []} for feature in FEATURES},
+        },
+    )
+    runner = Runner(agent=agent, app_name="test", session_service=service)
+    message = types.Content(role="user", parts=[types.Part(text="generate")])
+    async for _ in runner.run_async(user_id="user", session_id=session.id, new_message=message):
+        pass
+    return await service.get_session(app_name="test", user_id="user", session_id=session.id)
+
+
+def test_failing_feature_keeps_the_other_records(monkeypatch):
+    async def summarize(records):
+        return f"{len(records)} sets"
+
+    # Keep the records in session state
+    monkeypatch.setattr(suite_log, "suite_store", None)
+    monkeypatch.setattr(parallel, "summarize_testcases_output", summarize)
+    session = asyncio.run(run_generator("Signup"))
+
+    aggregated = read_suites(session.state, AGGREGATED_TESTCASES)
+    assert [record["feature"] for record in aggregated] == FEATURES
+    assert [len(record["testcases"]) for record in aggregated] == [1, 0, 1]
+    assert [record["feature"] for record in read_suites(session.state, TESTCASE_HISTORY)] == ["Login", "Checkout"]
+    assert session.state["final_summary"].startswith("3 sets")
@@ -0,0 +1,143 @@
+import pytest
+
+from Master_agent.common import review_table
+from Master_agent.common.review_table import (
+    APPROVAL,
+    REVIEW_APPROVED,
+    REVIEW_GENERATION_FAILURE,
+    REVIEW_HAS_ISSUES,
+    REVIEW_UNPARSED,
+    count_issue_categories,
+    merge_review_outputs,
+    parse_review_table,
+    parse_testcase_ids,
+    refinement_budget,
+    render_review_table,
+    review_outcome,
+    split_review_items,
+)
+
+APPROVAL_TABLE = """| TestCaseID | IssueCategory | Comment | Recommendation |
+| :--- | :--- | :--- | :--- |
+| N/A | Approval | Test case suite meets all requirements. | No further refinement needed. |
+"""
+
+
+def review(testcase_id, category, comment="c", recommendation="r"):
+    return {"testcase_id": testcase_id, "issue_category": category, "comment": comment, "recommendation": recommendation}
+
+
+@pytest.fixture
+def budget_settings(monkeypatch):
+    monkeypatch.setattr(review_table, "REFINEMENT_MAX_ITERATIONS", 3)
+    monkeypatch.setattr(review_table, "REFINEMENT_SEVERITY_PER_ITERATION", 4.0)
+
+
+def test_parse_review_table_normalizes_categories():
+    text = "Review:\n| Test Case ID | Issue Category | Comment | Recommendation |\n|---|---|---|---|\n| 2 | **coverage  gap** | a \\| b | c |\n\nTrailing text"
+    assert parse_review_table(text) == [review("2", "Coverage Gap", "a | b", "c")]
+
+
+def test_parse_review_table_skips_other_tables():
+    text = "| Sr.No | Description | Expected Result |\n|---|---|---|\n| 1. | a | b |\n\n" + APPROVAL_TABLE
+    assert parse_review_table(text) == [review("N/A", APPROVAL, "Test case suite meets all requirements.", "No further refinement needed.")]
+
+
+def test_parse_review_table_without_a_table():
+    assert parse_review_table("The suite looks fine.") is None
+
+
+def test_parse_testcase_ids():
+    assert parse_testcase_ids("3") == [3]
+    assert parse_testcase_ids("TC-3") == [3]
+    assert parse_testcase_ids("3, 7") == [3, 7]
+    assert parse_testcase_ids("2-4") == [2, 3, 4]
+    assert parse_testcase_ids("N/A") == []
+
+
+def test_parse_testcase_ids_separators():
+    assert parse_testcase_ids("1, 3 and 5") == [1, 3, 5]
+    assert parse_testcase_ids("TC-2 to TC-4; #7") == [2, 3, 4, 7]
+    assert parse_testcase_ids("Test Case 6 & 8.") == [6, 8]
+    assert parse_testcase_ids("3.") == [3]
+
+
+def test_parse_testcase_ids_rejects_dotted_tokens():
+    assert parse_testcase_ids("1.2") == []
+    assert parse_testcase_ids("1.2, 4") == [4]
+    assert parse_testcase_ids("3.5-6") == []
+    assert parse_testcase_ids("v2") == []
+
+
+def test_review_outcome():
+    assert review_outcome(parse_review_table(APPROVAL_TABLE)) == REVIEW_APPROVED
+    assert review_outcome([review("1", "Redundancy"), review("N/A", APPROVAL)]) == REVIEW_HAS_ISSUES
+    assert review_outcome([review("N/A", "Generation Failure"), review("1", "Redundancy")]) == REVIEW_GENERATION_FAILURE
+    assert review_outcome(None) == REVIEW_UNPARSED
+    assert review_outcome([]) == REVIEW_UNPARSED
+
+
+def test_count_issue_categories_excludes_approvals():
+    rows = [review("1", "Redundancy"), review("2", "Redundancy"), review("N/A", APPROVAL)]
+    assert count_issue_categories(rows) == {"Redundancy": 2}
+
+
+def test_refinement_budget_for_approval_and_failure(budget_settings):
+    assert refinement_budget([review("N/A", APPROVAL)]) == 0
+    assert refinement_budget([review("N/A", "Generation Failure")]) == 0
+
+
+def test_refinement_budget_for_unparsed_review(budget_settings):
+    assert refinement_budget(None) == 1
+
+
+def test_refinement_budget_weights_findings(budget_settings):
+    # 0.5 + 0.5: well under one pass worth of severity, still one pass
+    assert refinement_budget([review("1", "Lack of Clarity"), review("2", "Redundancy")]) == 1
+    # Two compliance gaps weigh 4.0, exactly one pass; a third one needs a second
+    assert refinement_budget([review("N/A", "Compliance Gap")] * 2) == 1
+    assert refinement_budget([review("N/A", "Compliance Gap")] * 3) == 2
+    # Unknown categories weigh DEFAULT_SEVERITY_WEIGHT
+    assert refinement_budget([review("1", "Typo")] * 5) == 2
+
+
+def test_refinement_budget_is_capped(budget_settings):
+    assert refinement_budget([review("N/A", "Compliance Gap")] * 20) == 3
+
+
+def test_split_review_items():
+    rows = [
+        review("2", "Redundancy"),
+        review("1, 3", "Lack of Clarity"),
+        review("N/A", "Coverage Gap"),
+        review("9", "Incorrectness"),
+        review("N/A", APPROVAL),
+    ]
+    targeted, coverage = split_review_items(rows, [1, 2, 3])
+    assert list(targeted) == [1, 2, 3]
+    assert targeted[1] == [rows[1]]
+    assert targeted[2] == [rows[0]]
+    assert coverage == [rows[2], rows[3]]
+
+
+def test_split_review_items_uses_sr_no_values():
+    rows = [review("5", "Redundancy"), review("3", "Lack of Clarity")]
+    targeted, coverage = split_review_items(rows, [1, 2, 5])
+    assert list(targeted) == [5]
+    assert coverage == [rows[1]]
+
+
+def test_merge_review_outputs_drops_approvals_next_to_issues():
+    issues = render_review_table([review("4", "Incorrectness", "wrong | bad")])
+    merged = parse_review_table(merge_review_outputs([APPROVAL_TABLE, issues], [review("1", "Redundancy")]))
+    assert merged == [review("1", "Redundancy"), review("4", "Incorrectness", "wrong | bad")]
+
+
+def test_merge_review_outputs_keeps_a_single_approval():
+    merged = parse_review_table(merge_review_outputs([APPROVAL_TABLE, APPROVAL_TABLE]))
+    assert review_outcome(merged) == REVIEW_APPROVED
+    assert len(merged) == 1
+
+
+def test_merge_review_outputs_keeps_unparsed_text():
+    assert merge_review_outputs(["Looks good overall."]) == "Looks good overall."
@@ -0,0 +1,97 @@
+from Master_agent.common.review_table import (
+    REVIEW_APPROVED,
+    REVIEW_HAS_ISSUES,
+    merge_review_outputs,
+    parse_review_table,
+    render_review_table,
+    review_outcome,
+)
+from Master_agent.common.testcase_linter import is_vague_result, lint_coverage, lint_suite
+from Master_agent.common.testcase_suite import StructuredSuite, StructuredTestcase
+
+APPROVAL_TABLE = render_review_table([{
+    "testcase_id": "N/A",
+    "issue_category": "Approval",
+    "comment": "Test case suite meets all requirements.",
+    "recommendation": "No further refinement needed.",
+}])
+
+
+def make_suite(*rows, status="generated"):
+    return StructuredSuite(status=status, title="Login", testcases=[
+        StructuredTestcase(sr_no=sr_no, description=description, expected_result=expected_result)
+        for sr_no, description, expected_result in rows
+    ])
+
+
+COVERED = make_suite(
+    (1, "Log in with valid credentials", "The dashboard page shows the user's name"),
+    (2, "Log in with an invalid password", "The message 'Invalid credentials' is displayed"),
+    (3, "Enter a password of the maximum length of 64 characters", "The password is accepted and the dashboard page is shown"),
+)
+
+
+def ids_and_categories(rows):
+    return [(row["testcase_id"], row["issue_category"]) for row in rows]
+
+
+def test_clean_suite_has_no_findings():
+    assert lint_suite(COVERED) == []
+    assert lint_coverage(COVERED) == []
+
+
+def test_generation_failure():
+    rows = lint_suite(StructuredSuite(status="not_generated", message="feature not present"))
+    assert ids_and_categories(rows) == [("N/A", "Generation Failure")]
+    assert rows[0]["comment"] == "feature not present"
+    assert ids_and_categories(lint_suite(None)) == [("N/A", "Generation Failure")]
+    assert lint_coverage(None) == []
+
+
+def test_row_ids_of_findings():
+    suite = make_suite(
+        (1, "Log in with valid credentials", "The dashboard page shows the user's name"),
+        (2, "Log in with valid credentials!", "The dashboard page shows the user's name"),
+        (3, "Log in with an expired token", "Works correctly"),
+        (4, "", "The message 'Session expired' is displayed"),
+    )
+    assert ids_and_categories(lint_suite(suite)) == [
+        ("2", "Redundancy"),
+        ("3", "Lack of Clarity"),
+        ("4", "Schema Violation"),
+    ]
+
+
+def test_non_sequential_sr_no():
+    suite = make_suite(
+        (1, "Log in with valid credentials", "The dashboard page shows the user's name"),
+        (3, "Log in with an invalid password", "The message 'Invalid credentials' is displayed"),
+    )
+    rows = lint_suite(suite)
+    assert ids_and_categories(rows) == [("N/A", "Schema Violation")]
+    assert "1, 3" in rows[0]["comment"]
+
+
+def test_is_vague_result():
+    assert is_vague_result("Works")
+    assert is_vague_result("The login works as expected")
+    assert not is_vague_result("The message 'Invalid credentials' is displayed below the form")
+
+
+def test_missing_negative_and_boundary_cases_are_advisory():
+    suite = make_suite((1, "Log in with valid credentials", "The dashboard page shows the user's name"))
+    assert lint_suite(suite) == []
+    assert ids_and_categories(lint_coverage(suite)) == [("N/A", "Incompleteness"), ("N/A", "Incompleteness")]
+
+
+def test_advisory_rows_do_not_block_an_approval():
+    suite = make_suite((1, "Log in with valid credentials", "The dashboard page shows the user's name"))
+    merged = merge_review_outputs([APPROVAL_TABLE], lint_suite(suite), lint_coverage(suite))
+    assert review_outcome(parse_review_table(merged)) == REVIEW_APPROVED
+
+
+def test_advisory_rows_follow_other_issues():
+    suite = make_suite((1, "Log in with valid credentials", "Works fine"))
+    merged = parse_review_table(merge_review_outputs([APPROVAL_TABLE], lint_suite(suite), lint_coverage(suite)))
+    assert review_outcome(merged) == REVIEW_HAS_ISSUES
+    assert ids_and_categories(merged) == [("1", "Lack of Clarity"), ("N/A", "Incompleteness"), ("N/A", "Incompleteness")]
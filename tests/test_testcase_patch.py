@@ -0,0 +1,96 @@
+import pytest
+
+from Master_agent.common.testcase_patch import (
+    PatchError,
+    SuitePatch,
+    apply_patch_to_suite,
+    apply_suite_patch,
+    describe_patch,
+    load_patch,
+)
+from Master_agent.common.testcase_suite import StructuredSuite, StructuredTestcase
+
+RECORD = {
+    "testcase_id": "base",
+    "Testcase Title": "Login",
+    "testcases": [["1.", "Valid login", "Dashboard shown"], ["2.", "Wrong password", "Error shown"], ["3.", "Locked account", "Lockout message shown"]],
+    "compliance_ids": ["HIPAA"],
+    "traceability_tags": [["REQ-1"], [], []],
+}
+
+
+def patch(*edits, **fields):
+    return SuitePatch(status="generated", testcase_id="base", edits=list(edits), **fields)
+
+
+def test_load_patch():
+    assert load_patch(None) is None
+    assert load_patch("not json") is None
+    assert load_patch('{"status": "generated", "edits": [{"op": "delete", "row": 1}]}').edits[0].row == 1
+
+
+def test_apply_suite_patch_edits_and_renumbers():
+    record = apply_suite_patch(RECORD, patch(
+        {"op": "update", "row": 1, "expected_result": "Dashboard with the user's name shown", "traceability_tags": ["REQ-2"]},
+        {"op": "insert_after", "row": 0, "description": "Empty form", "expected_result": "Validation errors shown"},
+        {"op": "delete", "row": 2},
+        {"op": "add_compliance", "row": 3, "compliance_ids": ["SOC 2"]},
+    ))
+    assert record["testcases"] == [
+        ["1.", "Empty form", "Validation errors shown"],
+        ["2.", "Valid login", "Dashboard with the user's name shown"],
+        ["3.", "Locked account", "Lockout message shown"],
+    ]
+    assert record["traceability_tags"] == [[], ["REQ-1", "REQ-2"], ["SOC 2"]]
+    assert record["compliance_ids"] == ["HIPAA", "SOC 2"]
+    assert record["based_on"] == "base"
+    assert record["testcase_id"] != "base"
+
+
+def test_apply_suite_patch_rejects_rows_out_of_range():
+    with pytest.raises(PatchError, match=r"Test case 4 does not exist\. The set contains 3 test cases \(numbered 1-3\)"):
+        apply_suite_patch(RECORD, patch({"op": "update", "row": 4, "description": "x"}))
+    with pytest.raises(PatchError, match="Test case 0 does not exist"):
+        apply_suite_patch(RECORD, patch({"op": "delete", "row": 0}))
+
+
+def test_apply_suite_patch_with_a_missing_sr_no():
+    record = dict(RECORD, testcases=[["1.", "a", "b"], ["2.", "c", "d"], ["4.", "e", "f"]])
+    updated = apply_suite_patch(record, patch({"op": "update", "row": 4, "expected_result": "g"}))
+    assert updated["testcases"][2] == ["3.", "e", "g"]
+    with pytest.raises(PatchError, match=r"Test case 3 does not exist\. The set contains 3 test cases \(numbered 1, 2, 4\)"):
+        apply_suite_patch(record, patch({"op": "delete", "row": 3}))
+
+
+def test_apply_patch_to_suite_with_a_missing_sr_no():
+    suite = StructuredSuite(status="generated", title="Login", testcases=[
+        StructuredTestcase(sr_no=5, description="e", expected_result="f"),
+        StructuredTestcase(sr_no=1, description="a", expected_result="b"),
+        StructuredTestcase(sr_no=2, description="c", expected_result="d"),
+    ])
+    refined = apply_patch_to_suite(suite, patch({"op": "delete", "row": 2}, {"op": "update", "row": 5, "description": "E"}))
+    assert [(testcase.sr_no, testcase.description) for testcase in refined.testcases] == [(1, "a"), (2, "E")]
+    with pytest.raises(PatchError, match="Test case 3 does not exist"):
+        apply_patch_to_suite(suite, patch({"op": "update", "row": 3, "description": "x"}))
+
+
+def test_edit_after_delete_is_rejected():
+    with pytest.raises(PatchError, match="edited after being deleted"):
+        apply_suite_patch(RECORD, patch({"op": "delete", "row": 2}, {"op": "update", "row": 2, "description": "x"}))
+
+
+def test_insert_needs_both_fields():
+    with pytest.raises(PatchError, match="needs a description and an expected result"):
+        apply_suite_patch(RECORD, patch({"op": "insert_after", "row": 1, "description": "x"}))
+
+
+def test_deleting_every_row_is_rejected():
+    with pytest.raises(PatchError, match="delete every test case"):
+        apply_suite_patch(RECORD, patch(*[{"op": "delete", "row": row} for row in (1, 2, 3)]))
+
+
+def test_describe_patch():
+    applied = patch({"op": "update", "row": 2, "expected_result": "x"}, {"op": "delete", "row": 3})
+    summary = describe_patch(applied, apply_suite_patch(RECORD, applied))
+    assert "updated test case(s) 2; removed test case(s) 3" in summary
+    assert "**2 test cases**" in summary
@@ -0,0 +1,100 @@
+from Master_agent.common.testcase_resolver import (
+    ENHANCEMENT_ERROR_PREFIX,
+    NO_TESTCASES_REASON,
+    format_enhancement_context,
+    match_suite_titles,
+    parse_row_references,
+    resolve_testcase_references,
+)
+
+
+def suite(testcase_id, title, rows=3, feature=""):
+    return {
+        "testcase_id": testcase_id,
+        "Testcase Title": title,
+        "feature": feature,
+        "testcases": [[f"{number}.", f"{title} case {number}", "Result"] for number in range(1, rows + 1)],
+        "compliance_ids": [],
+    }
+
+
+HISTORY = [
+    suite("login-1", "Login Authentication"),
+    suite("slot-1", "Slot Booking", rows=5),
+    suite("reset-1", "Password Reset"),
+]
+
+
+def test_parse_row_references():
+    assert parse_row_references("update test case 5") == [5]
+    assert parse_row_references("fix test cases 2 to 4, 7") == [2, 3, 4, 7]
+    assert parse_row_references("tc 3 and #6") == [3, 6]
+    assert parse_row_references("rows 4-2") == [2, 3, 4]
+    assert parse_row_references("add MFA to the login flow") == []
+
+
+def test_match_suite_titles_by_title_and_feature():
+    assert match_suite_titles("enhance the slot booking tests", HISTORY) == [HISTORY[1]]
+    by_feature = [suite("s-1", "Appointments", feature="Calendar Sync")]
+    assert match_suite_titles("update the calendar sync set", by_feature) == by_feature
+    assert match_suite_titles("add edge cases", HISTORY) == []
+
+
+def test_match_suite_titles_returns_all_best_matches():
+    history = [suite("login-1", "Login"), suite("login-2", "Login"), suite("signup-1", "Signup")]
+    assert match_suite_titles("improve the login tests", history) == history[:2]
+
+
+def test_resolve_without_history():
+    resolution = resolve_testcase_references("update test case 1", [])
+    assert resolution.error == ENHANCEMENT_ERROR_PREFIX + NO_TESTCASES_REASON
+    assert resolution.signals == ["no_history"]
+
+
+def test_resolve_skips_placeholder_records():
+    history = [{"testcase_id": "x", "Testcase Title": "Test Cases Not Generated", "testcases": []}]
+    assert resolve_testcase_references("update test case 1", history).error is not None
+
+
+def test_resolve_falls_back_to_the_most_recent_set():
+    resolution = resolve_testcase_references("add more negative cases", HISTORY)
+    assert resolution.suites == [HISTORY[-1]]
+    assert resolution.rows == {}
+    assert resolution.signals == ["most_recent"]
+
+
+def test_resolve_title_and_numbers():
+    resolution = resolve_testcase_references("update test cases 2-4 of the slot booking set", HISTORY)
+    assert resolution.error is None
+    assert resolution.suites == [HISTORY[1]]
+    assert resolution.rows == {"slot-1": [2, 3, 4]}
+    assert resolution.signals == ["title", "numbers"]
+
+
+def test_resolve_numbers_with_ambiguous_titles_use_the_latest_match():
+    history = [suite("login-1", "Login", rows=2), suite("login-2", "Login", rows=4)]
+    resolution = resolve_testcase_references("update test case 4 of the login set", history)
+    assert resolution.error is None
+    assert resolution.suites == [history[1]]
+    assert resolution.rows == {"login-2": [4]}
+
+
+def test_resolve_ambiguous_titles_without_numbers_keep_every_match():
+    history = [suite("login-1", "Login"), suite("login-2", "Login")]
+    resolution = resolve_testcase_references("enhance the login tests", history)
+    assert resolution.suites == history
+    assert resolution.rows == {}
+
+
+def test_resolve_missing_row_numbers():
+    resolution = resolve_testcase_references("update test cases 3 and 9 of password reset", HISTORY)
+    assert resolution.error.startswith(ENHANCEMENT_ERROR_PREFIX + "Test case 9 does not exist.")
+    assert "contains only 3 test cases" in resolution.error
+
+
+def test_format_enhancement_context_lists_referenced_rows():
+    resolution = resolve_testcase_references("update test case 2 of the slot booking set", HISTORY)
+    context = format_enhancement_context(resolution)
+    assert "Test case set ID: slot-1" in context
+    assert "- Test case 2: Slot Booking case 2" in context
+    assert "Login Authentication" not in context